@@ -0,0 +1,13 @@
+from typing import Optional
+from fastapi import APIRouter, Header, status
+from app.core.Security import check_admin
+from app.service.Audit_service import audit_logger
+
+router = APIRouter()
+
+
+@router.get("/admin/auditoria", status_code=status.HTTP_200_OK)
+async def get_audit_stats(x_admin_token: Optional[str] = Header(None)):
+    """Obtiene los contadores del registro de auditoría (encolados, escritos y descartados)."""
+    check_admin(x_admin_token)
+    return audit_logger.stats()
@@ -1,19 +1,33 @@
 
-from fastapi import APIRouter, HTTPException, status
+import json
+from itertools import islice
+from fastapi import APIRouter, Header, HTTPException, Query, Request, status
+from fastapi.responses import JSONResponse
 from typing import List, Dict, Optional
 from uuid import UUID
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
 from app.model.Game_model import Game
 from app.model.Game_model import Player
 from app.model.Game_model import ShipCreate
-from app.model.Game_model import ShipNode, ShotNode, Coordinate, ShotResult, GameState
+from app.model.Game_model import ShipNode, ShotNode, Coordinate, ShotResult, GameState, MAX_PLAYERS, validate_ship_rules
+from app.model.Ai_model import AI_MAX_BOARD_SIZE, AiLevel
+from app.service.Ai_service import ai_service
+from app.service.Audit_service import audit_logger
+from app.service.Event_service import EventService, event_service
+from app.service.Game_store_service import GameStore, create_game_store
+from app.service.Idempotency_service import shot_idempotency_cache
+from app.service.Spectator_service import spectator_service
+from app.service.Worker_service import worker_service
 
 router = APIRouter()
 
 # Almacenamiento en memoria (en producción, usar una base de datos)
 # Claves: strings de UUID (tal como tenías)
-games: Dict[str, Game] = {}
+# Las partidas inactivas se compactan en memoria y se rehidratan al accederlas
+games: GameStore = create_game_store(is_pinned=lambda game_id: spectator_service.viewer_count(game_id) > 0)
 players: Dict[str, Player] = {}
+# Índice de nombres de jugador -> ID, para verificar nombres únicos sin recorrer todos los jugadores
+player_names: Dict[str, str] = {}
 admin_config = {
     "board_size": None,
     "ships": []
@@ -37,34 +51,31 @@ class ShotCreate(BaseModel):
     player_id: str
     row: int = Field(..., ge=0, description="Row coordinate (0-based)")
     col: int = Field(..., ge=0, description="Column coordinate (0-based)")
+    # Obligatorio en partidas de más de 2 jugadores; en partidas de 2 es el oponente
+    target_player_id: Optional[str] = Field(None, description="ID del jugador al que se dispara")
 
 class GameCreateWithPlayers(BaseModel):
     player_1_id: str = Field(..., description="ID del primer jugador")
-    player_2_id: str = Field(..., description="ID del segundo jugador")
+    player_2_id: Optional[str] = Field(None, description="ID del segundo jugador (omitir para jugar contra la IA)")
+    ai_level: Optional[AiLevel] = Field(None, description="Nivel del oponente controlado por el servidor: easy, medium o hard")
+
+class GameCreateMultiplayer(BaseModel):
+    player_ids: List[str] = Field(..., min_length=2, max_length=MAX_PLAYERS, description="IDs de los jugadores en orden de turno")
+    max_players: Optional[int] = Field(None, ge=2, le=MAX_PLAYERS, description="Plazas totales (por defecto, el número de jugadores)")
 
 # Endpoints
 @router.post("/admin/configurar-barcos", status_code=status.HTTP_201_CREATED)
 async def configure_ships(config: AdminConfigureShips):
     """El administrador configura el tamaño del tablero y los barcos disponibles."""
-    if config.board_size < 5:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Board size must be at least 5")
-
-    # Validar nombres únicos
-    ship_names = [ship.name for ship in config.ships]
-    if len(ship_names) != len(set(ship_names)):
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Ship names must be unique")
-
-    # Validar límite del 70% (suma de tamaños no mayor que 70% del tablero total)
-    total_ship_length = sum(ship.size for ship in config.ships)
-    max_allowed = config.board_size * config.board_size * 0.7
-    if total_ship_length > max_allowed:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Total ship length ({total_ship_length}) exceeds 70% of board ({max_allowed})"
-        )
+    ships = [{"name": ship.name, "size": ship.size} for ship in config.ships]
+    try:
+        validate_ship_rules(config.board_size, ships)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
     admin_config["board_size"] = config.board_size
-    admin_config["ships"] = [{"name": ship.name, "size": ship.size} for ship in config.ships]
+    admin_config["ships"] = ships
+    audit_logger.log("admin_config", board_size=config.board_size, ships=admin_config["ships"])
 
     return {"message": "Ships configured successfully", "board_size": config.board_size, "ships": admin_config["ships"]}
 
@@ -73,23 +84,92 @@ async def configure_ships(config: AdminConfigureShips):
 async def create_player(player_data: PlayerCreate):
     """Crea un nuevo jugador con un nombre único."""
     # Verificar si el nombre ya existe
-    if any(p.name == player_data.name for p in players.values()):
+    if player_data.name in player_names:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Player name already exists")
 
     player = Player(name=player_data.name)
     players[str(player.id)] = player
+    player_names[player.name] = str(player.id)
     return {"player_id": str(player.id), "name": player.name}
 
 
+async def _read_bulk_items(request: Request, model) -> list:
+    """
+    Lee una lista de elementos del cuerpo de la solicitud, como arreglo JSON o
+    como NDJSON (un objeto JSON por línea, leído en streaming).
+    """
+    content_type = request.headers.get("content-type", "")
+    try:
+        if "ndjson" in content_type or "jsonl" in content_type:
+            raw_items = []
+            buffer = b""
+            async for chunk in request.stream():
+                buffer += chunk
+                *lines, buffer = buffer.split(b"\n")
+                raw_items.extend(json.loads(line) for line in lines if line.strip())
+            if buffer.strip():
+                raw_items.append(json.loads(buffer))
+        else:
+            raw_items = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cuerpo JSON/NDJSON inválido")
+
+    try:
+        return TypeAdapter(List[model]).validate_python(raw_items)
+    except ValidationError as e:
+        error = e.errors()[0]
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Elemento inválido en {'.'.join(str(loc) for loc in error['loc'])}: {error['msg']}"
+        )
+
+
+@router.post("/jugadores/lote", status_code=status.HTTP_201_CREATED)
+async def create_players_bulk(request: Request):
+    """
+    Registra muchos jugadores en una sola operación (arreglo JSON o NDJSON de `{"name": ...}`).
+    Se validan todos los nombres en una pasada y se registran todos o ninguno.
+    Los IDs se retornan en el mismo orden recibido.
+    """
+    items: List[PlayerCreate] = await _read_bulk_items(request, PlayerCreate)
+    names = [item.name for item in items]
+
+    # Nombres repetidos dentro del lote o ya registrados
+    unique_names = set(names)
+    if len(unique_names) != len(names):
+        seen = set()
+        duplicate = next(name for name in names if name in seen or seen.add(name))
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Nombre repetido en el lote: {duplicate}")
+    existing = unique_names.intersection(player_names)
+    if existing:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Player name already exists: {next(iter(existing))}")
+
+    created = [Player(name=name) for name in names]
+    for player in created:
+        player_id = str(player.id)
+        players[player_id] = player
+        player_names[player.name] = player_id
+
+    # Respuesta ya serializable: se evita la conversión genérica de FastAPI elemento a elemento
+    return JSONResponse(status_code=status.HTTP_201_CREATED, content={
+        "total": len(created),
+        "players": [{"player_id": str(player.id), "name": player.name} for player in created]
+    })
+
+
 @router.get("/jugadores", status_code=status.HTTP_200_OK)
 async def list_players():
-    """Obtiene el listado de todos los jugadores."""
+    """
+    Obtiene el listado de todos los jugadores.
+    `game_id` es su partida activa (la más reciente en la que entró) e `is_ready` indica si ya colocó su flota en ella.
+    """
     return {
         "total": len(players),
         "players": [
             {
                 "player_id": str(player.id),
                 "name": player.name,
+                "game_id": player.active_game_id,
                 "is_ready": player.is_ready
             }
             for player in players.values()
@@ -97,29 +177,63 @@ async def list_players():
     }
 
 
+def _game_player(registered: Player, game: Game) -> Player:
+    """Estado del jugador dentro de una partida (el jugador registrado se comparte entre partidas)."""
+    return registered.seat(str(game.id))
+
+
+def _mark_ready(game_id: str, player_id: str, ready: bool):
+    """Refleja la disponibilidad en el jugador registrado si la partida es su partida activa."""
+    registered = players.get(player_id)
+    if registered is not None and registered.active_game_id == game_id:
+        registered.is_ready = ready
+
+
 @router.post("/partidas", status_code=status.HTTP_201_CREATED)
 async def create_game(game_data: GameCreateWithPlayers):
-    """Crea una nueva partida con exactamente 2 jugadores usando la configuración del administrador."""
+    """
+    Crea una nueva partida con exactamente 2 jugadores usando la configuración del administrador.
+    Con `ai_level` (en lugar de `player_2_id`) el segundo jugador es un oponente controlado por el servidor.
+    """
     if not admin_config["board_size"]:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="El administrador debe configurar los barcos primero")
 
+    if (game_data.player_2_id is None) == (game_data.ai_level is None):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Indica el Jugador 2 o el nivel de la IA (ai_level), pero no ambos")
+
     # Verificar que ambos jugadores existan (players keys son strings)
     if game_data.player_1_id not in players:
         raise HTTPException(status_code=404, detail="Jugador 1 no encontrado")
-    if game_data.player_2_id not in players:
+    if game_data.player_2_id is not None and game_data.player_2_id not in players:
         raise HTTPException(status_code=404, detail="Jugador 2 no encontrado")
     if game_data.player_1_id == game_data.player_2_id:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="El Jugador 1 y el Jugador 2 deben ser diferentes")
+    if game_data.ai_level is not None and admin_config["board_size"] > AI_MAX_BOARD_SIZE:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"La IA solo juega en tableros de hasta {AI_MAX_BOARD_SIZE}x{AI_MAX_BOARD_SIZE}")
 
     num_ships = len(admin_config["ships"])
-    game = Game(board_size=admin_config["board_size"], max_ships=num_ships, max_ships_length_ratio=0.7)
+    game = Game(board_size=admin_config["board_size"], max_ships=num_ships, max_ships_length_ratio=0.7,
+                ships_config=list(admin_config["ships"]))
 
-    # Agregar los 2 jugadores (Player objetos, ya guardados en players por create_player)
+    # Agregar los 2 jugadores (cada partida tiene su propio estado de jugador: flota y disparos)
     player_1 = players[game_data.player_1_id]
-    player_2 = players[game_data.player_2_id]
-
-    game.add_player(player_1)
-    game.add_player(player_2)
+    if game_data.ai_level is not None:
+        # El oponente de la IA se registra como jugador y coloca su flota al crear la partida
+        player_2 = ai_service.create_player(game_data.ai_level)
+        players[str(player_2.id)] = player_2
+    else:
+        player_2 = players[game_data.player_2_id]
+
+    game.add_player(_game_player(player_1, game))
+    game.add_player(_game_player(player_2, game))
+    if game_data.ai_level is not None:
+        try:
+            await ai_service.place_fleet(game, game.players[str(player_2.id)])
+        except ValueError as e:
+            del players[str(player_2.id)]
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        _mark_ready(str(game.id), str(player_2.id), True)
+        ai_service.register(str(game.id), str(player_2.id), game_data.ai_level)
 
     game_id_str = str(game.id)
     games[game_id_str] = game
@@ -129,6 +243,84 @@ async def create_game(game_data: GameCreateWithPlayers):
         "board_size": game.board_size,
         "player_1": {"id": str(player_1.id), "name": player_1.name},
         "player_2": {"id": str(player_2.id), "name": player_2.name},
+        "ai_level": game_data.ai_level,
+        "ships_config": admin_config["ships"]
+    }
+
+
+@router.post("/partidas/lote", status_code=status.HTTP_201_CREATED)
+async def create_games_bulk(request: Request):
+    """
+    Crea muchas partidas de 2 jugadores en una sola operación (arreglo JSON o NDJSON
+    de emparejamientos `{"player_1_id": ..., "player_2_id": ...}`).
+    Se validan todos los emparejamientos antes de crear ninguna partida.
+    Los IDs de partida se retornan en el mismo orden recibido.
+    """
+    if not admin_config["board_size"]:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="El administrador debe configurar los barcos primero")
+
+    pairings: List[GameCreateWithPlayers] = await _read_bulk_items(request, GameCreateWithPlayers)
+
+    for index, pairing in enumerate(pairings):
+        if pairing.player_2_id is None or pairing.ai_level is not None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Emparejamiento {index}: las partidas en lote requieren dos jugadores registrados")
+    referenced = {pid for pairing in pairings for pid in (pairing.player_1_id, pairing.player_2_id)}
+    missing = referenced.difference(players)
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Jugador no encontrado: {next(iter(missing))}")
+    for index, pairing in enumerate(pairings):
+        if pairing.player_1_id == pairing.player_2_id:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Emparejamiento {index}: los jugadores deben ser diferentes")
+
+    board_size = admin_config["board_size"]
+    ships_config = list(admin_config["ships"])
+    created = []
+    for pairing in pairings:
+        game = Game(board_size=board_size, max_ships=len(ships_config), max_ships_length_ratio=0.7,
+                    ships_config=ships_config)
+        game.add_player(_game_player(players[pairing.player_1_id], game))
+        game.add_player(_game_player(players[pairing.player_2_id], game))
+        created.append(game)
+
+    for game in created:
+        games[str(game.id)] = game
+
+    return JSONResponse(status_code=status.HTTP_201_CREATED, content={
+        "total": len(created),
+        "board_size": board_size,
+        "game_ids": [str(game.id) for game in created]
+    })
+
+
+@router.post("/partidas/multijugador", status_code=status.HTTP_201_CREATED)
+async def create_multiplayer_game(game_data: GameCreateMultiplayer):
+    """Crea una partida todos contra todos de hasta 16 jugadores usando la configuración del administrador."""
+    if not admin_config["board_size"]:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="El administrador debe configurar los barcos primero")
+
+    if len(set(game_data.player_ids)) != len(game_data.player_ids):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Los jugadores deben ser diferentes")
+    missing = [pid for pid in game_data.player_ids if pid not in players]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Jugador no encontrado: {missing[0]}")
+
+    max_players = game_data.max_players or max(3, len(game_data.player_ids))
+    if max_players < len(game_data.player_ids):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="max_players no puede ser menor que el número de jugadores")
+
+    game = Game(board_size=admin_config["board_size"], max_ships=len(admin_config["ships"]), max_ships_length_ratio=0.7,
+                ships_config=list(admin_config["ships"]), max_players=max_players)
+    for pid in game_data.player_ids:
+        game.add_player(_game_player(players[pid], game))
+
+    game_id_str = str(game.id)
+    games[game_id_str] = game
+
+    return {
+        "game_id": game_id_str,
+        "board_size": game.board_size,
+        "max_players": game.max_players,
+        "players": [{"id": pid, "name": players[pid].name} for pid in game_data.player_ids],
         "ships_config": admin_config["ships"]
     }
 
@@ -144,13 +336,43 @@ async def join_game(game_id: str, player_id: str):
     game = games[game_id]
     player = players[player_id]
 
-    if len(game.players) >= 2:
+    # Un jugador sin flota que entre tras la colocación nunca podría ser eliminado
+    if not game.placement_phase or game.state == GameState.FINISHED:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="La partida ya comenzó")
+    if len(game.players) >= game.max_players:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="La partida ya tiene el número máximo de jugadores")
+    if player_id in game.players:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="El jugador ya pertenece a esta partida")
 
-    game.add_player(player)
+    game.add_player(_game_player(player, game))
+    event_service.emit(EventService.GAME_UPDATED, game)
     return {"message": f"Jugador {player.name} se unió a la partida {game_id}"}
 
 
+def _build_fleet(game: Game, ships: List[ShipCreate], ships_config: List[dict]) -> List[ShipNode]:
+    """Crea los barcos con las coordenadas que envía el cliente y valida la flota completa."""
+    fleet: List[ShipNode] = []
+    for ship_data in ships:
+        # Buscar la configuración del barco para obtener el tamaño esperado
+        ship_config = next(s for s in ships_config if s["name"] == ship_data.name)
+
+        # Crear el ShipNode con la orientación correcta
+        ship = ShipNode(
+            name=ship_data.name,
+            size=ship_config["size"],
+            orientation=ship_data.orientation
+        )
+
+        # Las coordenadas ya llegan validadas como Coordinate (ShipCreate): se reutilizan sin volver a crearlas
+        ship.coordinates = list(ship_data.coordinates)
+        fleet.append(ship)
+
+    # Verificar que todos los barcos son válidos
+    if not game.validate_fleet(fleet):
+        raise ValueError("Colocación de barcos inválida (superposición, límites o límites de cantidad)")
+    return fleet
+
+
 @router.post("/partidas/{game_id}/flota/{player_id}", status_code=status.HTTP_200_OK)
 async def place_ships(game_id: str, player_id: str, ships: List[ShipCreate]):
     """Ubica los barcos de un jugador en el tablero."""
@@ -160,12 +382,15 @@ async def place_ships(game_id: str, player_id: str, ships: List[ShipCreate]):
         raise HTTPException(status_code=404, detail="Jugador no encontrado")
 
     game = games[game_id]
-    player = players[player_id]
 
     # Verificar que el jugador pertenece a la partida
-    if str(player.id) not in list(game.players.keys()):
+    if player_id not in game.players:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="El jugador no pertenece a esta partida")
 
+    # Estado del jugador dentro de esta partida
+    player = game.players[player_id]
+    ships_config = game.ships_config or admin_config["ships"]
+
     # Verificar que la partida está en fase de colocación
     if not game.placement_phase:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="La fase de colocación de barcos ha terminado")
@@ -175,11 +400,11 @@ async def place_ships(game_id: str, player_id: str, ships: List[ShipCreate]):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Ya has colocado tus barcos")
 
     # Validar la configuración de barcos
-    if len(ships) != len(admin_config["ships"]):
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Debes colocar exactamente {len(admin_config['ships'])} barcos")
+    if len(ships) != len(ships_config):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Debes colocar exactamente {len(ships_config)} barcos")
 
     # Verificar que los nombres de los barcos coincidan con la configuración
-    config_ship_names = {ship["name"] for ship in admin_config["ships"]}
+    config_ship_names = {ship["name"] for ship in ships_config}
     provided_ship_names = {ship.name for ship in ships}
 
     if config_ship_names != provided_ship_names:
@@ -192,99 +417,54 @@ async def place_ships(game_id: str, player_id: str, ships: List[ShipCreate]):
             error_msg.append(f"Barcos no reconocidos: {', '.join(extra)}")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=". ".join(error_msg))
 
+    fleet_assigned = False
     try:
-        # Crear y colocar cada barco usando las coordenadas que envía el cliente
-        for ship_data in ships:
-            # Buscar la configuración del barco para obtener el tamaño esperado
-            ship_config = next(s for s in admin_config["ships"] if s["name"] == ship_data.name)
-
-            # Crear el ShipNode con la orientación correcta
-            ship = ShipNode(
-                name=ship_data.name,
-                size=ship_config["size"],
-                orientation=ship_data.orientation
-            )
-
-            # Asignar coordenadas desde ship_data.coordinates (esperadas como lista de Coordinate)
-            coords: List[Coordinate] = []
-            for c in ship_data.coordinates:
-                # si vienen como dict, pydantic los convertirá; aquí nos aseguramos de crear Coordinate
-                if isinstance(c, Coordinate):
-                    coords.append(Coordinate(row=c.row, col=c.col))
-                else:
-                    coords.append(Coordinate(row=c["row"], col=c["col"]))
-
-            ship.coordinates = coords
-
-            # Añadir el barco a la flota del jugador
+        # Construir y validar la flota en el grupo de trabajadores (sin bloquear el bucle de eventos).
+        # La partida queda retenida para que no se compacte: la flota se asigna a este mismo objeto
+        with games.hold(game_id):
+            fleet = await worker_service.run_in_thread(_build_fleet, game, ships, ships_config)
+
+        # Otra solicitud pudo cambiar la partida mientras se validaba
+        if not game.placement_phase:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="La fase de colocación de barcos ha terminado")
+        if player.fleet:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Ya has colocado tus barcos")
+        for ship in fleet:
             player.add_ship(ship)
-
-        # Verificar que todos los barcos son válidos
-        valid = game.validate_ship_placement(str(player.id))
-        if not valid:
-            # limpiar y reportar
-            player.fleet = []
-            raise ValueError("Colocación de barcos inválida (superposición, límites o límites de cantidad)")
+        fleet_assigned = True
 
         # Marcar al jugador como listo
         player.is_ready = True
+        _mark_ready(game_id, player_id, True)
+        game.mark_updated()
         all_players_ready = all(p.is_ready for p in game.players.values())
 
         # Si todos los jugadores están listos, comenzar el juego
         if all_players_ready:
             game.start_game()
 
+        audit_logger.log(
+            "placement", game_id=game_id, player_id=player_id,
+            ships=[{"name": ship.name, "cells": [(c.row, c.col) for c in ship.coordinates]} for ship in fleet]
+        )
+        event_service.emit(EventService.GAME_UPDATED, game)
         return {"message": "Barcos colocados exitosamente", "player_ready": True, "game_started": all_players_ready}
 
     except ValueError as e:
-        # Si hay algún error, limpiar la flota del jugador
-        player.fleet = []
-        player.is_ready = False
+        # Si hay algún error después de asignar la flota, limpiarla
+        if fleet_assigned:
+            player.fleet = []
+            player.is_ready = False
+            _mark_ready(game_id, player_id, False)
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
-@router.post("/partidas/{game_id}/disparo", status_code=status.HTTP_200_OK)
-async def take_shot(game_id: str, shot: ShotCreate):
-    """Realiza un disparo en el tablero del oponente."""
-    if game_id not in games:
-        raise HTTPException(status_code=404, detail="Partida no encontrada")
-
-    game = games[game_id]
-
-    # Verificar que el jugador exista en global players
-    if shot.player_id not in players:
-        raise HTTPException(status_code=404, detail="Jugador no encontrado")
-
-    attacker = players[shot.player_id]
-
-    # Verificar que el jugador sea parte de la partida
-    if str(attacker.id) not in list(game.players.keys()):
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="El jugador no pertenece a esta partida")
-
-    # Verificar que sea el turno del jugador
-    if not game.is_players_turn(attacker.id):
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No es tu turno")
-
-    # Encontrar defensor
-    defender = None
-    for pid, p in game.players.items():
-        if pid != str(attacker.id):
-            defender = p
-            break
-
-    if defender is None:
-        raise HTTPException(status_code=404, detail="No hay defensor en la partida")
-
-    # Verificar duplicado de disparo
-    if attacker.shots.find(shot.row, shot.col) is not None:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Ya has disparado a la posición ({shot.row}, {shot.col})")
-
-    # Validar límites del tablero
-    if not (0 <= shot.row < game.board_size and 0 <= shot.col < game.board_size):
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Coordenadas fuera de los límites del tablero")
+def _resolve_shot(game_id: str, game: Game, attacker: Player, target_id: str, row: int, col: int) -> dict:
+    """Resuelve un disparo ya validado: aplica el impacto, registra el disparo, avanza el turno y notifica."""
+    defender = game.players[target_id]
 
     # Buscar barco en la coordenada objetivo
-    target_ship = defender.get_ship_at(shot.row, shot.col)
+    target_ship = defender.get_ship_at(row, col)
 
     result = {
         "result": ShotResult.WATER,
@@ -295,19 +475,21 @@ async def take_shot(game_id: str, shot: ShotCreate):
 
     if target_ship:
         # receive_shot ya retorna True/False, no necesitas verificar 'hit' después
-        hit = target_ship.receive_shot(shot.row, shot.col)
+        hit = target_ship.receive_shot(row, col)
         result["result"] = ShotResult.HIT if hit else ShotResult.WATER
         
         if target_ship.is_sunk:  # Sin paréntesis - es una propiedad
             result["result"] = ShotResult.SUNK
             result["ship_sunk"] = target_ship.name
             
-            # Verificar si todos los barcos del defensor están hundidos
-            if defender.all_ships_sunk:  # Sin paréntesis - es una propiedad
-                result["game_over"] = True
-                result["winner"] = str(attacker.id)
-                game.state = GameState.FINISHED
-                game.winner_id = attacker.id
+            # Verificar si el defensor quedó sin barcos y si solo queda un jugador
+            if game.register_sunk_ship(target_id):
+                result["player_eliminated"] = target_id
+                if game.alive_players() == 1:
+                    result["game_over"] = True
+                    result["winner"] = str(attacker.id)
+                    game.state = GameState.FINISHED
+                    game.winner_id = attacker.id
 
     else:
         result["result"] = ShotResult.WATER
@@ -315,22 +497,144 @@ async def take_shot(game_id: str, shot: ShotCreate):
 
     # Registrar el disparo
     shot_node = ShotNode(
-        coordinate=Coordinate(row=shot.row, col=shot.col),
+        coordinate=Coordinate(row=row, col=col),
         result=result["result"],
         affected_ship=target_ship.name if target_ship else None
     )
-    attacker.shots.insert(shot_node)
+    game.shot_tree(attacker, target_id).insert(shot_node)
+    game.record_shot(attacker.id, row, col, result["result"], target_id)
+    audit_logger.log(
+        "shot", game_id=game_id, player_id=str(attacker.id), target_id=target_id,
+        row=row, col=col, result=result["result"].value, version=game.version
+    )
+
+    # Notificar el fin de la partida (repeticiones, torneos, estadísticas)
+    if result.get("game_over", False):
+        event_service.emit(EventService.GAME_FINISHED, game)
 
     # Cambiar turno si no terminó el juego
     if not result.get("game_over", False):
         game.next_turn()
 
-    return {
+    event_service.emit(EventService.GAME_UPDATED, game)
+
+    response = {
         "result": result["result"].value,
         "ship_sunk": result.get("ship_sunk"),
         "game_over": result.get("game_over", False),
         "winner": result.get("winner")
     }
+    if game.is_multiplayer:
+        response["target_player_id"] = target_id
+        response["player_eliminated"] = result.get("player_eliminated")
+    return response
+
+
+@router.post("/partidas/{game_id}/disparo", status_code=status.HTTP_200_OK)
+async def take_shot(game_id: str, shot: ShotCreate, idempotency_key: Optional[str] = Header(None, max_length=255)):
+    """
+    Realiza un disparo en el tablero del oponente.
+    Si se envía la cabecera `Idempotency-Key`, los reintentos con la misma clave
+    retornan la respuesta original sin volver a validar ni resolver el disparo.
+    """
+    # Huella de la solicitud: una misma clave con otra casilla u otro objetivo es un conflicto
+    request_fingerprint = (shot.row, shot.col, shot.target_player_id)
+    # Turno de la IA pendiente (una solicitud anterior falló después de resolver el disparo del jugador).
+    # Se juega antes de consultar la caché: entre la búsqueda y el guardado no puede haber puntos de espera
+    pending_ai_shot = None
+    if ai_service.opponent(game_id) is not None and game_id in games:
+        pending_ai_shot = await _play_ai_turn(game_id)
+
+    if idempotency_key:
+        cached = shot_idempotency_cache.get(game_id, shot.player_id, idempotency_key)
+        if cached is not None:
+            fingerprint, response = cached
+            if fingerprint != request_fingerprint:
+                raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="La clave de idempotencia ya se usó con otro disparo")
+            if pending_ai_shot is not None and "ai_shot" not in response:
+                response["ai_shot"] = pending_ai_shot
+            return response
+
+    if game_id not in games:
+        raise HTTPException(status_code=404, detail="Partida no encontrada")
+
+    game = games[game_id]
+
+    # Verificar que el jugador exista en global players
+    if shot.player_id not in players:
+        raise HTTPException(status_code=404, detail="Jugador no encontrado")
+
+    # Verificar que el jugador sea parte de la partida
+    if shot.player_id not in game.players:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="El jugador no pertenece a esta partida")
+
+    attacker = game.players[shot.player_id]
+
+    # Verificar que sea el turno del jugador
+    if not game.is_players_turn(attacker.id):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No es tu turno")
+
+    # Encontrar defensor: el objetivo indicado o, en partidas de 2 jugadores, el oponente
+    target_id = shot.target_player_id or game.default_target(shot.player_id)
+    if target_id is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Debes indicar el jugador objetivo (target_player_id)")
+    if target_id not in game.players:
+        raise HTTPException(status_code=404, detail="No hay defensor en la partida")
+    if target_id == shot.player_id:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No puedes dispararte a ti mismo")
+    if game.is_eliminated(target_id):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="El jugador objetivo ya fue eliminado")
+
+    shots_tree = game.shot_tree(attacker, target_id)
+
+    # Verificar duplicado de disparo
+    if shots_tree.find(shot.row, shot.col) is not None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Ya has disparado a la posición ({shot.row}, {shot.col})")
+
+    # Validar límites del tablero
+    if not (0 <= shot.row < game.board_size and 0 <= shot.col < game.board_size):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Coordenadas fuera de los límites del tablero")
+
+    response = _resolve_shot(game_id, game, attacker, target_id, shot.row, shot.col)
+    # La búsqueda y el guardado ocurren sin puntos de espera (await) entre ellos,
+    # así que un duplicado concurrente siempre encuentra la respuesta guardada
+    if idempotency_key:
+        shot_idempotency_cache.put(game_id, shot.player_id, idempotency_key, request_fingerprint, response)
+
+    # En partidas contra la IA, el oponente responde en la misma solicitud
+    # (se completa la misma respuesta guardada, así que los reintentos también la ven)
+    if ai_service.opponent(game_id) is not None and not response["game_over"]:
+        ai_shot = await _play_ai_turn(game_id)
+        if ai_shot is not None:
+            response["ai_shot"] = ai_shot
+    return response
+
+
+async def _play_ai_turn(game_id: str) -> Optional[dict]:
+    """
+    Calcula y resuelve el disparo de la IA si es su turno. Retorna el disparo o None.
+    Si el cálculo en el grupo de procesos falla, se usa un movimiento de respaldo
+    calculado en el propio proceso, así que el turno nunca queda en manos de la IA.
+    """
+    ai_id, level = ai_service.opponent(game_id)
+    with games.hold(game_id) as game:
+        if game.state == GameState.FINISHED or str(game.current_turn) != ai_id:
+            return None
+        target_id = game.default_target(ai_id)
+        try:
+            move = await ai_service.next_move(game, ai_id, target_id, level)
+        except Exception as e:
+            audit_logger.log("error", action="ai_next_move", game_id=game_id, error=repr(e))
+            move = None
+
+    # Otra solicitud pudo jugar el turno mientras se calculaba el movimiento
+    if game.state == GameState.FINISHED or str(game.current_turn) != ai_id:
+        return None
+    ai_player = game.players[ai_id]
+    if move is None or game.shot_tree(ai_player, target_id).find(*move) is not None:
+        move = ai_service.fallback_move(game, ai_id, target_id)
+    row, col = move
+    return {"row": row, "col": col, **_resolve_shot(game_id, game, ai_player, target_id, row, col)}
 
 
 @router.get("/partidas/{game_id}/estado/{player_id}", status_code=status.HTTP_200_OK)
@@ -342,13 +646,12 @@ async def get_game_state(game_id: str, player_id: str):
         raise HTTPException(status_code=404, detail="Jugador no encontrado")
 
     game = games[game_id]
-    player = players[player_id]
 
     # Verificar que el jugador sea parte de la partida
-    if str(player.id) not in list(game.players.keys()):
+    if player_id not in game.players:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="El jugador no pertenece a esta partida")
 
-    state = game.get_game_state(player.id)
+    player = game.players[player_id]
     return {
         "game_id": game_id,
         "player_id": str(player.id),
@@ -358,7 +661,69 @@ async def get_game_state(game_id: str, player_id: str):
         "winner": str(game.winner_id) if game.winner_id else None,
         "board_size": game.board_size,
         "ships_remaining": len([s for s in player.fleet if not s.is_sunk]),
-        "total_ships": len(player.fleet)
+        "total_ships": len(player.fleet),
+        "eliminated": game.is_eliminated(player_id)
     }
 
 
+
+
+@router.get("/partidas/{game_id}/disparos/{player_id}", status_code=status.HTTP_200_OK)
+async def query_shots(
+    game_id: str,
+    player_id: str,
+    row_min: Optional[int] = Query(None, ge=0),
+    row_max: Optional[int] = Query(None, ge=0),
+    col_min: Optional[int] = Query(None, ge=0),
+    col_max: Optional[int] = Query(None, ge=0),
+    result: Optional[ShotResult] = None,
+    turn_min: Optional[int] = Query(None, ge=1, description="Número de disparo inicial del jugador contra el objetivo (1 = primero)"),
+    turn_max: Optional[int] = Query(None, ge=1, description="Número de disparo final del jugador contra el objetivo (incluido)"),
+    target_player_id: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0)
+):
+    """
+    Consulta los disparos de un jugador filtrando por región, tipo de resultado
+    y rango de turnos, con paginación. Con filtro de región los disparos se
+    ordenan por (fila, columna); sin él, por turno.
+
+    `turn` (y `turn_min`/`turn_max`) es el número de disparo del jugador contra
+    el objetivo consultado, empezando en 1. En partidas de 2 jugadores es su
+    número de disparo en la partida; en todos contra todos cada objetivo lleva
+    su propia numeración.
+    """
+    if game_id not in games:
+        raise HTTPException(status_code=404, detail="Partida no encontrada")
+
+    game = games[game_id]
+    if player_id not in game.players:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="El jugador no pertenece a esta partida")
+
+    target_id = target_player_id or game.default_target(player_id)
+    if target_id is None or target_id not in game.players:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Debes indicar un jugador objetivo válido (target_player_id)")
+
+    shots_tree = game.shot_tree(game.players[player_id], target_id)
+    matches = shots_tree.query(row_min, row_max, col_min, col_max, result, turn_min, turn_max)
+    page = list(islice(matches, offset, offset + limit + 1))
+    has_more = len(page) > limit
+
+    return {
+        "game_id": game_id,
+        "player_id": player_id,
+        "target_player_id": target_id,
+        "total_shots": len(shots_tree),
+        "offset": offset,
+        "next_offset": offset + limit if has_more else None,
+        "shots": [
+            {
+                "turn": shot.turn,
+                "row": shot.coordinate.row,
+                "col": shot.coordinate.col,
+                "result": shot.result,
+                "affected_ship": shot.affected_ship
+            }
+            for shot in page[:limit]
+        ]
+    }
@@ -0,0 +1,32 @@
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, Query, status
+from app.core.Security import check_admin
+from app.service.Profiler_service import profiler_service
+from app.service.Worker_service import worker_service
+
+router = APIRouter()
+
+
+@router.get("/admin/perfiles", status_code=status.HTTP_200_OK)
+async def list_profiles(
+    limit: int = Query(20, ge=1, le=200),
+    x_admin_token: Optional[str] = Header(None)
+):
+    """
+    Lista las capturas de perfilado recientes, de la más lenta a la más rápida.
+    Las pilas cubren todo el bucle de eventos durante la captura: `overlapping_requests`
+    indica cuántas otras solicitudes se ejecutaron a la vez (0 = captura exclusiva).
+    """
+    check_admin(x_admin_token)
+    captures = await worker_service.run_in_thread(profiler_service.list_captures, limit)
+    return {"total": len(captures), "captures": captures}
+
+
+@router.get("/admin/perfiles/{capture_id}", status_code=status.HTTP_200_OK)
+async def get_profile(capture_id: str, x_admin_token: Optional[str] = Header(None)):
+    """Obtiene una captura de perfilado con sus pilas de llamadas principales."""
+    check_admin(x_admin_token)
+    capture = await worker_service.run_in_thread(profiler_service.get_capture, capture_id)
+    if capture is None:
+        raise HTTPException(status_code=404, detail="Captura no encontrada")
+    return capture
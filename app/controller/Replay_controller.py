@@ -0,0 +1,112 @@
+import os
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, Query, status
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from app.controller.Game_controller import games
+from app.core.Security import check_admin
+from app.model.Game_model import GameState
+from app.model.Replay_model import decode_replay, encode_replay
+from app.model.Snapshot_model import GameSnapshot
+from app.service.Replay_service import replay_service, iter_chunks
+from app.service.Worker_service import worker_service
+
+router = APIRouter()
+
+
+def _get_replay(game_id: str) -> bytes:
+    """
+    Obtiene la repetición guardada o la genera para una partida terminada.
+    Las partidas en curso no tienen repetición: revelaría la flota del rival.
+    """
+    blob = replay_service.get(game_id)
+    if blob is not None:
+        return blob
+    if game_id not in games:
+        raise HTTPException(status_code=404, detail="Repetición no encontrada")
+    game = games[game_id]
+    if game.state != GameState.FINISHED:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="La repetición solo está disponible cuando la partida termina")
+    return encode_replay(game)
+
+
+@router.get("/partidas/{game_id}/replay", status_code=status.HTTP_200_OK)
+async def stream_replay(game_id: str):
+    """Transmite la repetición binaria de una partida."""
+    blob = _get_replay(game_id)
+    return StreamingResponse(
+        iter_chunks(blob),
+        media_type="application/octet-stream",
+        headers={"Content-Disposition": f'attachment; filename="{game_id}.bnr"'}
+    )
+
+
+@router.get("/partidas/{game_id}/replay/json", status_code=status.HTTP_200_OK)
+async def get_replay_json(game_id: str):
+    """Obtiene la repetición decodificada, con los disparos en orden de turno."""
+    # Decodificar es trabajo puro sobre bytes: se hace en otro proceso, fuera del GIL del bucle
+    return await worker_service.run_in_process(decode_replay, _get_replay(game_id))
+
+
+@router.get("/replays", status_code=status.HTTP_200_OK)
+async def list_replays(limit: int = Query(100, ge=1, le=1000), offset: int = Query(0, ge=0)):
+    """Lista las partidas terminadas con repetición guardada."""
+    return {"game_ids": replay_service.list_ids(limit, offset)}
+
+
+@router.get("/replays/export", status_code=status.HTTP_200_OK)
+async def export_replays(x_admin_token: Optional[str] = Header(None)):
+    """
+    Exporta todas las repeticiones guardadas en un único archivo binario indexado.
+    Recorre el almacén completo: solo para administradores.
+    """
+    check_admin(x_admin_token)
+    path = await worker_service.run_in_thread(replay_service.export_archive, replay_service.list_ids(limit=len(replay_service)))
+    return FileResponse(
+        path,
+        media_type="application/octet-stream",
+        filename="replays.bnra",
+        background=BackgroundTask(os.remove, path)
+    )
+
+
+@router.get("/partidas/{game_id}/que-pasaria", status_code=status.HTTP_200_OK)
+async def what_if(game_id: str, turn: int = Query(..., ge=1, description="Turno de la partida (1 = primer disparo)"),
+                  row: int = Query(..., ge=0), col: int = Query(..., ge=0), target_player_id: Optional[str] = None):
+    """
+    Análisis "¿qué pasaría si?": resultado de un disparo alternativo en el turno indicado
+    de una partida terminada, comparado con el disparo que realmente se hizo.
+    Los turnos cuentan todos los disparos de la partida y empiezan en 1.
+    """
+    game = games.get(game_id)
+    if game is None:
+        raise HTTPException(status_code=404, detail="Partida no encontrada")
+    if game.state != GameState.FINISHED:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="El análisis solo está disponible para partidas terminadas")
+    if turn > len(game.shot_log):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Turno fuera del historial de la partida")
+
+    # Estado con los `turn - 1` disparos anteriores aplicados
+    before = await worker_service.run_in_thread(GameSnapshot.from_game, game, turn - 1)
+    pid, actual_row, actual_col, actual_result, actual_target = game.shot_log[turn - 1]
+    # El disparo alternativo lo hace quien disparó en ese turno, no el siguiente según el orden de jugadores
+    before.current = pid
+    alternative = before.fork()
+    try:
+        result, ship = alternative.shoot(row, col, target_player_id or actual_target)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return {
+        "turn": turn,
+        "player_id": pid,
+        "actual": {"row": actual_row, "col": actual_col, "result": actual_result, "target_player_id": actual_target},
+        "alternative": {
+            "row": row,
+            "col": col,
+            "result": result,
+            "ship": ship,
+            "target_player_id": target_player_id or actual_target,
+            "winner": alternative.winner
+        }
+    }
@@ -0,0 +1,33 @@
+from fastapi import APIRouter, HTTPException, status
+from app.core.Settings import settings
+from app.service.Shared_state_service import SharedStateReader
+
+router = APIRouter()
+reader = SharedStateReader(max_open=settings.REPLICA_MAX_OPEN_SEGMENTS)
+
+
+def _published(result):
+    if result is None:
+        raise HTTPException(status_code=404, detail="Partida no encontrada")
+    return result
+
+
+@router.get("/partidas/{game_id}/estado/{player_id}", status_code=status.HTTP_200_OK)
+async def get_game_state(game_id: str, player_id: str):
+    """Obtiene el estado de la partida para un jugador desde la memoria compartida."""
+    try:
+        state = _published(reader.game_state(game_id, player_id))
+    except TimeoutError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+    if not state:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="El jugador no pertenece a esta partida")
+    return state
+
+
+@router.get("/partidas/{game_id}/espectador", status_code=status.HTTP_200_OK)
+async def get_public_view(game_id: str):
+    """Obtiene la vista pública de la partida desde la memoria compartida."""
+    try:
+        return _published(reader.public_view(game_id))
+    except TimeoutError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
@@ -0,0 +1,32 @@
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
+from app.controller.Game_controller import games
+from app.service.Spectator_service import spectator_service
+
+router = APIRouter()
+
+
+@router.get("/partidas/{game_id}/espectador", status_code=status.HTTP_200_OK)
+async def spectate_game(game_id: str, if_none_match: Optional[str] = Header(None)):
+    """Obtiene la vista pública de la partida (sin revelar barcos no hundidos)."""
+    if game_id not in games:
+        raise HTTPException(status_code=404, detail="Partida no encontrada")
+
+    broadcast = spectator_service.snapshot(games[game_id])
+    if if_none_match == broadcast.etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": broadcast.etag})
+    return Response(content=broadcast.payload, media_type="application/json", headers={"ETag": broadcast.etag})
+
+
+@router.get("/partidas/{game_id}/espectador/stream", status_code=status.HTTP_200_OK)
+async def stream_game(game_id: str):
+    """Transmite la vista pública de la partida como Server-Sent Events en cada cambio."""
+    if game_id not in games:
+        raise HTTPException(status_code=404, detail="Partida no encontrada")
+
+    return StreamingResponse(
+        spectator_service.stream(games[game_id]),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, HTTPException, Query, status
+from app.controller.Game_controller import players
+from app.model.Stats_model import PlayerStats
+from app.service.Stats_service import stats_service
+
+router = APIRouter()
+
+
+@router.get("/leaderboard", status_code=status.HTTP_200_OK)
+async def get_leaderboard(limit: int = Query(10, ge=1, le=500), offset: int = Query(0, ge=0)):
+    """Obtiene una página del ranking global de jugadores."""
+    return {
+        "total": len(stats_service.leaderboard),
+        "offset": offset,
+        "players": [
+            {"rank": rank, **stats.to_dict()}
+            for rank, stats in enumerate(stats_service.top(limit, offset), start=offset + 1)
+        ]
+    }
+
+
+@router.get("/jugadores/{player_id}/stats", status_code=status.HTTP_200_OK)
+async def get_player_stats(player_id: str):
+    """Obtiene las estadísticas y la posición en el ranking de un jugador."""
+    stats = stats_service.get_stats(player_id)
+    if stats is None:
+        if player_id not in players:
+            raise HTTPException(status_code=404, detail="Jugador no encontrado")
+        stats = PlayerStats(player_id, players[player_id].name)
+    return {"rank": stats_service.get_rank(player_id), **stats.to_dict()}
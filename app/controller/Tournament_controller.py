@@ -0,0 +1,110 @@
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, status
+from pydantic import BaseModel, Field
+from app.controller.Game_controller import games, players, admin_config, ShipConfig
+from app.model.Tournament_model import Tournament, TournamentFormat
+from app.service.Tournament_service import TournamentService
+
+router = APIRouter()
+
+tournament_service = TournamentService(games=games, players=players)
+
+
+# Modelos de solicitud (Request Models)
+class TournamentCreate(BaseModel):
+    name: str
+    format: TournamentFormat = TournamentFormat.SINGLE_ELIMINATION
+    player_ids: List[str] = Field(..., min_length=2)
+    # Si no se especifican, se usa la configuración del administrador
+    # (un reglamento propio pasa las mismas validaciones que /admin/configurar-barcos)
+    board_size: Optional[int] = Field(None, ge=5)
+    ships: Optional[List[ShipConfig]] = None
+
+
+def _tournament_summary(tournament: Tournament) -> dict:
+    return {
+        "tournament_id": str(tournament.id),
+        "name": tournament.name,
+        "format": tournament.format.value,
+        "state": tournament.state.value,
+        "current_round": tournament.current_round,
+        "total_rounds": tournament.total_rounds,
+        "pending_matches": tournament.pending_matches,
+        "total_players": len(tournament.player_ids),
+        "champion": tournament.champion_id
+    }
+
+
+def _get_tournament(tournament_id: str) -> Tournament:
+    try:
+        return tournament_service.get_tournament(tournament_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.post("/torneos", status_code=status.HTTP_201_CREATED)
+async def create_tournament(data: TournamentCreate):
+    """Crea un torneo y lanza las partidas de la primera ronda."""
+    board_size = data.board_size or admin_config["board_size"]
+    ships = [{"name": s.name, "size": s.size} for s in data.ships] if data.ships else admin_config["ships"]
+    if not board_size or not ships:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="El administrador debe configurar los barcos primero")
+
+    try:
+        tournament = tournament_service.create_tournament(
+            name=data.name,
+            format=data.format,
+            player_ids=data.player_ids,
+            board_size=board_size,
+            ships=ships
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return _tournament_summary(tournament)
+
+
+@router.get("/torneos/{tournament_id}", status_code=status.HTTP_200_OK)
+async def get_tournament(tournament_id: str):
+    """Obtiene el estado del torneo y los enfrentamientos de la ronda actual."""
+    tournament = _get_tournament(tournament_id)
+    summary = _tournament_summary(tournament)
+    summary["matches"] = [
+        match.model_dump() for match in (tournament.rounds[-1] if tournament.rounds else [])
+    ]
+    return summary
+
+
+@router.get("/torneos/{tournament_id}/rondas/{round_number}", status_code=status.HTTP_200_OK)
+async def get_tournament_round(tournament_id: str, round_number: int):
+    """Obtiene los enfrentamientos de una ronda del torneo."""
+    tournament = _get_tournament(tournament_id)
+    if not 1 <= round_number <= len(tournament.rounds):
+        raise HTTPException(status_code=404, detail="Ronda no encontrada")
+    return {
+        "round": round_number,
+        "matches": [match.model_dump() for match in tournament.rounds[round_number - 1]]
+    }
+
+
+@router.get("/torneos/{tournament_id}/clasificacion", status_code=status.HTTP_200_OK)
+async def get_tournament_standings(tournament_id: str):
+    """Obtiene la clasificación del torneo."""
+    tournament = _get_tournament(tournament_id)
+    return {
+        "tournament_id": tournament_id,
+        "standings": [
+            {
+                "position": position,
+                "player_id": s.player_id,
+                "name": players[s.player_id].name if s.player_id in players else None,
+                "points": s.points,
+                "played": s.played,
+                "wins": s.wins,
+                "losses": s.losses,
+                "byes": s.byes,
+                "eliminated": s.eliminated
+            }
+            for position, s in enumerate(tournament.ranking(), start=1)
+        ]
+    }
@@ -0,0 +1,12 @@
+from typing import Optional
+from fastapi import HTTPException, status
+from .Settings import settings
+
+
+def check_admin(admin_token: Optional[str]):
+    """
+    Verifica el token de administrador (cabecera X-Admin-Token) de los endpoints /admin.
+    Sin ADMIN_TOKEN configurado se deniega el acceso.
+    """
+    if not settings.ADMIN_TOKEN or admin_token != settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Token de administrador inválido")
@@ -0,0 +1,96 @@
+from pathlib import Path
+from typing import List, Literal, Optional
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    """Configuración de la aplicación, leída de variables de entorno y del archivo .env."""
+    model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
+
+    ENVIRONMENT: str = "local"
+    PROJECT_NAME: str = "Api Batalla Naval"
+
+    # Servidor HTTP (python -m app.server). Las opciones sin valor toman el del perfil
+    SERVER_PROFILE: Literal["default", "production"] = "default"
+    SERVER_APP: str = "app.main:app"
+    SERVER_HOST: str = "127.0.0.1"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: Optional[int] = None
+    SERVER_LOOP: Optional[Literal["auto", "asyncio", "uvloop"]] = None
+    SERVER_HTTP: Optional[Literal["auto", "h11", "httptools"]] = None
+    SERVER_KEEPALIVE_SECONDS: Optional[int] = None
+    SERVER_BACKLOG: Optional[int] = None
+    SERVER_ACCESS_LOG: Optional[bool] = None
+
+    # Orígenes permitidos por CORS (vacío = sin CORS) y compresión de respuestas grandes
+    CORS_ALLOW_ORIGINS: List[str] = ["*"]
+    GZIP_MINIMUM_SIZE: int = 1024
+    GZIP_COMPRESS_LEVEL: int = 5
+
+    # Crear las partidas de ejemplo del GameService cuando se usa por primera vez
+    LOAD_SAMPLE_GAMES: bool = True
+    # Crear el GameService durante el arranque en lugar de en el primer uso
+    WARM_UP_SERVICES: bool = False
+
+    # Observabilidad opcional (la librería solo se importa si hay token)
+    LOGFIRE_TOKEN: Optional[str] = None
+
+    # Token que identifica a un administrador en las cabeceras (X-Admin-Token).
+    # Sin token configurado, los endpoints de administración deniegan el acceso
+    ADMIN_TOKEN: Optional[str] = None
+
+    # Perfilado de peticiones: siempre, o bajo demanda con la cabecera X-Profile de un
+    # administrador. Desactivados, el middleware no se registra
+    PROFILING_ENABLED: bool = False
+    PROFILING_ON_DEMAND: bool = False
+    PROFILING_DIR: Path = Path(".profiles")
+    PROFILING_MAX_FILES: int = 200
+    PROFILING_TOP_STACKS: int = 25
+
+    # Limitación de tasa (cubeta de fichas): por jugador registrado y, además, por IP.
+    # El límite por IP es más alto porque varios clientes pueden compartir IP (NAT)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_PER_SECOND: float = 20.0
+    RATE_LIMIT_BURST: int = 40
+    RATE_LIMIT_IP_PER_SECOND: float = 200.0
+    RATE_LIMIT_IP_BURST: int = 400
+    RATE_LIMIT_MAX_KEYS: int = 100_000
+
+    # Control de admisión: responder 429 si el bucle de eventos se retrasa más del umbral (0 = desactivado)
+    LOOP_LAG_THRESHOLD_MS: float = 250.0
+    LOOP_LAG_INTERVAL_MS: float = 100.0
+
+    # Grupos de trabajadores para trabajo intensivo en CPU (0 = ejecutar en el bucle de eventos)
+    WORKER_THREADS: int = 4
+    WORKER_PROCESSES: int = 2
+
+    # Caché de respuestas para disparos con cabecera Idempotency-Key
+    IDEMPOTENCY_MAX_KEYS_PER_GAME: int = 64
+    IDEMPOTENCY_MAX_GAMES: int = 10_000
+
+    # Vistas públicas de espectador en caché (LRU por partida)
+    SPECTATOR_MAX_SNAPSHOTS: int = 10_000
+
+    # Publicación del estado en memoria compartida para procesos réplica de solo lectura
+    SHARED_STATE_ENABLED: bool = False
+    SHARED_STATE_MAX_BOARD_SIZE: int = 1000
+    # Segundos que las réplicas siguen sirviendo una partida terminada antes de retirarla
+    SHARED_STATE_FINISHED_GRACE_SECONDS: float = 300.0
+    REPLICA_MAX_OPEN_SEGMENTS: int = 1024
+
+    # Registro de auditoría (JSON lines comprimido, escrito por lotes en segundo plano)
+    AUDIT_ENABLED: bool = True
+    AUDIT_DIR: Path = Path(".audit")
+    AUDIT_MAX_QUEUE: int = 100_000
+    AUDIT_BATCH_SIZE: int = 1000
+    AUDIT_FLUSH_INTERVAL_MS: float = 200.0
+    AUDIT_MAX_FILE_BYTES: int = 10_000_000
+    AUDIT_MAX_FILES: int = 50
+
+    # Compactación de partidas inactivas (intervalo 0 = sin compactación periódica)
+    GAME_IDLE_SECONDS: float = 300.0
+    GAME_MAX_HYDRATED: int = 100_000
+    GAME_COMPACT_INTERVAL_SECONDS: float = 30.0
+
+
+settings = Settings()
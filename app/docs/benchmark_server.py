@@ -0,0 +1,96 @@
+"""
+Compara las solicitudes por segundo del perfil por defecto y del perfil de producción.
+
+    python app/docs/benchmark_server.py
+    python app/docs/benchmark_server.py --connections 128 --seconds 15 --path /api/jugadores
+
+Levanta `python -m app.server` con cada perfil en un puerto libre y lo carga con
+conexiones keep-alive HTTP/1.1 concurrentes (solo biblioteca estándar, sin wrk).
+La limitación de tasa se desactiva durante la prueba.
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(profile: str, port: int) -> subprocess.Popen:
+    env = dict(os.environ, SERVER_PROFILE=profile, SERVER_PORT=str(port), SERVER_ACCESS_LOG="false",
+               RATE_LIMIT_ENABLED="false", LOAD_SAMPLE_GAMES="false")
+    return subprocess.Popen([sys.executable, "-m", "app.server"], cwd=ROOT, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def wait_ready(port: int, timeout: float = 20.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"El servidor no respondió en el puerto {port}")
+
+
+async def client(port: int, request: bytes, stop_at: float, counts: list):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        while time.monotonic() < stop_at:
+            writer.write(request)
+            headers = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in headers.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            await reader.readexactly(length)
+            counts[0] += 1
+    finally:
+        writer.close()
+
+
+async def load(port: int, path: str, connections: int, seconds: float) -> float:
+    request = (f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nOrigin: http://localhost\r\n"
+               f"Accept-Encoding: gzip\r\n\r\n").encode()
+    counts = [0]
+    # Calentamiento breve antes de medir
+    await asyncio.gather(*(client(port, request, time.monotonic() + 1, [0]) for _ in range(connections)))
+    start = time.monotonic()
+    await asyncio.gather(*(client(port, request, start + seconds, counts) for _ in range(connections)))
+    return counts[0] / (time.monotonic() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--path", default="/")
+    parser.add_argument("--connections", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    args = parser.parse_args()
+
+    results = {}
+    for profile in ("default", "production"):
+        port = free_port()
+        server = start_server(profile, port)
+        try:
+            wait_ready(port)
+            results[profile] = asyncio.run(load(port, args.path, args.connections, args.seconds))
+        finally:
+            server.terminate()
+            server.wait()
+        print(f"{profile:<12} {results[profile]:>10.0f} req/s")
+    print(f"{'mejora':<12} {results['production'] / results['default']:>10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,248 @@
-
+import json
+from contextlib import asynccontextmanager
+from typing import Optional
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.controller.Game_controller import router as game_router
+from fastapi.middleware.gzip import GZipMiddleware
+from app.controller.Game_controller import router as game_router, players
+from app.controller.Profiler_controller import router as profiler_router
+from app.controller.Replay_controller import router as replay_router
+from app.controller.Tournament_controller import router as tournament_router
+from app.controller.Stats_controller import router as stats_router
+from app.controller.Spectator_controller import router as spectator_router
+from app.controller.Audit_controller import router as audit_router
+from app.core.Settings import settings
+from app.service.Rate_limit_service import rate_limiter, ip_rate_limiter, loop_lag_monitor, retry_after_seconds
+from app.service.Worker_service import worker_service
+from app.service.Audit_service import audit_logger
+from app.service.Game_store_service import idle_game_compactor
+
+
+class ProfilerMiddleware:
+    """
+    Middleware ASGI que perfila la petición con cProfile cuando el perfilado
+    está activado en la configuración o, con el perfilado bajo demanda, cuando
+    un administrador envía la cabecera `X-Profile: 1` junto con su `X-Admin-Token`.
+    Solo se registra si alguna de las dos opciones está activada, por lo que
+    no añade costo cuando está desactivado (aunque haya token de administrador).
+
+    cProfile mide todo el hilo del bucle: si otras solicitudes se ejecutan
+    durante la captura, sus pilas también aparecen. Por eso se cuentan las
+    solicitudes en curso y las que empiezan durante la captura.
+    """
+
+    def __init__(self, app, always: bool, admin_token: str = None):
+        self.app = app
+        self.always = always
+        self.admin_token = admin_token.encode() if admin_token else None
+        # Solicitudes HTTP en curso y total iniciadas (para contar las solapadas con una captura)
+        self.in_flight = 0
+        self.started = 0
+
+    def _should_profile(self, scope) -> bool:
+        if self.always:
+            return True
+        if not self.admin_token:
+            return False
+        headers = dict(scope["headers"])
+        return headers.get(b"x-profile") == b"1" and headers.get(b"x-admin-token") == self.admin_token
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        self.in_flight += 1
+        self.started += 1
+        try:
+            if self._should_profile(scope):
+                await self._profile(scope, receive, send)
+            else:
+                await self.app(scope, receive, send)
+        finally:
+            self.in_flight -= 1
+
+    async def _profile(self, scope, receive, send):
+        from app.service.Profiler_service import profiler_service
+
+        capture = profiler_service.start()
+        if capture is None:
+            # Ya hay otra captura en curso
+            await self.app(scope, receive, send)
+            return
+
+        already_running = self.in_flight - 1
+        started_before = self.started
+        status_code = None
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            overlapping = already_running + self.started - started_before
+            record = profiler_service.stop(capture, scope["method"], scope["path"], status_code, overlapping)
+            # La respuesta ya se envió: las pilas se procesan y guardan en un hilo
+            await worker_service.run_in_thread(profiler_service.save, record, capture["profiler"])
+
+
+class RateLimitMiddleware:
+    """
+    Middleware ASGI de limitación de tasa y control de admisión para `/api`.
+    - Limita cada IP con una cubeta de fichas y, además, cada jugador registrado
+      cuando su ID va en la ruta. Los IDs que no son de un jugador no tienen
+      cubeta propia: rotar IDs inventados no da fichas nuevas ni desplaza las
+      cubetas de los jugadores reales.
+    - Rechaza con 429 las solicitudes nuevas mientras el retraso del bucle de
+      eventos supera el umbral configurado.
+    Se registra dentro de CORS, para que los 429 lleven las cabeceras CORS y las
+    solicitudes preflight (OPTIONS) no consuman fichas.
+    """
+
+    def __init__(self, app, limiter, ip_limiter, is_player=None, lag_monitor=None, lag_threshold_ms: float = 0):
+        self.app = app
+        self.limiter = limiter
+        self.ip_limiter = ip_limiter
+        self.is_player = is_player
+        self.lag_monitor = lag_monitor
+        self.lag_threshold_ms = lag_threshold_ms
+
+    @staticmethod
+    def _player_id(scope) -> Optional[str]:
+        # /api/partidas/{game_id}/(estado|flota)/{player_id}
+        parts = scope["path"].split("/")
+        if len(parts) == 6 and parts[2] == "partidas" and parts[4] in ("estado", "flota"):
+            return parts[5]
+        return None
+
+    def _wait(self, scope) -> float:
+        client = scope.get("client")
+        wait = self.ip_limiter.allow(f"ip:{client[0] if client else 'unknown'}")
+        if wait:
+            return wait
+        player_id = self._player_id(scope)
+        if player_id is not None and self.is_player is not None and self.is_player(player_id):
+            return self.limiter.allow(f"player:{player_id}")
+        return 0.0
+
+    async def _reject(self, send, detail: str, retry_after: int):
+        body = json.dumps({"detail": detail}).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(retry_after).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "OPTIONS" or not scope["path"].startswith("/api/"):
+            await self.app(scope, receive, send)
+            return
+
+        if self.lag_monitor is not None and self.lag_threshold_ms and self.lag_monitor.lag_ms > self.lag_threshold_ms:
+            await self._reject(send, "Servidor saturado, inténtalo de nuevo", 1)
+            return
+
+        wait = self._wait(scope)
+        if wait:
+            await self._reject(send, "Demasiadas solicitudes", retry_after_seconds(wait))
+            return
+
+        await self.app(scope, receive, send)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Inicializa los subsistemas opcionales al arrancar.
+    Las dependencias opcionales se importan aquí y solo si están configuradas,
+    para que importar la aplicación (cada worker o `--reload`) sea rápido.
+    """
+    if settings.LOGFIRE_TOKEN:
+        import logfire
+        logfire.configure(token=settings.LOGFIRE_TOKEN, service_name=settings.PROJECT_NAME, environment=settings.ENVIRONMENT)
+        logfire.instrument_fastapi(app)
+
+    if settings.WARM_UP_SERVICES:
+        from app.service.Game_service import get_game_service
+        get_game_service()
+
+    # El estado compartido (multiprocessing.shared_memory) solo se importa si está activado
+    shared_state_publisher = None
+    if settings.SHARED_STATE_ENABLED:
+        from app.service.Shared_state_service import shared_state_publisher
+
+    if settings.RATE_LIMIT_ENABLED and settings.LOOP_LAG_THRESHOLD_MS:
+        loop_lag_monitor.start()
+    idle_game_compactor.start()
+
+    yield
+
+    await idle_game_compactor.stop()
+    await loop_lag_monitor.stop()
+    worker_service.shutdown()
+    if shared_state_publisher is not None:
+        shared_state_publisher.close()
+    audit_logger.stop()
 
 
 # Configuración básica de la aplicación
 app = FastAPI(
     title='API Batalla Naval',
     description='API para el juego de Batalla Naval',
-    version='1.0.0'
+    version='1.0.0',
+    lifespan=lifespan
 )
 
-# Configuración CORS básica
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# Limitación de tasa y control de admisión (el último middleware añadido es el más externo:
+# este queda dentro de CORS y de la compresión)
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(
+        RateLimitMiddleware,
+        limiter=rate_limiter,
+        ip_limiter=ip_rate_limiter,
+        is_player=players.__contains__,
+        lag_monitor=loop_lag_monitor,
+        lag_threshold_ms=settings.LOOP_LAG_THRESHOLD_MS
+    )
+
+# CORS con lista de orígenes permitidos (conjunto precalculado: comprobar un origen es O(1))
+if settings.CORS_ALLOW_ORIGINS:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=frozenset(settings.CORS_ALLOW_ORIGINS),
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+# Compresión de respuestas grandes (estados, repeticiones); los flujos SSE no se comprimen
+if settings.GZIP_MINIMUM_SIZE > 0:
+    app.add_middleware(GZipMiddleware, minimum_size=settings.GZIP_MINIMUM_SIZE, compresslevel=settings.GZIP_COMPRESS_LEVEL)
+
+# Perfilado de peticiones (solo si está activado o se permite bajo demanda con token de administrador)
+if settings.PROFILING_ENABLED or (settings.PROFILING_ON_DEMAND and settings.ADMIN_TOKEN):
+    app.add_middleware(
+        ProfilerMiddleware,
+        always=settings.PROFILING_ENABLED,
+        admin_token=settings.ADMIN_TOKEN if settings.PROFILING_ON_DEMAND else None
+    )
 
 
 app.include_router(game_router, prefix="/api")
+app.include_router(profiler_router, prefix="/api")
+app.include_router(replay_router, prefix="/api")
+app.include_router(tournament_router, prefix="/api")
+app.include_router(stats_router, prefix="/api")
+app.include_router(spectator_router, prefix="/api")
+app.include_router(audit_router, prefix="/api")
 
 
 @app.get("/")
@@ -30,6 +251,5 @@ def read_root():
 
 # Iniciar la aplicación
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="127.0.0.1", port=8000)  
-
+    from app.server import run
+    run()
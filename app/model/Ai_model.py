@@ -0,0 +1,223 @@
+"""
+Estrategias de los oponentes controlados por el servidor.
+
+El tablero se representa con enteros como mapas de bits (bit fila * N + columna)
+para que comprobar una colocación cueste una operación AND. Todas las funciones
+son puras y reciben solo enteros y tuplas, por lo que se pueden ejecutar en el
+grupo de procesos.
+
+Niveles:
+- EASY: disparos aleatorios; tras un impacto, prueba las celdas vecinas.
+- MEDIUM: búsqueda con paridad (solo celdas (fila + columna) % k == 0, con k el
+  barco restante más pequeño) y, tras dos impactos alineados, continúa por ese eje.
+- HARD: mapa de densidad de colocaciones posibles de los barcos restantes. Cuando
+  quedan pocas colocaciones, un solucionador exacto enumera todas las
+  combinaciones de barcos compatibles (con memoización de subtableros) y
+  dispara a la celda ocupada en más combinaciones.
+"""
+import random
+from enum import Enum
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+
+class AiLevel(str, Enum):
+    EASY = "easy"
+    MEDIUM = "medium"
+    HARD = "hard"
+
+
+# Tamaño máximo de tablero para jugar contra la IA: las estrategias recorren todas
+# las celdas y colocaciones del tablero (O(N²) por movimiento)
+AI_MAX_BOARD_SIZE = 32
+# Límite de colocaciones válidas (suma entre barcos) para usar el solucionador exacto
+SOLVER_MAX_PLACEMENTS = 48
+SOLVER_MAX_SHIPS = 4
+# Peso de una colocación por cada impacto sin resolver que cubre
+HIT_WEIGHT = 50
+
+
+@lru_cache(maxsize=64)
+def _placements(board_size: int, size: int) -> Tuple[Tuple[int, Tuple[int, ...]], ...]:
+    """Todas las colocaciones (máscara, celdas) de un barco recto de `size` celdas."""
+    result = []
+    for row in range(board_size):
+        for col in range(board_size - size + 1):
+            cells = tuple(row * board_size + col + i for i in range(size))
+            result.append((sum(1 << c for c in cells), cells))
+    if size > 1:
+        for row in range(board_size - size + 1):
+            for col in range(board_size):
+                cells = tuple((row + i) * board_size + col for i in range(size))
+                result.append((sum(1 << c for c in cells), cells))
+    return tuple(result)
+
+
+def _cells_of(mask: int) -> List[int]:
+    cells = []
+    while mask:
+        low = mask & -mask
+        cells.append(low.bit_length() - 1)
+        mask ^= low
+    return cells
+
+
+def _unknown_cells(board_size: int, shot: int) -> List[int]:
+    return [cell for cell in range(board_size * board_size) if not shot >> cell & 1]
+
+
+def _neighbors(board_size: int, cell: int) -> List[int]:
+    row, col = divmod(cell, board_size)
+    result = []
+    if row > 0:
+        result.append(cell - board_size)
+    if row < board_size - 1:
+        result.append(cell + board_size)
+    if col > 0:
+        result.append(cell - 1)
+    if col < board_size - 1:
+        result.append(cell + 1)
+    return result
+
+
+def _target_axis(board_size: int, hits: int, shot: int) -> List[int]:
+    """Celdas sin disparar en los extremos de impactos alineados (o vecinas de un impacto aislado)."""
+    hit_cells = set(_cells_of(hits))
+    candidates = []
+    for cell in hit_cells:
+        row, col = divmod(cell, board_size)
+        for d_row, d_col in ((0, 1), (1, 0)):
+            if row + d_row >= board_size or col + d_col >= board_size:
+                continue
+            if (row + d_row) * board_size + col + d_col not in hit_cells:
+                continue
+            # Extender la línea en ambos sentidos hasta la primera celda que no sea impacto
+            for sign in (1, -1):
+                r, c = row, col
+                while True:
+                    r, c = r + d_row * sign, c + d_col * sign
+                    if not (0 <= r < board_size and 0 <= c < board_size):
+                        break
+                    nxt = r * board_size + c
+                    if nxt in hit_cells:
+                        continue
+                    if not shot >> nxt & 1:
+                        candidates.append(nxt)
+                    break
+    if candidates:
+        return candidates
+    return [n for cell in hit_cells for n in _neighbors(board_size, cell) if not shot >> n & 1]
+
+
+def _density(board_size: int, sizes: Tuple[int, ...], blocked: int, hits: int, shot: int) -> Dict[int, int]:
+    """Peso por celda (sin disparar) de las colocaciones compatibles de los barcos restantes."""
+    weights = [0] * (board_size * board_size)
+    for size in sizes:
+        for mask, cells in _placements(board_size, size):
+            if mask & blocked:
+                continue
+            if hits:
+                covered = mask & hits
+                if not covered:
+                    # En modo objetivo solo cuentan las colocaciones que explican algún impacto
+                    continue
+                weight = 1 + HIT_WEIGHT * bin(covered).count("1")
+                for cell in cells:
+                    weights[cell] += weight
+            else:
+                for cell in cells:
+                    weights[cell] += 1
+    return {cell: weight for cell, weight in enumerate(weights) if weight and not shot >> cell & 1}
+
+
+@lru_cache(maxsize=4096)
+def _solve(board_size: int, sizes: Tuple[int, ...], blocked: int, hits: int) -> Tuple[int, Tuple[Tuple[int, int], ...]]:
+    """
+    Cuenta las combinaciones de colocaciones de `sizes` sin superposición que no
+    tocan `blocked` y cubren todos los `hits`. Retorna (total, ocupación por celda).
+    La caché memoiza los subtableros (barcos restantes, celdas ocupadas, impactos pendientes).
+    """
+    if not sizes:
+        return (1, ()) if not hits else (0, ())
+    if sum(sizes) < bin(hits).count("1"):
+        return 0, ()
+    size, rest = sizes[0], sizes[1:]
+    total = 0
+    counts: Dict[int, int] = {}
+    for mask, cells in _placements(board_size, size):
+        if mask & blocked:
+            continue
+        sub_total, sub_counts = _solve(board_size, rest, blocked | mask, hits & ~mask)
+        if not sub_total:
+            continue
+        total += sub_total
+        for cell in cells:
+            counts[cell] = counts.get(cell, 0) + sub_total
+        for cell, count in sub_counts:
+            counts[cell] = counts.get(cell, 0) + count
+    return total, tuple(counts.items())
+
+
+def _valid_placements(board_size: int, sizes: Tuple[int, ...], blocked: int) -> int:
+    return sum(1 for size in sizes for mask, _ in _placements(board_size, size) if not mask & blocked)
+
+
+def choose_move(level: str, board_size: int, sizes: Tuple[int, ...], misses: int, hits: int,
+                resolved: int, seed: Optional[int] = None) -> Tuple[int, int]:
+    """
+    Elige la siguiente casilla (fila, columna).
+
+    - `sizes`: tamaños de los barcos del rival que siguen a flote.
+    - `misses`: disparos al agua; `hits`: impactos en barcos aún no hundidos;
+      `resolved`: celdas de barcos ya hundidos (información pública).
+    """
+    rng = random.Random(seed)
+    shot = misses | hits | resolved
+    level = AiLevel(level)
+
+    if level == AiLevel.EASY:
+        if hits:
+            candidates = [n for cell in _cells_of(hits) for n in _neighbors(board_size, cell) if not shot >> n & 1]
+            if candidates:
+                return divmod(rng.choice(candidates), board_size)
+        return divmod(rng.choice(_unknown_cells(board_size, shot)), board_size)
+
+    if level == AiLevel.MEDIUM:
+        if hits:
+            candidates = _target_axis(board_size, hits, shot)
+            if candidates:
+                return divmod(rng.choice(candidates), board_size)
+        unknown = _unknown_cells(board_size, shot)
+        parity = min(sizes) if sizes else 1
+        hunting = [cell for cell in unknown if (cell // board_size + cell % board_size) % parity == 0]
+        return divmod(rng.choice(hunting or unknown), board_size)
+
+    blocked = misses | resolved
+    ordered = tuple(sorted(sizes, reverse=True))
+    weights: Dict[int, int] = {}
+    if ordered and len(ordered) <= SOLVER_MAX_SHIPS and _valid_placements(board_size, ordered, blocked) <= SOLVER_MAX_PLACEMENTS:
+        total, counts = _solve(board_size, ordered, blocked, hits)
+        if total:
+            weights = {cell: count for cell, count in counts if not shot >> cell & 1}
+    if not weights:
+        weights = _density(board_size, ordered, blocked, hits, shot)
+    if not weights:
+        return divmod(rng.choice(_unknown_cells(board_size, shot)), board_size)
+    best = max(weights.values())
+    return divmod(rng.choice([cell for cell, weight in weights.items() if weight == best]), board_size)
+
+
+def random_fleet(board_size: int, sizes: List[int], seed: Optional[int] = None) -> List[Tuple[bool, List[Tuple[int, int]]]]:
+    """Coloca barcos rectos al azar sin superposición. Retorna (vertical, celdas) por barco."""
+    rng = random.Random(seed)
+    occupied = 0
+    fleet = []
+    for size in sizes:
+        options = [(mask, cells) for mask, cells in _placements(board_size, size) if not mask & occupied]
+        if not options:
+            raise ValueError("No hay espacio para colocar todos los barcos")
+        mask, cells = rng.choice(options)
+        occupied |= mask
+        vertical = size > 1 and cells[1] - cells[0] == board_size
+        fleet.append((vertical, [divmod(cell, board_size) for cell in cells]))
+    return fleet
@@ -0,0 +1,156 @@
+"""
+Formato compacto de partidas inactivas.
+
+    b"BNC" + versión (1 byte)
+    estado (bit 0 = terminada, bit 1 = fase de colocación), máximo de jugadores,
+    máximo de barcos (varints) y proporción máxima de longitud (float64)
+    versión de la partida (varint), turno actual (varint, índice + 1; 0 = ninguno)
+    configuración de barcos: cantidad (varint) y por barco nombre y tamaño
+    número de jugadores (varint) y por jugador, en el orden de `Game.players`:
+    índice en la repetición (varint),
+    listo (1 byte), barcos a flote (varint, valor + 1; 0 = sin registrar)
+    eliminados en orden (varint cantidad + índices)
+    repetición binaria de la partida (tablero, colocación de barcos y disparos)
+
+Al rehidratar, los impactos de los barcos y los árboles de disparos se
+reconstruyen aplicando los disparos de la repetición en orden.
+"""
+import struct
+from uuid import UUID
+from .Game_model import Coordinate, Game, GameState, Player, ShipNode, ShipOrientation, ShotNode, ShotResult
+from .Replay_model import _read_str, _read_varint, _write_str, _write_varint, decode_replay, encode_replay
+
+COMPACT_MAGIC = b"BNC"
+COMPACT_VERSION = 1
+
+_RATIO = struct.Struct("<d")
+
+
+def pack_game(game: Game) -> bytes:
+    """Empaqueta una partida en un bloque binario compacto."""
+    replay = encode_replay(game)
+    # Orden de los jugadores dentro de la repetición (el primero en disparar va primero)
+    order = list(game.players.keys())
+    if game.shot_log and game.shot_log[0][0] in order:
+        first = order.index(game.shot_log[0][0])
+        order = order[first:] + order[:first]
+    replay_index = {pid: i for i, pid in enumerate(order)}
+    game_index = {pid: i for i, pid in enumerate(game.players)}
+
+    out = bytearray(COMPACT_MAGIC)
+    out.append(COMPACT_VERSION)
+    _write_varint(out, int(game.state == GameState.FINISHED) | int(game.placement_phase) << 1)
+    _write_varint(out, game.max_players)
+    _write_varint(out, game.max_ships)
+    out += _RATIO.pack(game.max_ships_length_ratio)
+    _write_varint(out, game.version)
+    current = str(game.current_turn) if game.current_turn else None
+    _write_varint(out, game_index[current] + 1 if current in game_index else 0)
+
+    _write_varint(out, len(game.ships_config))
+    for ship in game.ships_config:
+        _write_str(out, ship["name"])
+        _write_varint(out, ship["size"])
+
+    _write_varint(out, len(game.players))
+    for pid, player in game.players.items():
+        _write_varint(out, replay_index[pid])
+        out.append(int(player.is_ready))
+        _write_varint(out, game.ships_afloat[pid] + 1 if pid in game.ships_afloat else 0)
+
+    _write_varint(out, len(game.eliminated))
+    for pid in game.eliminated:
+        _write_varint(out, game_index[pid])
+
+    out += replay
+    return bytes(out)
+
+
+def unpack_game(data: bytes) -> Game:
+    """Reconstruye la partida completa a partir de su bloque compacto."""
+    if data[:3] != COMPACT_MAGIC:
+        raise ValueError("Formato de partida compacta inválido")
+    if data[3] != COMPACT_VERSION:
+        raise ValueError(f"Versión de partida compacta no soportada: {data[3]}")
+    pos = 4
+    flags, pos = _read_varint(data, pos)
+    max_players, pos = _read_varint(data, pos)
+    max_ships, pos = _read_varint(data, pos)
+    ratio = _RATIO.unpack_from(data, pos)[0]
+    pos += _RATIO.size
+    version, pos = _read_varint(data, pos)
+    current, pos = _read_varint(data, pos)
+
+    ships_config = []
+    count, pos = _read_varint(data, pos)
+    for _ in range(count):
+        name, pos = _read_str(data, pos)
+        size, pos = _read_varint(data, pos)
+        ships_config.append({"name": name, "size": size})
+
+    player_records = []
+    count, pos = _read_varint(data, pos)
+    for _ in range(count):
+        index, pos = _read_varint(data, pos)
+        ready = bool(data[pos])
+        pos += 1
+        afloat, pos = _read_varint(data, pos)
+        player_records.append((index, ready, afloat))
+    eliminated = []
+    count, pos = _read_varint(data, pos)
+    for _ in range(count):
+        index, pos = _read_varint(data, pos)
+        eliminated.append(index)
+
+    replay = decode_replay(memoryview(data)[pos:])
+    game = Game(
+        id=replay["game_id"],
+        board_size=replay["board_size"],
+        max_ships=max_ships,
+        max_ships_length_ratio=ratio,
+        ships_config=ships_config,
+        max_players=max_players
+    )
+    for index, ready, _ in player_records:
+        data_player = replay["players"][index]
+        player = Player(id=data_player["id"], name=data_player["name"], is_ready=ready)
+        for ship_data in data_player["fleet"]:
+            ship = ShipNode(
+                name=ship_data["name"],
+                size=ship_data["size"],
+                orientation=ShipOrientation(ship_data["orientation"])
+            )
+            ship.coordinates = [Coordinate(row=row, col=col) for row, col in ship_data["coordinates"]]
+            player.add_ship(ship)
+        game.add_player(player)
+
+    # Reaplicar los disparos en orden: impactos de los barcos, árboles de disparos e historial
+    for shot in replay["shots"]:
+        attacker = game.players[shot["player_id"]]
+        target = game.players[shot["target_id"]]
+        row, col = shot["row"], shot["col"]
+        result = ShotResult(shot["result"])
+        ship = target.get_ship_at(row, col)
+        if ship is not None:
+            ship.receive_shot(row, col)
+        game.shot_tree(attacker, shot["target_id"]).insert(ShotNode(
+            coordinate=Coordinate(row=row, col=col),
+            result=result,
+            affected_ship=ship.name if ship is not None else None
+        ))
+        game.shot_log.append((shot["player_id"], row, col, result, shot["target_id"]))
+
+    player_ids = list(game.players.keys())
+    for pid, (_, _, afloat) in zip(player_ids, player_records):
+        if afloat:
+            game.ships_afloat[pid] = afloat - 1
+    for index in eliminated:
+        game._remove_from_ring(player_ids[index])
+        game.eliminated.append(player_ids[index])
+
+    game.state = GameState.FINISHED if flags & 1 else GameState.IN_PROGRESS
+    game.placement_phase = bool(flags & 2)
+    game.current_turn = player_ids[current - 1] if current else None
+    game.winner_id = UUID(replay["winner"]) if replay["winner"] else None
+    game.version = version
+    return game
@@ -1,10 +1,42 @@
 
 from enum import Enum
-from typing import List, Optional, Dict, Any, Set
-from pydantic import BaseModel, Field, ConfigDict
+from typing import List, Optional, Dict, Any, Set, Tuple, Iterator
+import random
+from bisect import bisect_left, bisect_right
+from pydantic import BaseModel, Field, ConfigDict, PrivateAttr
 from uuid import UUID, uuid4
 
 
+# Tamaño máximo de tablero admitido (tableros "océano" de hasta 100.000 x 100.000)
+MAX_BOARD_SIZE = 100_000
+# Número máximo de jugadores en una partida todos contra todos
+MAX_PLAYERS = 16
+
+
+def validate_ship_rules(board_size: int, ships: List[Dict[str, Any]], max_ships_length_ratio: float = 0.7):
+    """
+    Valida un reglamento (tamaño del tablero y barcos) antes de crear partidas con él.
+    Lanza ValueError con el motivo si no es válido.
+    """
+    if board_size < 5:
+        raise ValueError("Board size must be at least 5")
+    if board_size > MAX_BOARD_SIZE:
+        raise ValueError(f"Board size must be at most {MAX_BOARD_SIZE}")
+
+    # Validar nombres únicos y tamaños positivos
+    ship_names = [ship["name"] for ship in ships]
+    if len(ship_names) != len(set(ship_names)):
+        raise ValueError("Ship names must be unique")
+    if any(ship["size"] <= 0 for ship in ships):
+        raise ValueError("Ship sizes must be greater than 0")
+
+    # Validar límite del 70% (suma de tamaños no mayor que 70% del tablero total)
+    total_ship_length = sum(ship["size"] for ship in ships)
+    max_allowed = board_size * board_size * max_ships_length_ratio
+    if total_ship_length > max_allowed:
+        raise ValueError(f"Total ship length ({total_ship_length}) exceeds 70% of board ({max_allowed})")
+
+
 class ShipOrientation(str, Enum):
     HORIZONTAL = "HORIZONTAL"
     VERTICAL = "VERTICAL"
@@ -44,7 +76,10 @@ class ShotResult(str, Enum):
 
 
 class ShipNode(BaseModel):
-    """Representa un barco en el juego."""
+    """
+    Representa un barco en el juego.
+    Guarda una Coordinate por celda: su memoria crece con el tamaño del barco.
+    """
     id: UUID = Field(default_factory=uuid4)
     name: str
     size: int
@@ -61,18 +96,103 @@ class ShipNode(BaseModel):
         """Añade una coordenada a la posición del barco."""
         self.coordinates.append(Coordinate(row=row, col=col))
 
+    _cells: Optional[Set[tuple]] = PrivateAttr(default=None)
+
     def receive_shot(self, row: int, col: int) -> bool:
         """
         Registra un disparo en este barco.
         Retorna True si fue un impacto, False en caso contrario.
         """
-        for coord in self.coordinates:
-            if coord.row == row and coord.col == col:
-                self.hits += 1
-                return True
+        # Conjunto de celdas construido en el primer disparo (búsqueda O(1) en barcos largos)
+        if self._cells is None or len(self._cells) != len(self.coordinates):
+            self._cells = {(c.row, c.col) for c in self.coordinates}
+        if (row, col) in self._cells:
+            self.hits += 1
+            return True
         return False
 
 
+class ShipIndex:
+    """
+    Índice espacial disperso de una flota.
+    Cada barco se guarda como un segmento [inicio, fin] en la fila (barcos
+    horizontales) o en la columna (barcos verticales) que ocupa; los segmentos
+    de cada fila/columna se mantienen ordenados para buscar con bisección.
+    La memoria del índice es proporcional al número de barcos, no al área del
+    tablero, y buscar el barco en una celda cuesta O(log k) con k barcos en la
+    fila/columna.
+
+    El índice no sustituye a las celdas de la flota: cada ShipNode conserva
+    una Coordinate por celda, y `validate_fleet` y `ShipNode.receive_shot`
+    construyen conjuntos por celda. Ese costo es O(celdas de la flota), que la
+    regla de longitud limita a 0,7 · board_size celdas por jugador (70.000 en
+    un tablero de 100.000 x 100.000), nunca O(área). Con unos 600 bytes por
+    Coordinate, la flota máxima ocupa unos 40 MB por jugador.
+    """
+
+    def __init__(self, fleet: List[ShipNode]):
+        self.fleet = fleet
+        self.size = len(fleet)
+        rows: Dict[int, list] = {}
+        cols: Dict[int, list] = {}
+        for ship in fleet:
+            for line, start, end, vertical in self._segments(ship):
+                (cols if vertical else rows).setdefault(line, []).append((start, end, ship))
+        self._rows = self._freeze(rows)
+        self._cols = self._freeze(cols)
+
+    @staticmethod
+    def _segments(ship: ShipNode):
+        """Divide las coordenadas del barco en segmentos contiguos (uno solo si el barco es lineal)."""
+        if not ship.coordinates:
+            return []
+        vertical = ship.orientation == ShipOrientation.VERTICAL
+        rows = {c.row for c in ship.coordinates}
+        cols = {c.col for c in ship.coordinates}
+        if vertical and len(cols) == 1:
+            positions = sorted(c.row for c in ship.coordinates)
+            line = next(iter(cols))
+        elif not vertical and len(rows) == 1:
+            positions = sorted(c.col for c in ship.coordinates)
+            line = next(iter(rows))
+        else:
+            # Colocación no lineal: un segmento de una celda por coordenada
+            return [(c.row, c.col, c.col, False) for c in ship.coordinates]
+
+        segments = []
+        start = prev = positions[0]
+        for pos in positions[1:]:
+            if pos != prev + 1:
+                segments.append((line, start, prev, vertical))
+                start = pos
+            prev = pos
+        segments.append((line, start, prev, vertical))
+        return segments
+
+    @staticmethod
+    def _freeze(lines: Dict[int, list]) -> Dict[int, tuple]:
+        frozen = {}
+        for line, segments in lines.items():
+            segments.sort(key=lambda seg: seg[0])
+            frozen[line] = ([seg[0] for seg in segments], segments)
+        return frozen
+
+    @staticmethod
+    def _lookup(lines: Dict[int, tuple], line: int, pos: int) -> Optional[ShipNode]:
+        entry = lines.get(line)
+        if entry is None:
+            return None
+        starts, segments = entry
+        i = bisect_right(starts, pos) - 1
+        if i >= 0 and segments[i][1] >= pos:
+            return segments[i][2]
+        return None
+
+    def ship_at(self, row: int, col: int) -> Optional[ShipNode]:
+        """Retorna el barco que ocupa la celda, o None."""
+        return self._lookup(self._rows, row, col) or self._lookup(self._cols, col, row)
+
+
 class ShotNode:
     """Nodo para el árbol binario de búsqueda de disparos."""
     def __init__(self, coordinate: Coordinate, result: ShotResult, affected_ship: Optional[str] = None):
@@ -81,6 +201,11 @@ class ShotNode:
         self.affected_ship = affected_ship
         self.left = None
         self.right = None
+        # Número de disparo dentro de su árbol (1, 2, ...), asignado al insertar. Cada árbol
+        # guarda los disparos de un jugador contra un objetivo, así que la numeración es por objetivo
+        self.turn = 0
+        # Prioridad aleatoria del treap: mantiene el árbol balanceado en promedio
+        self.priority = 0.0
 
     def __lt__(self, other):
         if not isinstance(other, ShotNode):
@@ -89,10 +214,19 @@ class ShotNode:
 
 
 class ShotTree:
-    """Árbol binario de búsqueda para almacenar los disparos de un jugador."""
+    """
+    Árbol binario de búsqueda para almacenar los disparos de un jugador.
+
+    El árbol se ordena por (fila, columna) y se balancea como treap (prioridades
+    aleatorias), de modo que su profundidad esperada es O(log n) aunque los
+    disparos lleguen ordenados. Al insertar se mantienen índices secundarios:
+    el orden de los disparos (por turno) y listas por tipo de resultado.
+    """
     def __init__(self):
         self.root = None
         self._nodes = {}
+        self._order: List[ShotNode] = []
+        self._by_result: Dict[Any, List[ShotNode]] = {}
 
     def insert(self, shot: ShotNode):
         """Inserta un nuevo disparo en el árbol."""
@@ -101,25 +235,45 @@ class ShotTree:
             # Ya existe un disparo en estas coordenadas
             return
 
+        shot.turn = len(self._order) + 1
+        shot.priority = random.random()
+        self._nodes[coord_key] = shot
+        self._order.append(shot)
+        self._by_result.setdefault(shot.result, []).append(shot)
+
         if not self.root:
             self.root = shot
-            self._nodes[coord_key] = shot
             return
 
+        path = []
         current = self.root
-        while True:
-            if (shot.coordinate.row, shot.coordinate.col) < (current.coordinate.row, current.coordinate.col):
-                if not current.left:
-                    current.left = shot
-                    break
+        while current:
+            path.append(current)
+            if coord_key < (current.coordinate.row, current.coordinate.col):
                 current = current.left
             else:
-                if not current.right:
-                    current.right = shot
-                    break
                 current = current.right
-        
-        self._nodes[coord_key] = shot
+        parent = path[-1]
+        if coord_key < (parent.coordinate.row, parent.coordinate.col):
+            parent.left = shot
+        else:
+            parent.right = shot
+
+        # Rotar hacia arriba mientras la prioridad del nuevo nodo sea mayor que la de su padre
+        while path and path[-1].priority < shot.priority:
+            parent = path.pop()
+            if parent.left is shot:
+                parent.left = shot.right
+                shot.right = parent
+            else:
+                parent.right = shot.left
+                shot.left = parent
+            if not path:
+                self.root = shot
+            elif path[-1].left is parent:
+                path[-1].left = shot
+            else:
+                path[-1].right = shot
 
     def find(self, row: int, col: int) -> Optional[ShotNode]:
         """Busca un disparo por sus coordenadas."""
@@ -129,6 +283,54 @@ class ShotTree:
         """Retorna todos los disparos en el árbol."""
         return list(self._nodes.values())
 
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def query(self, row_min: Optional[int] = None, row_max: Optional[int] = None,
+              col_min: Optional[int] = None, col_max: Optional[int] = None,
+              result: Optional[ShotResult] = None, turn_min: Optional[int] = None,
+              turn_max: Optional[int] = None) -> Iterator[ShotNode]:
+        """
+        Itera los disparos que cumplen los filtros.
+        - Con filtro de región: recorrido en orden del árbol podando las ramas fuera
+          del rango de claves; los disparos salen ordenados por (fila, columna).
+        - Sin región: se usa la lista por resultado o el orden de turnos, y los
+          disparos salen en orden de turno.
+        """
+        turn_min = max(1, turn_min or 1)
+        turn_max = min(len(self._order), turn_max if turn_max is not None else len(self._order))
+
+        if all(v is None for v in (row_min, row_max, col_min, col_max)):
+            if result is not None:
+                bucket = self._by_result.get(result, [])
+                start = bisect_left(bucket, turn_min, key=lambda node: node.turn)
+                for node in bucket[start:]:
+                    if node.turn > turn_max:
+                        return
+                    yield node
+            else:
+                yield from self._order[turn_min - 1:turn_max]
+            return
+
+        low = (row_min if row_min is not None else -1, col_min if col_min is not None else -1)
+        high = (row_max if row_max is not None else MAX_BOARD_SIZE, col_max if col_max is not None else MAX_BOARD_SIZE)
+        stack = []
+        node = self.root
+        while stack or node:
+            # Descender a la izquierda solo mientras pueda haber claves >= low
+            while node:
+                stack.append(node)
+                node = node.left if (node.coordinate.row, node.coordinate.col) > low else None
+            node = stack.pop()
+            key = (node.coordinate.row, node.coordinate.col)
+            if key > high:
+                return
+            if (key >= low and low[1] <= key[1] <= high[1]
+                    and (result is None or node.result == result)
+                    and turn_min <= node.turn <= turn_max):
+                yield node
+            node = node.right
+
 
 class Player(BaseModel):
     """Representa un jugador en el juego."""
@@ -139,6 +341,20 @@ class Player(BaseModel):
     fleet: List[ShipNode] = Field(default_factory=list)
     shots: ShotTree = Field(default_factory=ShotTree)
     is_ready: bool = False
+    # Disparos por jugador objetivo en partidas de más de 2 jugadores
+    target_shots: Dict[str, ShotTree] = Field(default_factory=dict)
+    # Solo en el jugador registrado: partida más reciente en la que se sentó (`is_ready` se refiere a ella)
+    active_game_id: Optional[str] = None
+    _ship_index: Optional[ShipIndex] = PrivateAttr(default=None)
+
+    def seat(self, game_id: str) -> "Player":
+        """
+        Crea el estado del jugador registrado para una partida (flota y disparos propios)
+        y la registra como su partida activa: `is_ready` vuelve a False hasta que coloque la flota en ella.
+        """
+        self.active_game_id = game_id
+        self.is_ready = False
+        return Player(id=self.id, name=self.name)
 
     def add_ship(self, ship: ShipNode):
         """Añade un barco a la flota del jugador."""
@@ -155,12 +371,12 @@ class Player(BaseModel):
         return shot
 
     def get_ship_at(self, row: int, col: int) -> Optional[ShipNode]:
-        """Encuentra un barco en la coordenada especificada."""
-        for ship in self.fleet:
-            for coord in ship.coordinates:
-                if coord.row == row and coord.col == col:
-                    return ship
-        return None
+        """Encuentra un barco en la coordenada especificada usando el índice espacial de la flota."""
+        index = self._ship_index
+        # Reconstruir si la flota cambió (barcos añadidos o flota reemplazada)
+        if index is None or index.fleet is not self.fleet or index.size != len(self.fleet):
+            index = self._ship_index = ShipIndex(self.fleet)
+        return index.ship_at(row, col)
 
     @property
     def sunk_ships_count(self) -> int:
@@ -203,10 +419,19 @@ class Game(BaseModel):
     current_turn: Optional[UUID] = None
     state: GameState = GameState.IN_PROGRESS
     winner_id: Optional[UUID] = None
-    board_size: int = Field(..., gt=0, description="Tamaño del tablero de juego (NxN). Debe ser especificado por el administrador del juego.")
+    board_size: int = Field(..., gt=0, le=MAX_BOARD_SIZE, description="Tamaño del tablero de juego (NxN). Debe ser especificado por el administrador del juego.")
     placement_phase: bool = True
     max_ships: int = Field(..., gt=0, description="Número de barcos por jugador. Debe ser especificado por el administrador para cada partida.")
     max_ships_length_ratio: float = Field(default=0.7, description="Longitud total máxima de barcos como proporción del tamaño del tablero (0-1), establecido por el administrador") 
+    ships_config: List[Dict[str, Any]] = Field(default_factory=list, description="Barcos (nombre y tamaño) que cada jugador debe colocar en esta partida")
+    version: int = Field(default=0, description="Se incrementa con cada cambio visible del estado de la partida")
+    shot_log: List[Tuple[str, int, int, ShotResult, str]] = Field(default_factory=list, description="Disparos en orden de turno: (id_jugador, fila, columna, resultado, id_objetivo)")
+    max_players: int = Field(default=2, ge=2, le=MAX_PLAYERS, description="Número máximo de jugadores (2 para partidas clásicas, hasta 16 en todos contra todos)")
+    # Orden de turnos como anillo doblemente enlazado: avanzar y eliminar cuestan O(1)
+    turn_ring: Dict[str, str] = Field(default_factory=dict)
+    turn_ring_prev: Dict[str, str] = Field(default_factory=dict)
+    ships_afloat: Dict[str, int] = Field(default_factory=dict, description="Barcos sin hundir por jugador, actualizado con cada hundimiento")
+    eliminated: List[str] = Field(default_factory=list, description="Jugadores eliminados en orden de eliminación")
 
     def __init__(self, **data):
         super().__init__(**data)
@@ -217,14 +442,90 @@ class Game(BaseModel):
 
     def add_player(self, player: Player):
         """Añade un jugador al juego."""
-        if len(self.players) >= 2:
-            raise ValueError("El juego ya tiene el número máximo de jugadores (2)")
+        if len(self.players) >= self.max_players:
+            raise ValueError(f"El juego ya tiene el número máximo de jugadores ({self.max_players})")
         
-        self.players[str(player.id)] = player
+        player_id = str(player.id)
+        self.players[player_id] = player
+
+        # Insertar al jugador al final del anillo de turnos
+        if not self.turn_ring:
+            self.turn_ring[player_id] = player_id
+            self.turn_ring_prev[player_id] = player_id
+        else:
+            first = next(iter(self.players.keys()))
+            last = self.turn_ring_prev[first]
+            self.turn_ring[last] = player_id
+            self.turn_ring_prev[player_id] = last
+            self.turn_ring[player_id] = first
+            self.turn_ring_prev[first] = player_id
         
         # Si es el segundo jugador, comienza el turno del primer jugador
         if len(self.players) == 2 and not self.current_turn:
             self.current_turn = next(iter(self.players.keys()))
+        self.mark_updated()
+
+    @property
+    def is_multiplayer(self) -> bool:
+        """True si la partida admite más de 2 jugadores (todos contra todos)."""
+        return self.max_players > 2
+
+    def shot_tree(self, attacker: Player, target_id: str) -> ShotTree:
+        """Árbol de disparos del atacante contra un objetivo (en partidas de 2 jugadores, `attacker.shots`)."""
+        if not self.is_multiplayer:
+            return attacker.shots
+        tree = attacker.target_shots.get(target_id)
+        if tree is None:
+            tree = attacker.target_shots[target_id] = ShotTree()
+        return tree
+
+    def default_target(self, attacker_id: str) -> Optional[str]:
+        """Objetivo implícito: en partidas de 2 jugadores, el oponente (siguiente en el anillo)."""
+        if self.is_multiplayer:
+            return None
+        return next((pid for pid in self.players if pid != attacker_id), None)
+
+    def is_eliminated(self, player_id: str) -> bool:
+        """True si el jugador ya no participa en los turnos."""
+        return player_id in self.players and player_id not in self.turn_ring
+
+    def register_sunk_ship(self, player_id: str) -> bool:
+        """
+        Registra el hundimiento de un barco del jugador.
+        Retorna True si el jugador quedó eliminado (sin barcos a flote).
+        """
+        if player_id not in self.ships_afloat:
+            self.ships_afloat[player_id] = sum(1 for ship in self.players[player_id].fleet if not ship.is_sunk) + 1
+        self.ships_afloat[player_id] -= 1
+        if self.ships_afloat[player_id] > 0:
+            return False
+        self._remove_from_ring(player_id)
+        self.eliminated.append(player_id)
+        return True
+
+    def alive_players(self) -> int:
+        """Número de jugadores que siguen en el anillo de turnos."""
+        return len(self.turn_ring)
+
+    def _remove_from_ring(self, player_id: str):
+        if player_id not in self.turn_ring:
+            return
+        nxt = self.turn_ring.pop(player_id)
+        prev = self.turn_ring_prev.pop(player_id)
+        if nxt != player_id:
+            self.turn_ring[prev] = nxt
+            self.turn_ring_prev[nxt] = prev
+
+    def mark_updated(self):
+        """Registra un cambio en el estado de la partida (invalida las vistas en caché)."""
+        self.version += 1
+
+    def record_shot(self, player_id: UUID, row: int, col: int, result: ShotResult, target_id: Optional[str] = None):
+        """Registra un disparo en el historial de la partida, preservando el orden de turnos."""
+        if target_id is None:
+            target_id = self.default_target(str(player_id))
+        self.shot_log.append((str(player_id), row, col, result, target_id))
+        self.mark_updated()
 
     def is_players_turn(self, player_id: UUID) -> bool:
         """Verifica si es el turno del jugador especificado."""
@@ -232,24 +533,21 @@ class Game(BaseModel):
 
     def next_turn(self):
         """Avanza al turno del siguiente jugador."""
-        if len(self.players) != 2:
+        if len(self.turn_ring) < 2 or self.current_turn is None:
             return
-            
-        player_ids = list(self.players.keys())
-        if self.current_turn == player_ids[0]:
-            self.current_turn = player_ids[1]
-        else:
-            self.current_turn = player_ids[0]
+
+        current = str(self.current_turn)
+        if current in self.turn_ring:
+            self.current_turn = self.turn_ring[current]
 
     def check_winner(self) -> Optional[Player]:
         """Verifica si hay un ganador y actualiza el estado del juego."""
-        for player_id, player in self.players.items():
-            if player.all_ships_sunk:
-                # El otro jugador es el ganador
-                other_player_id = next(id for id in self.players if id != player_id)
-                self.winner_id = other_player_id
-                self.state = GameState.FINISHED
-                return self.players[other_player_id]
+        alive = [player_id for player_id, player in self.players.items() if not player.all_ships_sunk]
+        if len(self.players) >= 2 and len(alive) == 1:
+            # El único jugador con barcos a flote es el ganador
+            self.winner_id = alive[0]
+            self.state = GameState.FINISHED
+            return self.players[alive[0]]
         return None
 
     def get_game_state(self, player_id: UUID) -> Dict[str, Any]:
@@ -275,16 +573,29 @@ class Game(BaseModel):
                 "row": shot.coordinate.row,
                 "col": shot.coordinate.col,
                 "result": shot.result,
-                "affected_ship": shot.affected_ship
-            } for shot in player.shots.get_all()],
+                "affected_ship": shot.affected_ship,
+                "target_id": target_id
+            } for target_id, tree in self._shot_trees_of(player) for shot in tree.get_all()],
             "opponent_ships_remaining": (
                 sum(1 for ship in other_player.fleet if not ship.is_sunk)
                 if other_player else 0
             ) if other_player else 0,
+            "opponents": [{
+                "player_id": p_id,
+                "name": p.name,
+                "ships_remaining": self.ships_afloat.get(p_id, len(p.fleet)),
+                "eliminated": self.is_eliminated(p_id)
+            } for p_id, p in self.players.items() if p_id != str(player_id)],
             "winner": str(self.winner_id) if self.winner_id else None,
             "placement_phase": self.placement_phase
         }
 
+    def _shot_trees_of(self, player: Player):
+        """Pares (id_objetivo, árbol de disparos) del jugador."""
+        if not self.is_multiplayer:
+            return [(self.default_target(str(player.id)), player.shots)]
+        return list(player.target_shots.items())
+
     def validate_ship_placement(self, player_id: UUID) -> bool:
         """
         Valida que los barcos del jugador cumplan con las reglas del juego:
@@ -296,13 +607,19 @@ class Game(BaseModel):
         player = self.players.get(str(player_id))
         if not player:
             return False
-            
+        return self.validate_fleet(player.fleet)
+
+    def validate_fleet(self, fleet: List[ShipNode]) -> bool:
+        """
+        Valida una flota con las reglas de `validate_ship_placement` sin modificar la partida.
+        Solo lee la configuración de la partida, por lo que puede ejecutarse fuera del bucle de eventos.
+        """
         # Verificar número máximo de barcos
-        if len(player.fleet) > self.max_ships:
+        if len(fleet) > self.max_ships:
             return False
             
         # Verificar que la longitud total de los barcos no exceda el máximo permitido
-        total_ship_length = sum(ship.size for ship in player.fleet)
+        total_ship_length = sum(ship.size for ship in fleet)
         
         # Calcular la longitud máxima permitida de barcos con el 70% del tamaño del tablero
         max_allowed = int(self.board_size * self.max_ships_length_ratio)
@@ -312,7 +629,7 @@ class Game(BaseModel):
             
         # Verificar superposición de barcos y límites del tablero
         occupied = set()
-        for ship in player.fleet:
+        for ship in fleet:
             for coord in ship.coordinates:
                 # Verificar límites del tablero
                 if (coord.row < 0 or coord.row >= self.board_size or 
@@ -329,11 +646,11 @@ class Game(BaseModel):
     def can_start_game(self) -> bool:
         """
         Verifica si el juego puede comenzar:
-        - Debe tener exactamente 2 jugadores
+        - Debe tener al menos 2 jugadores (exactamente 2 en partidas clásicas)
         - Todos los jugadores deben estar listos
         - Todos los barcos deben estar colocados válidamente
         """
-        if len(self.players) != 2:
+        if len(self.players) < 2:
             return False
             
         # Verificar que todos los jugadores estén listos y tengan barcos colocados correctamente
@@ -350,3 +667,5 @@ class Game(BaseModel):
         if not self.can_start_game():
             raise ValueError("No se puede iniciar el juego: no todos los jugadores están listos")
         self.placement_phase = False
+        self.ships_afloat = {player_id: len(player.fleet) for player_id, player in self.players.items()}
+        self.mark_updated()
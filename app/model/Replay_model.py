@@ -0,0 +1,278 @@
+"""
+Formato binario compacto de repeticiones (replays).
+
+Cabecera:
+    b"BNR" + versión (1 byte) + id de partida (16 bytes)
+    tamaño del tablero (varint), ganador (varint, índice + 1; 0 = sin ganador)
+    número de jugadores (varint) y por cada jugador (en orden de turno):
+        id (16 bytes), nombre (varint longitud + utf-8), número de barcos (varint)
+        por cada barco: nombre, tamaño (varint) y colocación empaquetada:
+        varint(celda_inicial * 4 + modo); el bit 0 del modo es la orientación
+        (0 = horizontal, 1 = vertical) y el bit 1 indica coordenadas explícitas
+        (varint cantidad + varint por celda) para barcos no lineales
+Disparos:
+    número de disparos (varint) seguido de un flujo de bits con un registro por
+    disparo: índice del tirador, índice del objetivo, índice de celda
+    (fila * N + columna) y código de resultado (2 bits), cada campo con el
+    ancho mínimo de bits necesario. En un tablero de 10x10 con 2 jugadores son
+    11 bits (1.375 bytes) por disparo.
+"""
+
+import mmap
+import struct
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from uuid import UUID
+from .Game_model import Game, ShipNode, ShipOrientation, ShotResult
+
+REPLAY_MAGIC = b"BNR"
+REPLAY_VERSION = 2
+ARCHIVE_MAGIC = b"BNRA"
+ARCHIVE_VERSION = 1
+
+RESULT_CODES = {ShotResult.WATER: 0, ShotResult.HIT: 1, ShotResult.SUNK: 2}
+RESULTS_BY_CODE = {code: result for result, code in RESULT_CODES.items()}
+
+_ARCHIVE_HEADER = struct.Struct("<4sBI")      # magia, versión, cantidad
+_ARCHIVE_ENTRY = struct.Struct("<16sQI")      # id de partida, offset, longitud
+
+
+def _write_varint(out: bytearray, value: int):
+    """Escribe un entero no negativo como varint (LEB128)."""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data, pos: int) -> Tuple[int, int]:
+    """Lee un varint y retorna (valor, nueva posición)."""
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def _write_str(out: bytearray, text: str):
+    raw = text.encode("utf-8")
+    _write_varint(out, len(raw))
+    out += raw
+
+
+def _read_str(data, pos: int) -> Tuple[str, int]:
+    length, pos = _read_varint(data, pos)
+    return bytes(data[pos:pos + length]).decode("utf-8"), pos + length
+
+
+def _bit_width(count: int) -> int:
+    """Número de bits necesarios para representar valores en [0, count)."""
+    return max(0, count - 1).bit_length()
+
+
+def _pack_placement(out: bytearray, ship: ShipNode, board_size: int):
+    """Empaqueta la colocación de un barco como celda inicial + orientación."""
+    cells = [c.row * board_size + c.col for c in ship.coordinates]
+    vertical = int(ship.orientation == ShipOrientation.VERTICAL)
+    if cells:
+        start = min(cells)
+        step = board_size if vertical else 1
+        if sorted(cells) == [start + i * step for i in range(len(cells))] and len(cells) == ship.size:
+            _write_varint(out, start * 4 + vertical)
+            return
+    # Colocación no lineal: se guardan las celdas explícitamente
+    _write_varint(out, 2 | vertical)
+    _write_varint(out, len(cells))
+    for cell in cells:
+        _write_varint(out, cell)
+
+
+def encode_replay(game: Game) -> bytes:
+    """Codifica una partida (configuración, flotas y disparos en orden) en el formato binario."""
+    board_size = game.board_size
+    player_ids = list(game.players.keys())
+    # Los jugadores se guardan en orden de turno: el primero en disparar va primero
+    if game.shot_log and game.shot_log[0][0] in player_ids:
+        first = player_ids.index(game.shot_log[0][0])
+        player_ids = player_ids[first:] + player_ids[:first]
+    player_index = {pid: i for i, pid in enumerate(player_ids)}
+
+    out = bytearray(REPLAY_MAGIC)
+    out.append(REPLAY_VERSION)
+    out += game.id.bytes
+    _write_varint(out, board_size)
+    winner = str(game.winner_id) if game.winner_id else None
+    _write_varint(out, player_index[winner] + 1 if winner in player_index else 0)
+
+    _write_varint(out, len(player_ids))
+    for pid in player_ids:
+        player = game.players[pid]
+        out += player.id.bytes
+        _write_str(out, player.name)
+        _write_varint(out, len(player.fleet))
+        for ship in player.fleet:
+            _write_str(out, ship.name)
+            _write_varint(out, ship.size)
+            _pack_placement(out, ship, board_size)
+
+    # Flujo de bits de disparos
+    player_bits = _bit_width(len(player_ids))
+    cell_bits = _bit_width(board_size * board_size)
+    _write_varint(out, len(game.shot_log))
+    acc = 0
+    acc_bits = 0
+    for pid, row, col, result, target_id in game.shot_log:
+        players_field = player_index[pid] << player_bits | player_index.get(target_id, 0)
+        record = (players_field << cell_bits | (row * board_size + col)) << 2 | RESULT_CODES[ShotResult(result)]
+        acc |= record << acc_bits
+        acc_bits += 2 * player_bits + cell_bits + 2
+        while acc_bits >= 8:
+            out.append(acc & 0xFF)
+            acc >>= 8
+            acc_bits -= 8
+    if acc_bits:
+        out.append(acc & 0xFF)
+    return bytes(out)
+
+
+def decode_replay(data) -> Dict:
+    """Decodifica una repetición binaria en un diccionario con los disparos en orden de turno."""
+    if bytes(data[:3]) != REPLAY_MAGIC:
+        raise ValueError("Formato de repetición inválido")
+    if data[3] != REPLAY_VERSION:
+        raise ValueError(f"Versión de repetición no soportada: {data[3]}")
+    game_id = UUID(bytes=bytes(data[4:20]))
+    pos = 20
+    board_size, pos = _read_varint(data, pos)
+    winner_index, pos = _read_varint(data, pos)
+
+    num_players, pos = _read_varint(data, pos)
+    players: List[Dict] = []
+    for _ in range(num_players):
+        player_id = UUID(bytes=bytes(data[pos:pos + 16]))
+        pos += 16
+        name, pos = _read_str(data, pos)
+        num_ships, pos = _read_varint(data, pos)
+        fleet = []
+        for _ in range(num_ships):
+            ship_name, pos = _read_str(data, pos)
+            size, pos = _read_varint(data, pos)
+            packed, pos = _read_varint(data, pos)
+            vertical = packed & 1
+            if packed & 2:
+                count, pos = _read_varint(data, pos)
+                cells = []
+                for _ in range(count):
+                    cell, pos = _read_varint(data, pos)
+                    cells.append(cell)
+            else:
+                start = packed >> 2
+                step = board_size if vertical else 1
+                cells = [start + i * step for i in range(size)]
+            orientation = ShipOrientation.VERTICAL if vertical else ShipOrientation.HORIZONTAL
+            fleet.append({
+                "name": ship_name,
+                "size": size,
+                "orientation": orientation.value,
+                "coordinates": [(cell // board_size, cell % board_size) for cell in cells]
+            })
+        players.append({"id": str(player_id), "name": name, "fleet": fleet})
+
+    player_bits = _bit_width(num_players)
+    cell_bits = _bit_width(board_size * board_size)
+    record_bits = 2 * player_bits + cell_bits + 2
+    mask = (1 << record_bits) - 1
+    num_shots, pos = _read_varint(data, pos)
+    shots = []
+    acc = 0
+    acc_bits = 0
+    for _ in range(num_shots):
+        while acc_bits < record_bits:
+            acc |= data[pos] << acc_bits
+            pos += 1
+            acc_bits += 8
+        record = acc & mask
+        acc >>= record_bits
+        acc_bits -= record_bits
+        cell = (record >> 2) & ((1 << cell_bits) - 1)
+        players_field = record >> (cell_bits + 2)
+        shots.append({
+            "player_id": players[players_field >> player_bits]["id"],
+            "target_id": players[players_field & ((1 << player_bits) - 1)]["id"],
+            "row": cell // board_size,
+            "col": cell % board_size,
+            "result": RESULTS_BY_CODE[record & 3].value
+        })
+
+    return {
+        "game_id": str(game_id),
+        "board_size": board_size,
+        "winner": players[winner_index - 1]["id"] if winner_index else None,
+        "players": players,
+        "shots": shots
+    }
+
+
+def write_archive(path: Path, replays: Iterable[Tuple[UUID, bytes]]) -> int:
+    """
+    Escribe un archivo con muchas repeticiones: cabecera, tabla de índices
+    (id de partida, offset, longitud) y los bloques binarios de cada repetición.
+    Retorna el número de repeticiones escritas.
+    """
+    items = list(replays)
+    offset = _ARCHIVE_HEADER.size + _ARCHIVE_ENTRY.size * len(items)
+    with open(path, "wb") as f:
+        f.write(_ARCHIVE_HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, len(items)))
+        for game_id, blob in items:
+            f.write(_ARCHIVE_ENTRY.pack(game_id.bytes, offset, len(blob)))
+            offset += len(blob)
+        for _, blob in items:
+            f.write(blob)
+    return len(items)
+
+
+class ReplayArchive:
+    """Lector de archivos de repeticiones mediante memoria mapeada (sin cargar el archivo completo)."""
+
+    def __init__(self, path: Path):
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count = _ARCHIVE_HEADER.unpack_from(self._mmap, 0)
+        if magic != ARCHIVE_MAGIC or version != ARCHIVE_VERSION:
+            self.close()
+            raise ValueError("Formato de archivo de repeticiones inválido")
+        self._count = count
+        self._index: Optional[Dict[UUID, int]] = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _entry(self, i: int) -> Tuple[UUID, memoryview]:
+        raw_id, offset, length = _ARCHIVE_ENTRY.unpack_from(self._mmap, _ARCHIVE_HEADER.size + i * _ARCHIVE_ENTRY.size)
+        return UUID(bytes=raw_id), memoryview(self._mmap)[offset:offset + length]
+
+    def __iter__(self) -> Iterator[Tuple[UUID, memoryview]]:
+        """Itera (id de partida, vista del bloque binario) sin copiar datos."""
+        for i in range(self._count):
+            yield self._entry(i)
+
+    def get(self, game_id: UUID) -> Optional[Dict]:
+        """Obtiene y decodifica la repetición de una partida."""
+        if self._index is None:
+            self._index = {gid: i for i, (gid, _) in enumerate(self)}
+        i = self._index.get(game_id)
+        return decode_replay(self._entry(i)[1]) if i is not None else None
+
+    def close(self):
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
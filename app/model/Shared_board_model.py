@@ -0,0 +1,205 @@
+"""
+Formato de las instantáneas de partida en memoria compartida.
+
+Cada partida publicada ocupa un segmento de `multiprocessing.shared_memory`
+con un diseño fijo (little-endian):
+
+    cabecera   magic "BNSS", versión del formato (u16), jugadores (u16),
+               tamaño del tablero (u32), máximo de jugadores (u16), relleno,
+               secuencia del seqlock (u64, desplazamiento 16), versión de la
+               partida (u64), estado (bit 0 = terminada, bit 1 = retirada),
+               turno, ganador y fase de colocación (u8), entradas del registro
+               de disparos (u32)
+    jugadores  `max_players` registros: id, nombre, barcos totales, barcos a
+               flote, eliminado, disparos realizados e impactos
+    tableros   `max_players` tableros de board_size * board_size bytes
+    registro   una entrada u32 por celda disparada (índice global de la celda:
+               tablero * board_size² + fila * board_size + columna), en el
+               orden del primer disparo a esa celda
+
+Cada celda de un tablero ocupa un byte:
+    bits 0-1  resultado del disparo recibido (0 = sin disparo, 1 = agua,
+              2 = impacto, 3 = hundido)
+    bit  2    hay un barco propio en la celda
+    bits 4-7  índice del jugador que disparó (máximo 16 jugadores)
+
+El registro permite a los lectores listar los disparos en orden de turno
+recorriendo solo las entradas escritas (O(disparos), no O(área)). Se reserva
+para el peor caso (todas las celdas), pero las páginas de memoria compartida
+solo ocupan memoria cuando se escriben.
+
+Una partida "retirada" (eliminada del proceso principal, o terminada hace
+más del plazo de gracia) ya no se actualiza y su segmento se eliminó: los
+lectores deben cerrarlo y tratar la partida como no publicada.
+
+El escritor incrementa la secuencia a un valor impar antes de modificar el
+segmento y a uno par al terminar; los lectores repiten la lectura si la
+secuencia era impar o cambió mientras leían (seqlock).
+"""
+import struct
+from itertools import islice
+from typing import Any, Dict, List, Optional
+from .Game_model import Game, GameState, ShotResult
+
+MAGIC = b"BNSS"
+LAYOUT_VERSION = 2
+NO_PLAYER = 0xFF
+
+HEADER = struct.Struct("<4sHHIH2xQQBBBBI")
+SEQ = struct.Struct("<Q")
+SEQ_OFFSET = 16
+STATE_OFFSET = 32
+STATE_FINISHED = 0x01
+STATE_RETIRED = 0x02
+PLAYER = struct.Struct("<36s64sHHBxII")
+LOG_ENTRY = struct.Struct("<I")
+
+CELL_RESULT_MASK = 0x03
+CELL_SHIP = 0x04
+CELL_SHOOTER_SHIFT = 4
+
+RESULT_CODES = {ShotResult.WATER: 1, ShotResult.HIT: 2, ShotResult.SUNK: 3}
+RESULTS = {code: result for result, code in RESULT_CODES.items()}
+
+
+def segment_name(game_id: str) -> str:
+    """Nombre del segmento de una partida (corto para ser válido en todas las plataformas)."""
+    return "bn" + game_id.replace("-", "")[:28]
+
+
+def segment_size(max_players: int, board_size: int) -> int:
+    cells = max_players * board_size * board_size
+    return HEADER.size + max_players * PLAYER.size + cells + cells * LOG_ENTRY.size
+
+
+def _board_offset(max_players: int, board_size: int, index: int) -> int:
+    return HEADER.size + max_players * PLAYER.size + index * board_size * board_size
+
+
+def _log_offset(max_players: int, board_size: int) -> int:
+    return _board_offset(max_players, board_size, max_players)
+
+
+def _player_index(game: Game) -> Dict[str, int]:
+    return {pid: index for index, pid in enumerate(game.players)}
+
+
+def write_counters(buf: memoryview, game: Game, shots: List[int], hits: List[int], logged: int):
+    """
+    Escribe la cabecera (sin modificar la secuencia) y los registros de los jugadores.
+    `shots` y `hits` son los contadores por índice de jugador y `logged` las entradas
+    del registro de disparos, que mantiene `write_shots`.
+    """
+    index = _player_index(game)
+    current = index.get(str(game.current_turn), NO_PLAYER) if game.current_turn else NO_PLAYER
+    winner = index.get(str(game.winner_id), NO_PLAYER) if game.winner_id else NO_PLAYER
+    seq = SEQ.unpack_from(buf, SEQ_OFFSET)[0]
+    HEADER.pack_into(
+        buf, 0, MAGIC, LAYOUT_VERSION, len(game.players), game.board_size, game.max_players, seq, game.version,
+        STATE_FINISHED if game.state == GameState.FINISHED else 0, current, winner,
+        1 if game.placement_phase else 0, logged
+    )
+    for pid, player in game.players.items():
+        i = index[pid]
+        PLAYER.pack_into(
+            buf, HEADER.size + i * PLAYER.size,
+            pid.encode("ascii"), player.name.encode("utf-8")[:64],
+            len(player.fleet), game.ships_afloat.get(pid, sum(1 for ship in player.fleet if not ship.is_sunk)),
+            1 if game.is_eliminated(pid) else 0, shots[i], hits[i]
+        )
+
+
+def write_shots(buf: memoryview, game: Game, start: int, shots: List[int], hits: List[int], logged: int) -> int:
+    """
+    Marca en los tableros los disparos del historial a partir de la posición `start`,
+    añade al registro las celdas disparadas por primera vez y acumula los disparos
+    e impactos de cada jugador en `shots` y `hits`. Retorna las entradas del registro.
+    """
+    index = _player_index(game)
+    board_size = game.board_size
+    boards = _board_offset(game.max_players, board_size, 0)
+    log = _log_offset(game.max_players, board_size)
+    for pid, row, col, result, target_id in islice(game.shot_log, start, None):
+        shots[index[pid]] += 1
+        if result != ShotResult.WATER:
+            hits[index[pid]] += 1
+        if target_id not in index:
+            continue
+        cell = index[target_id] * board_size * board_size + row * board_size + col
+        offset = boards + cell
+        if not buf[offset] & CELL_RESULT_MASK:
+            LOG_ENTRY.pack_into(buf, log + logged * LOG_ENTRY.size, cell)
+            logged += 1
+        buf[offset] = (buf[offset] & CELL_SHIP) | RESULT_CODES[result] | (index[pid] << CELL_SHOOTER_SHIFT)
+    return logged
+
+
+def write_full(buf: memoryview, game: Game, shots: List[int], hits: List[int]) -> int:
+    """Reescribe el segmento completo: barcos, todos los disparos y contadores. Retorna las entradas del registro."""
+    shots[:] = [0] * len(game.players)
+    hits[:] = [0] * len(game.players)
+    board_size = game.board_size
+    cells = board_size * board_size
+    for pid, i in _player_index(game).items():
+        base = _board_offset(game.max_players, board_size, i)
+        buf[base:base + cells] = bytes(cells)
+        for ship in game.players[pid].fleet:
+            for coord in ship.coordinates:
+                if 0 <= coord.row < board_size and 0 <= coord.col < board_size:
+                    buf[base + coord.row * board_size + coord.col] = CELL_SHIP
+    logged = write_shots(buf, game, 0, shots, hits, 0)
+    write_counters(buf, game, shots, hits, logged)
+    return logged
+
+
+def mark_retired(buf: memoryview):
+    """Marca la partida como retirada (sin modificar la secuencia)."""
+    buf[STATE_OFFSET] |= STATE_RETIRED
+
+
+def read_header(buf: memoryview) -> Optional[tuple]:
+    """Retorna la cabecera, o None si el segmento aún no contiene una partida válida."""
+    header = HEADER.unpack_from(buf, 0)
+    if header[0] != MAGIC or header[1] != LAYOUT_VERSION:
+        return None
+    return header
+
+
+def read_players(buf: memoryview, count: int) -> List[Dict[str, Any]]:
+    players = []
+    for i in range(count):
+        pid, name, total, afloat, eliminated, shots, hits = PLAYER.unpack_from(buf, HEADER.size + i * PLAYER.size)
+        players.append({
+            "player_id": pid.decode("ascii"),
+            "name": name.rstrip(b"\x00").decode("utf-8", errors="ignore"),
+            "total_ships": total,
+            "ships_remaining": afloat,
+            "eliminated": bool(eliminated),
+            "shots": shots,
+            "hits": hits
+        })
+    return players
+
+
+def read_shots(buf: memoryview, max_players: int, board_size: int, players: List[Dict[str, Any]],
+               logged: int) -> List[Dict[str, Any]]:
+    """
+    Disparos recibidos en cada tablero, en orden de turno (una entrada por celda
+    disparada, con el último resultado). Solo recorre las entradas del registro.
+    """
+    shots = []
+    cells = board_size * board_size
+    boards = _board_offset(max_players, board_size, 0)
+    log = _log_offset(max_players, board_size)
+    for (cell,) in LOG_ENTRY.iter_unpack(buf[log:log + logged * LOG_ENTRY.size]):
+        value = buf[boards + cell]
+        target_index, position = divmod(cell, cells)
+        row, col = divmod(position, board_size)
+        shots.append({
+            "player_id": players[value >> CELL_SHOOTER_SHIFT]["player_id"],
+            "target_id": players[target_index]["player_id"],
+            "row": row,
+            "col": col,
+            "result": RESULTS[value & CELL_RESULT_MASK].value
+        })
+    return shots
@@ -0,0 +1,208 @@
+import random
+from typing import Dict, FrozenSet, Iterator, List, Optional, Tuple
+from .Game_model import Game, ShotResult
+
+
+class _PNode:
+    """Nodo inmutable de un treap persistente de disparos (clave: (fila, columna))."""
+    __slots__ = ("key", "result", "priority", "left", "right")
+
+    def __init__(self, key: Tuple[int, int], result: ShotResult, priority: float,
+                 left: Optional["_PNode"], right: Optional["_PNode"]):
+        self.key = key
+        self.result = result
+        self.priority = priority
+        self.left = left
+        self.right = right
+
+
+def _find(node: Optional[_PNode], key: Tuple[int, int]) -> Optional[_PNode]:
+    while node is not None:
+        if key == node.key:
+            return node
+        node = node.left if key < node.key else node.right
+    return None
+
+
+def _insert(node: Optional[_PNode], key: Tuple[int, int], result: ShotResult, priority: float) -> _PNode:
+    """Retorna una nueva raíz con la clave insertada; solo se copian los nodos del camino."""
+    if node is None:
+        return _PNode(key, result, priority, None, None)
+    if key < node.key:
+        left = _insert(node.left, key, result, priority)
+        if left.priority > node.priority:
+            # Rotación a la derecha
+            return _PNode(left.key, left.result, left.priority, left.left,
+                          _PNode(node.key, node.result, node.priority, left.right, node.right))
+        return _PNode(node.key, node.result, node.priority, left, node.right)
+    right = _insert(node.right, key, result, priority)
+    if right.priority > node.priority:
+        # Rotación a la izquierda
+        return _PNode(right.key, right.result, right.priority,
+                      _PNode(node.key, node.result, node.priority, node.left, right.left), right.right)
+    return _PNode(node.key, node.result, node.priority, node.left, right)
+
+
+def _in_order(node: Optional[_PNode]) -> Iterator[_PNode]:
+    stack = []
+    while stack or node is not None:
+        while node is not None:
+            stack.append(node)
+            node = node.left
+        node = stack.pop()
+        yield node
+        node = node.right
+
+
+class FleetLayout:
+    """
+    Disposición inmutable de la flota de un jugador (nombres, tamaños y celda -> barco).
+    Nunca cambia durante la partida, así que todas las copias la comparten.
+    """
+    __slots__ = ("names", "sizes", "cell_to_ship")
+
+    def __init__(self, names: Tuple[str, ...], sizes: Tuple[int, ...], cell_to_ship: Dict[Tuple[int, int], int]):
+        self.names = names
+        self.sizes = sizes
+        self.cell_to_ship = cell_to_ship
+
+
+class GameSnapshot:
+    """
+    Copia de una partida con estructuras persistentes para análisis "¿qué pasaría si?"
+    y búsqueda de la IA.
+
+    - `fork()` cuesta O(1): la copia comparte todas las estructuras con el original.
+    - `shoot()` nunca modifica estructuras compartidas: reemplaza el árbol de disparos
+      del atacante (copiando solo el camino de inserción, O(log n)), la tupla de
+      impactos del defensor y los diccionarios por jugador afectados.
+    """
+    __slots__ = ("board_size", "order", "layouts", "shots", "hits", "afloat",
+                 "current", "winner", "turn")
+
+    def __init__(self):
+        self.board_size = 0
+        self.order: Tuple[str, ...] = ()
+        self.layouts: Dict[str, FleetLayout] = {}
+        # (atacante, objetivo) -> raíz del treap persistente de disparos
+        self.shots: Dict[Tuple[str, str], Optional[_PNode]] = {}
+        self.hits: Dict[str, Tuple[int, ...]] = {}
+        self.afloat: Dict[str, int] = {}
+        self.current: Optional[str] = None
+        self.winner: Optional[str] = None
+        self.turn = 0
+
+    @classmethod
+    def from_game(cls, game: Game, upto_turn: Optional[int] = None) -> "GameSnapshot":
+        """
+        Construye la copia a partir de las flotas de la partida, reproduciendo los
+        primeros `upto_turn` disparos del historial (todos si es None).
+        """
+        snapshot = cls()
+        snapshot.board_size = game.board_size
+        snapshot.order = tuple(game.players.keys())
+        for pid, player in game.players.items():
+            cell_to_ship = {}
+            for index, ship in enumerate(player.fleet):
+                for coord in ship.coordinates:
+                    cell_to_ship[(coord.row, coord.col)] = index
+            snapshot.layouts[pid] = FleetLayout(
+                tuple(ship.name for ship in player.fleet),
+                tuple(ship.size for ship in player.fleet),
+                cell_to_ship
+            )
+            snapshot.hits[pid] = (0,) * len(player.fleet)
+            snapshot.afloat[pid] = len(player.fleet)
+        snapshot.current = snapshot.order[0] if snapshot.order else None
+
+        log = game.shot_log if upto_turn is None else game.shot_log[:upto_turn]
+        for pid, row, col, _, target_id in log:
+            snapshot.current = pid
+            snapshot.shoot(row, col, target_id)
+        return snapshot
+
+    def fork(self) -> "GameSnapshot":
+        """Crea una copia independiente en O(1) compartiendo toda la estructura."""
+        clone = GameSnapshot.__new__(GameSnapshot)
+        clone.board_size = self.board_size
+        clone.order = self.order
+        clone.layouts = self.layouts
+        clone.shots = self.shots
+        clone.hits = self.hits
+        clone.afloat = self.afloat
+        clone.current = self.current
+        clone.winner = self.winner
+        clone.turn = self.turn
+        return clone
+
+    def default_target(self, attacker_id: str) -> Optional[str]:
+        """En partidas de 2 jugadores, el oponente."""
+        if len(self.order) != 2:
+            return None
+        return self.order[1] if self.order[0] == attacker_id else self.order[0]
+
+    def has_shot(self, attacker_id: str, target_id: str, row: int, col: int) -> bool:
+        return _find(self.shots.get((attacker_id, target_id)), (row, col)) is not None
+
+    def shoot(self, row: int, col: int, target_id: Optional[str] = None) -> Tuple[ShotResult, Optional[str]]:
+        """
+        Dispara con el jugador en turno y avanza el turno.
+        Retorna (resultado, barco afectado). Lanza ValueError si el disparo no es válido.
+        """
+        attacker = self.current
+        if self.winner is not None or attacker is None:
+            raise ValueError("La partida ya terminó")
+        target = target_id or self.default_target(attacker)
+        if target is None or target not in self.layouts or target == attacker:
+            raise ValueError("Jugador objetivo inválido")
+        if not (0 <= row < self.board_size and 0 <= col < self.board_size):
+            raise ValueError("Coordenadas fuera de los límites del tablero")
+        key = (attacker, target)
+        root = self.shots.get(key)
+        if _find(root, (row, col)) is not None:
+            raise ValueError(f"Ya has disparado a la posición ({row}, {col})")
+
+        layout = self.layouts[target]
+        ship_index = layout.cell_to_ship.get((row, col))
+        result = ShotResult.WATER
+        ship_name = None
+        if ship_index is not None:
+            hits = list(self.hits[target])
+            hits[ship_index] += 1
+            self.hits = {**self.hits, target: tuple(hits)}
+            ship_name = layout.names[ship_index]
+            result = ShotResult.HIT
+            if hits[ship_index] >= layout.sizes[ship_index]:
+                result = ShotResult.SUNK
+                self.afloat = {**self.afloat, target: self.afloat[target] - 1}
+
+        self.shots = {**self.shots, key: _insert(root, (row, col), result, random.random())}
+        self.turn += 1
+
+        alive = [pid for pid in self.order if self.afloat[pid] > 0]
+        if len(alive) == 1 and len(self.order) > 1:
+            self.winner = alive[0]
+        else:
+            self.current = self._next_alive(attacker)
+        return result, ship_name
+
+    def _next_alive(self, player_id: str) -> str:
+        start = self.order.index(player_id)
+        for step in range(1, len(self.order) + 1):
+            candidate = self.order[(start + step) % len(self.order)]
+            if self.afloat[candidate] > 0:
+                return candidate
+        return player_id
+
+    def shots_of(self, attacker_id: str, target_id: Optional[str] = None) -> List[Tuple[int, int, ShotResult]]:
+        """Disparos del atacante contra el objetivo, ordenados por (fila, columna)."""
+        target = target_id or self.default_target(attacker_id)
+        return [(node.key[0], node.key[1], node.result) for node in _in_order(self.shots.get((attacker_id, target)))]
+
+    def ships_remaining(self, player_id: str) -> int:
+        return self.afloat[player_id]
+
+    def sunk_ships(self, player_id: str) -> FrozenSet[str]:
+        layout = self.layouts[player_id]
+        hits = self.hits[player_id]
+        return frozenset(name for name, size, hit in zip(layout.names, layout.sizes, hits) if hit >= size)
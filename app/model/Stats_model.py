@@ -0,0 +1,172 @@
+import random
+from typing import Any, Iterator, List, Optional
+
+
+class PlayerStats:
+    """Estadísticas acumuladas de un jugador, actualizadas al terminar cada partida."""
+    __slots__ = ("player_id", "name", "games", "wins", "shots", "hits", "shots_in_wins")
+
+    def __init__(self, player_id: str, name: str):
+        self.player_id = player_id
+        self.name = name
+        self.games = 0
+        self.wins = 0
+        self.shots = 0
+        self.hits = 0
+        self.shots_in_wins = 0
+
+    @property
+    def losses(self) -> int:
+        return self.games - self.wins
+
+    @property
+    def accuracy(self) -> float:
+        """Proporción de disparos que impactaron un barco."""
+        return self.hits / self.shots if self.shots else 0.0
+
+    @property
+    def average_shots_to_win(self) -> Optional[float]:
+        """Promedio de disparos realizados en las partidas ganadas."""
+        return self.shots_in_wins / self.wins if self.wins else None
+
+    @property
+    def ranking_key(self) -> tuple:
+        """Clave de orden del ranking: más victorias, luego menos partidas jugadas."""
+        return (-self.wins, self.games, self.player_id)
+
+    def to_dict(self) -> dict:
+        return {
+            "player_id": self.player_id,
+            "name": self.name,
+            "games": self.games,
+            "wins": self.wins,
+            "losses": self.losses,
+            "shots": self.shots,
+            "hits": self.hits,
+            "accuracy": round(self.accuracy, 4),
+            "average_shots_to_win": round(self.average_shots_to_win, 2) if self.wins else None
+        }
+
+
+class _SkipNode:
+    """Nodo de la lista de saltos. `width[i]` es la distancia (en posiciones) hasta `next[i]`."""
+    __slots__ = ("key", "next", "width")
+
+    def __init__(self, key: Any, level: int):
+        self.key = key
+        self.next: List[Optional["_SkipNode"]] = [None] * level
+        self.width: List[int] = [1] * level
+
+
+class RankedSkipList:
+    """
+    Lista de saltos indexable (estructura de estadísticas de orden).
+    Mantiene claves ordenadas y permite insertar, eliminar, obtener la posición
+    de una clave y acceder por posición en O(log n) esperado.
+    """
+    MAX_LEVEL = 32
+
+    def __init__(self):
+        self._head = _SkipNode(None, self.MAX_LEVEL)
+        self._size = 0
+        # Número de niveles en uso (solo se recorren estos niveles)
+        self._level = 1
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _random_level(self) -> int:
+        level = 1
+        while level < self.MAX_LEVEL and random.random() < 0.5:
+            level += 1
+        return level
+
+    def insert(self, key: Any):
+        """Inserta una clave manteniendo el orden."""
+        new_node = _SkipNode(key, self._random_level())
+        if len(new_node.next) > self._level:
+            # Los niveles nuevos de la cabecera apuntan al final de la lista
+            for level in range(self._level, len(new_node.next)):
+                self._head.next[level] = None
+                self._head.width[level] = self._size + 1
+            self._level = len(new_node.next)
+
+        chain: List[_SkipNode] = [self._head] * self._level
+        steps_at_level = [0] * self._level
+        node = self._head
+        for level in reversed(range(self._level)):
+            while node.next[level] is not None and node.next[level].key < key:
+                steps_at_level[level] += node.width[level]
+                node = node.next[level]
+            chain[level] = node
+
+        steps = 0
+        for level in range(len(new_node.next)):
+            prev = chain[level]
+            new_node.next[level] = prev.next[level]
+            prev.next[level] = new_node
+            new_node.width[level] = prev.width[level] - steps
+            prev.width[level] = steps + 1
+            steps += steps_at_level[level]
+        for level in range(len(new_node.next), self._level):
+            chain[level].width[level] += 1
+        self._size += 1
+
+    def remove(self, key: Any):
+        """Elimina una clave. Lanza KeyError si no existe."""
+        chain: List[_SkipNode] = [self._head] * self._level
+        node = self._head
+        for level in reversed(range(self._level)):
+            while node.next[level] is not None and node.next[level].key < key:
+                node = node.next[level]
+            chain[level] = node
+
+        target = chain[0].next[0]
+        if target is None or target.key != key:
+            raise KeyError(key)
+        for level in range(len(target.next)):
+            prev = chain[level]
+            prev.width[level] += target.width[level] - 1
+            prev.next[level] = target.next[level]
+        for level in range(len(target.next), self._level):
+            chain[level].width[level] -= 1
+        self._size -= 1
+        while self._level > 1 and self._head.next[self._level - 1] is None:
+            self._level -= 1
+
+    def rank(self, key: Any) -> Optional[int]:
+        """Retorna la posición (base 0) de la clave, o None si no existe."""
+        position = 0
+        node = self._head
+        for level in reversed(range(self._level)):
+            while node.next[level] is not None and node.next[level].key < key:
+                position += node.width[level]
+                node = node.next[level]
+        candidate = node.next[0]
+        if candidate is None or candidate.key != key:
+            return None
+        return position
+
+    def _node_at(self, index: int) -> Optional[_SkipNode]:
+        remaining = index + 1
+        node = self._head
+        for level in reversed(range(self._level)):
+            while node.next[level] is not None and node.width[level] <= remaining:
+                remaining -= node.width[level]
+                node = node.next[level]
+        return node if node is not self._head else None
+
+    def __getitem__(self, index: int) -> Any:
+        if not 0 <= index < self._size:
+            raise IndexError("Posición fuera de rango")
+        return self._node_at(index).key
+
+    def range(self, offset: int, limit: int) -> Iterator[Any]:
+        """Itera hasta `limit` claves a partir de la posición `offset`."""
+        if offset >= self._size or limit <= 0:
+            return
+        node = self._node_at(offset)
+        while node is not None and limit > 0:
+            yield node.key
+            node = node.next[0]
+            limit -= 1
@@ -0,0 +1,71 @@
+from enum import Enum
+from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, Field
+from uuid import UUID, uuid4
+
+
+class TournamentFormat(str, Enum):
+    SINGLE_ELIMINATION = "SINGLE_ELIMINATION"
+    ROUND_ROBIN = "ROUND_ROBIN"
+
+
+class TournamentState(str, Enum):
+    IN_PROGRESS = "IN_PROGRESS"
+    FINISHED = "FINISHED"
+
+
+class Match(BaseModel):
+    """Un enfrentamiento de una ronda del torneo. Sin `player_2_id` es un pase libre (bye)."""
+    round: int
+    player_1_id: str
+    player_2_id: Optional[str] = None
+    game_id: Optional[str] = None
+    winner_id: Optional[str] = None
+
+    @property
+    def is_bye(self) -> bool:
+        return self.player_2_id is None
+
+
+class Standing(BaseModel):
+    """Registro acumulado de un jugador en el torneo, actualizado al terminar cada partida."""
+    player_id: str
+    played: int = 0
+    wins: int = 0
+    losses: int = 0
+    byes: int = 0
+    eliminated: bool = False
+
+    @property
+    def points(self) -> int:
+        return 3 * (self.wins + self.byes)
+
+
+class Tournament(BaseModel):
+    """
+    Torneo de Batalla Naval con formato de eliminación directa o de todos contra todos.
+
+    Todas las partidas del torneo comparten el mismo reglamento (tamaño del tablero
+    y barcos). Cada ronda se crea completa de una sola vez y la siguiente comienza
+    automáticamente cuando terminan todas las partidas pendientes de la ronda actual.
+    """
+    id: UUID = Field(default_factory=uuid4)
+    name: str
+    format: TournamentFormat
+    player_ids: List[str]
+    board_size: int = Field(..., gt=0)
+    ships: List[Dict[str, Any]]
+    state: TournamentState = TournamentState.IN_PROGRESS
+    current_round: int = 0
+    total_rounds: int = 0
+    rounds: List[List[Match]] = Field(default_factory=list)
+    pending_matches: int = 0
+    standings: Dict[str, Standing] = Field(default_factory=dict)
+    champion_id: Optional[str] = None
+
+    def ranking(self) -> List[Standing]:
+        """Clasificación ordenada por puntos, victorias y menos derrotas."""
+        return sorted(
+            self.standings.values(),
+            key=lambda s: (-s.points, -s.wins, s.losses)
+        )
@@ -0,0 +1,42 @@
+"""
+Aplicación réplica de solo lectura.
+
+Sirve los endpoints de estado leyendo las instantáneas que el proceso
+principal (único escritor, con SHARED_STATE_ENABLED=true) publica en memoria
+compartida, sin IPC con él. Se pueden lanzar tantos procesos como se quiera:
+
+    uvicorn app.replica:app --port 8001 --workers 4
+
+Las partidas compactadas en el proceso principal se siguen sirviendo con su
+último estado. Las terminadas se sirven con el resultado final durante
+SHARED_STATE_FINISHED_GRACE_SECONDS; después, y en cuanto se elimina una
+partida, su segmento se retira y la réplica responde 404.
+"""
+from contextlib import asynccontextmanager
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from app.controller.Replica_controller import router as replica_router, reader
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    reader.close()
+
+
+app = FastAPI(
+    title='API Batalla Naval (réplica de lectura)',
+    description='Endpoints de estado servidos desde la memoria compartida',
+    version='1.0.0',
+    lifespan=lifespan
+)
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+app.include_router(replica_router, prefix="/api")
@@ -0,0 +1,69 @@
+"""
+Lanzador del servidor HTTP según el perfil de la configuración (`.env` o variables de entorno).
+
+    python -m app.server                            # perfil por defecto (equivale a uvicorn con sus valores)
+    SERVER_PROFILE=production python -m app.server  # uvloop + httptools, keep-alive largo, sin access log
+
+Cualquier opción SERVER_* definida sustituye al valor del perfil.
+
+Las partidas viven en la memoria del proceso: con SERVER_APP=app.main:app se debe
+usar un solo worker. Para escalar las lecturas se levantan varios workers de la
+réplica (SERVER_APP=app.replica:app) sobre el estado publicado en memoria compartida.
+"""
+import logging
+from typing import Any, Dict
+import uvicorn
+from .core.Settings import Settings, settings
+
+logger = logging.getLogger(__name__)
+
+PROFILES: Dict[str, Dict[str, Any]] = {
+    "default": {
+        "workers": 1,
+        "loop": "auto",
+        "http": "auto",
+        "timeout_keep_alive": 5,
+        "backlog": 2048,
+        "access_log": True
+    },
+    "production": {
+        "workers": 1,
+        "loop": "uvloop",
+        "http": "httptools",
+        "timeout_keep_alive": 30,
+        "backlog": 4096,
+        "access_log": False
+    }
+}
+
+
+def server_options(config: Settings) -> Dict[str, Any]:
+    """Argumentos de `uvicorn.run` para el perfil elegido y las opciones definidas explícitamente."""
+    options = dict(PROFILES[config.SERVER_PROFILE])
+    overrides = {
+        "workers": config.SERVER_WORKERS,
+        "loop": config.SERVER_LOOP,
+        "http": config.SERVER_HTTP,
+        "timeout_keep_alive": config.SERVER_KEEPALIVE_SECONDS,
+        "backlog": config.SERVER_BACKLOG,
+        "access_log": config.SERVER_ACCESS_LOG
+    }
+    options.update({key: value for key, value in overrides.items() if value is not None})
+    options["host"] = config.SERVER_HOST
+    options["port"] = config.SERVER_PORT
+    return options
+
+
+def run(config: Settings = settings):
+    options = server_options(config)
+    if options["workers"] > 1 and config.SERVER_APP == "app.main:app":
+        logger.warning(
+            "SERVER_WORKERS=%s con app.main:app: cada worker tiene sus propias partidas en memoria",
+            options["workers"]
+        )
+    # Se pasa la ruta de importación para que uvicorn pueda levantar varios workers
+    uvicorn.run(config.SERVER_APP, **options)
+
+
+if __name__ == "__main__":
+    run()
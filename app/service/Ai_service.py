@@ -0,0 +1,85 @@
+from typing import Dict, Optional, Tuple
+from uuid import uuid4
+from ..model.Ai_model import AiLevel, choose_move, random_fleet
+from ..model.Game_model import Coordinate, Game, Player, ShipNode, ShipOrientation, ShotResult
+from .Worker_service import worker_service
+
+
+class AiService:
+    """
+    Oponentes controlados por el servidor en partidas de 2 jugadores.
+
+    La IA solo usa información pública: los resultados de sus propios disparos
+    (árbol de disparos) y las celdas de los barcos ya hundidos. La elección de la
+    casilla se ejecuta en el grupo de procesos para no ocupar el bucle de eventos.
+    """
+
+    def __init__(self):
+        # id de partida -> (id del jugador IA, nivel)
+        self.opponents: Dict[str, Tuple[str, AiLevel]] = {}
+
+    def create_player(self, level: AiLevel) -> Player:
+        """Crea el jugador registrado que representa a la IA."""
+        return Player(name=f"CPU ({level.value}) {uuid4().hex[:6]}")
+
+    def register(self, game_id: str, player_id: str, level: AiLevel):
+        self.opponents[game_id] = (player_id, level)
+
+    def opponent(self, game_id: str) -> Optional[Tuple[str, AiLevel]]:
+        return self.opponents.get(game_id)
+
+    async def place_fleet(self, game: Game, player: Player):
+        """Coloca al azar la flota de la IA según la configuración de la partida y la marca como lista."""
+        sizes = [ship["size"] for ship in game.ships_config]
+        layout = await worker_service.run_in_process(random_fleet, game.board_size, sizes)
+        for (vertical, cells), config in zip(layout, game.ships_config):
+            ship = ShipNode(
+                name=config["name"],
+                size=config["size"],
+                orientation=ShipOrientation.VERTICAL if vertical else ShipOrientation.HORIZONTAL
+            )
+            ship.coordinates = [Coordinate(row=row, col=col) for row, col in cells]
+            player.add_ship(ship)
+        if not game.validate_fleet(player.fleet):
+            player.fleet = []
+            raise ValueError("No se pudo colocar la flota de la IA")
+        player.is_ready = True
+        game.mark_updated()
+
+    def view(self, game: Game, player_id: str, target_id: str) -> Tuple[Tuple[int, ...], int, int, int]:
+        """
+        Lo que la IA sabe del tablero rival: tamaños de los barcos a flote y
+        mapas de bits de agua, impactos sin resolver y celdas de barcos hundidos.
+        """
+        board_size = game.board_size
+        shots = game.shot_tree(game.players[player_id], target_id).get_all()
+        sunk = {shot.affected_ship for shot in shots if shot.result == ShotResult.SUNK}
+        misses = hits = resolved = 0
+        for shot in shots:
+            bit = 1 << (shot.coordinate.row * board_size + shot.coordinate.col)
+            if shot.result == ShotResult.WATER:
+                misses |= bit
+            elif shot.affected_ship in sunk:
+                resolved |= bit
+            else:
+                hits |= bit
+        sizes = tuple(ship["size"] for ship in game.ships_config if ship["name"] not in sunk)
+        return sizes, misses, hits, resolved
+
+    async def next_move(self, game: Game, player_id: str, target_id: str, level: AiLevel) -> Tuple[int, int]:
+        """Calcula la siguiente casilla de la IA (fila, columna) en el grupo de procesos."""
+        sizes, misses, hits, resolved = self.view(game, player_id, target_id)
+        return await worker_service.run_in_process(
+            choose_move, level.value, game.board_size, sizes, misses, hits, resolved
+        )
+
+    def fallback_move(self, game: Game, player_id: str, target_id: str) -> Tuple[int, int]:
+        """
+        Movimiento de respaldo (nivel fácil) calculado en el propio proceso, para
+        cuando falla el grupo de procesos. Es barato: el tablero de la IA está acotado.
+        """
+        return choose_move(AiLevel.EASY.value, game.board_size, *self.view(game, player_id, target_id))
+
+
+# Instancia global del servicio
+ai_service = AiService()
@@ -0,0 +1,145 @@
+import gzip
+import json
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, Optional
+from ..core.Settings import settings
+
+
+class AuditLogger:
+    """
+    Registro de auditoría estructurado (JSON lines) para resolver disputas:
+    cambios de configuración del administrador, colocaciones y disparos.
+
+    `log()` solo añade una tupla a una `deque` (operación atómica, sin bloqueos)
+    y nunca escribe en disco desde el bucle de eventos. Un hilo en segundo plano
+    vacía la cola por lotes en archivos comprimidos con gzip que rotan por tamaño.
+    La cola está acotada: si se llena, los registros se descartan y se cuentan.
+    `dropped` se incrementa desde el bucle y desde el hilo escritor, así que se
+    protege con un bloqueo (solo se toma al descartar, nunca en el camino normal).
+    """
+
+    def __init__(self, directory: Path, enabled: bool = True, max_queue: int = 100_000,
+                 batch_size: int = 1000, flush_interval: float = 0.2,
+                 max_file_bytes: int = 10_000_000, max_files: int = 50):
+        self.directory = directory
+        self.enabled = enabled
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_file_bytes = max_file_bytes
+        self.max_files = max_files
+
+        self._queue: deque = deque()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._file = None
+        self._file_bytes = 0
+        self._file_index = 0
+
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+        self.write_errors = 0
+
+    def log(self, event: str, **fields: Any):
+        """Encola un registro de auditoría. No bloquea ni serializa en el llamador."""
+        if not self.enabled:
+            return
+        if len(self._queue) >= self.max_queue:
+            self._count_dropped(1)
+            return
+        self._queue.append((time.time(), event, fields))
+        self.enqueued += 1
+        if self._thread is None:
+            self._start()
+        elif len(self._queue) >= self.batch_size:
+            self._wake.set()
+
+    def _count_dropped(self, count: int):
+        with self._dropped_lock:
+            self.dropped += count
+
+    def _start(self):
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self._flush()
+            if self._stopping:
+                self._flush()
+                return
+
+    def _flush(self):
+        """Escribe en disco todos los registros encolados, en lotes de `batch_size`."""
+        while self._queue:
+            lines = []
+            while self._queue and len(lines) < self.batch_size:
+                ts, event, fields = self._queue.popleft()
+                lines.append(json.dumps({"ts": round(ts, 6), "event": event, **fields}, default=str, separators=(",", ":")))
+            data = ("\n".join(lines) + "\n").encode("utf-8")
+            try:
+                if self._file is None or self._file_bytes >= self.max_file_bytes:
+                    self._rotate()
+                self._file.write(data)
+                self._file.flush()
+                self._file_bytes += len(data)
+                self.written += len(lines)
+            except OSError:
+                self.write_errors += 1
+                self._count_dropped(len(lines))
+
+    def _rotate(self):
+        """Cierra el archivo actual, abre uno nuevo y elimina los más antiguos."""
+        if self._file is not None:
+            self._file.close()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._file_index += 1
+        name = f"audit-{time.strftime('%Y%m%dT%H%M%S')}-{self._file_index:04d}.jsonl.gz"
+        self._file = gzip.open(self.directory / name, "ab")
+        self._file_bytes = 0
+
+        files = sorted(self.directory.glob("audit-*.jsonl.gz"))
+        for old in files[:max(0, len(files) - self.max_files)]:
+            old.unlink(missing_ok=True)
+
+    def stop(self, timeout: float = 5.0):
+        """Vacía la cola, detiene el hilo escritor y cierra el archivo actual."""
+        if self._thread is not None:
+            self._stopping = True
+            self._wake.set()
+            self._thread.join(timeout)
+            self._thread = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "queued": len(self._queue),
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "write_errors": self.write_errors
+        }
+
+
+# Instancia global del servicio
+audit_logger = AuditLogger(
+    directory=settings.AUDIT_DIR,
+    enabled=settings.AUDIT_ENABLED,
+    max_queue=settings.AUDIT_MAX_QUEUE,
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_interval=settings.AUDIT_FLUSH_INTERVAL_MS / 1000,
+    max_file_bytes=settings.AUDIT_MAX_FILE_BYTES,
+    max_files=settings.AUDIT_MAX_FILES
+)
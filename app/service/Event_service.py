@@ -0,0 +1,38 @@
+from collections import defaultdict
+from typing import Callable, Dict, List
+
+
+class EventService:
+    """
+    Despachador de eventos del juego en memoria.
+    Permite que otros servicios reaccionen a cambios (por ejemplo, el fin de
+    una partida) sin consultar periódicamente el estado de cada partida.
+    """
+
+    GAME_UPDATED = "game_updated"
+    GAME_FINISHED = "game_finished"
+    # La partida deja de estar hidratada en memoria (compactada o eliminada); se notifica su ID
+    GAME_RELEASED = "game_released"
+    # La partida se eliminó del almacén (después de GAME_RELEASED); se notifica su ID
+    GAME_DELETED = "game_deleted"
+
+    def __init__(self):
+        self._listeners: Dict[str, List[Callable]] = defaultdict(list)
+
+    def subscribe(self, event: str, callback: Callable):
+        """Registra una función que se ejecutará cuando ocurra el evento."""
+        self._listeners[event].append(callback)
+
+    def unsubscribe(self, event: str, callback: Callable):
+        """Elimina una función registrada para un evento."""
+        if callback in self._listeners[event]:
+            self._listeners[event].remove(callback)
+
+    def emit(self, event: str, *args, **kwargs):
+        """Notifica el evento a todas las funciones registradas."""
+        for callback in list(self._listeners[event]):
+            callback(*args, **kwargs)
+
+
+# Instancia global del servicio
+event_service = EventService()
@@ -5,6 +5,10 @@ from ..model.Game_model import (
     Game, Player, ShipNode, ShipOrientation, Coordinate, 
     GameState, ShotResult, ShotNode, ShotTree
 )
+from .Audit_service import audit_logger
+from .Event_service import EventService, event_service
+from .Game_store_service import GameStore, create_game_store
+from ..core.Settings import settings
 
 class GameService:
     """
@@ -12,10 +16,11 @@ class GameService:
     Gestiona la creación de partidas, colocación de barcos y ejecución de disparos.
     """
     
-    def __init__(self):
-        self.games: Dict[UUID, Game] = {}
+    def __init__(self, load_sample_games: bool = True):
+        self.games: GameStore = create_game_store()
         self.players: Dict[str, UUID] = {}  # Mapeo de nombre de jugador a ID de partida
-        self._initialize_sample_games()  # Inicializar partidas de ejemplo
+        if load_sample_games:
+            self._initialize_sample_games()  # Inicializar partidas de ejemplo
     
     
     def _initialize_sample_games(self):
@@ -138,15 +143,15 @@ class GameService:
                                 **ship_config
                             )
                         except Exception as e:
-                            print(f"Error colocando barco: {e}")
+                            audit_logger.log("error", action="place_sample_ship", game_id=game.id, error=str(e))
                     
                     # Marcar jugador como listo
                     self.ready_player(game.id, player.id)
                 
-                print(f"Partida creada: {config['name']} (ID: {game.id})")
+                audit_logger.log("sample_game_created", name=config["name"], game_id=game.id)
                 
             except Exception as e:
-                print(f"Error creando partida {config.get('name', '')}: {str(e)}")
+                audit_logger.log("error", action="create_sample_game", name=config.get("name", ""), error=str(e))
     
     def create_game(self, board_size: int, max_ships: int, max_ships_length_ratio: float = 0.7) -> Game:
         """Crea una nueva partida con la configuración especificada."""
@@ -208,9 +213,8 @@ class GameService:
             if not (0 <= row < game.board_size and 0 <= col < game.board_size):
                 raise ValueError("El barco se sale de los límites del tablero")
             
-            for existing_ship in player.fleet:
-                if any(c.row == row and c.col == col for c in existing_ship.coordinates):
-                    raise ValueError(f"El barco se superpone con otro barco en ({row}, {col})")
+            if player.get_ship_at(row, col) is not None:
+                raise ValueError(f"El barco se superpone con otro barco en ({row}, {col})")
             
             ship.add_coordinate(row, col)
         
@@ -222,6 +226,10 @@ class GameService:
             raise ValueError("La longitud total de los barcos excede el límite permitido")
         
         player.add_ship(ship)
+        audit_logger.log(
+            "placement", game_id=game_id, player_id=player_id,
+            ships=[{"name": ship.name, "cells": [(c.row, c.col) for c in ship.coordinates]}]
+        )
         return ship
     
     def ready_player(self, game_id: UUID, player_id: UUID) -> None:
@@ -263,11 +271,7 @@ class GameService:
             'winner': None
         }
         
-        target_ship = next(
-            (ship for ship in defender.fleet 
-             if any(c.row == target_row and c.col == target_col for c in ship.coordinates)),
-            None
-        )
+        target_ship = defender.get_ship_at(target_row, target_col)
         
         if target_ship:
             shot_result = target_ship.receive_shot(target_row, target_col)
@@ -291,9 +295,20 @@ class GameService:
             affected_ship=target_ship.name if target_ship else None
         )
         attacker.shots.insert(shot_node)
+        game.record_shot(
+            attacker.id, target_row, target_col,
+            ShotResult.SUNK if result['sunk'] else ShotResult.HIT if result['hit'] else ShotResult.WATER
+        )
+        audit_logger.log(
+            "shot", game_id=game_id, player_id=attacker_id, target_id=defender.id,
+            row=target_row, col=target_col, result=game.shot_log[-1][3].value, version=game.version
+        )
         
-        if not result['game_over']:
+        if result['game_over']:
+            event_service.emit(EventService.GAME_FINISHED, game)
+        else:
             game.next_turn()
+        event_service.emit(EventService.GAME_UPDATED, game)
         
         return result
     
@@ -368,5 +383,20 @@ class GameService:
             for shot in shots.get_all()
         ]
     
-# Instancia global del servicio
-game_service = GameService()
+# Instancia global del servicio (se crea en el primer uso, no al importar el módulo)
+_game_service: Optional[GameService] = None
+
+
+def get_game_service() -> GameService:
+    """Retorna la instancia global del servicio, creándola (con sus partidas de ejemplo) si no existe."""
+    global _game_service
+    if _game_service is None:
+        _game_service = GameService(load_sample_games=settings.LOAD_SAMPLE_GAMES)
+    return _game_service
+
+
+def __getattr__(name: str):
+    # Compatibilidad: `from app.service.Game_service import game_service` sigue funcionando
+    if name == "game_service":
+        return get_game_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,188 @@
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from ..core.Settings import settings
+from ..model.Compact_model import pack_game, unpack_game
+from ..model.Game_model import Game
+from .Event_service import EventService, event_service
+
+
+class GameStore(MutableMapping):
+    """
+    Diccionario de partidas que compacta las partidas inactivas.
+
+    Las partidas hidratadas se guardan en un LRU ordenado por último acceso.
+    Las que llevan `idle_seconds` sin accesos (o que salen del LRU al superar
+    `max_hydrated`) se empaquetan en un bloque binario (`pack_game`) y se
+    rehidratan de forma transparente en el siguiente acceso. `in` y `len` no
+    rehidratan.
+
+    Una partida nunca se compacta mientras `is_pinned(game_id)` sea verdadero
+    (por ejemplo, con espectadores conectados que mantienen una referencia al objeto)
+    ni mientras una solicitud la retenga con `hold()`.
+
+    Al compactar o eliminar una partida se emite `GAME_RELEASED` para que los
+    servicios liberen lo que guardan de ella (vistas en caché, memoria compartida).
+    Al eliminarla se emite además `GAME_DELETED`.
+    """
+
+    def __init__(self, idle_seconds: float, max_hydrated: int, is_pinned: Optional[Callable[[Any], bool]] = None):
+        self.idle_seconds = idle_seconds
+        self.max_hydrated = max_hydrated
+        self.is_pinned = is_pinned
+        # id de partida -> (partida, último acceso), del menos al más reciente
+        self._hot: "OrderedDict[Any, List]" = OrderedDict()
+        self._cold: Dict[Any, bytes] = {}
+        # id de partida -> solicitudes en curso que retienen el objeto
+        self._holds: Dict[Any, int] = {}
+        self.compactions = 0
+        self.hydrations = 0
+
+    def __getitem__(self, game_id) -> Game:
+        entry = self._hot.get(game_id)
+        if entry is not None:
+            entry[1] = time.monotonic()
+            self._hot.move_to_end(game_id)
+            return entry[0]
+        blob = self._cold.pop(game_id)
+        game = unpack_game(blob)
+        self.hydrations += 1
+        self._hot[game_id] = [game, time.monotonic()]
+        self._evict_over_capacity()
+        return game
+
+    def __setitem__(self, game_id, game: Game):
+        self._cold.pop(game_id, None)
+        self._hot[game_id] = [game, time.monotonic()]
+        self._hot.move_to_end(game_id)
+        self._evict_over_capacity()
+
+    def __delitem__(self, game_id):
+        if self._hot.pop(game_id, None) is None:
+            del self._cold[game_id]
+        event_service.emit(EventService.GAME_RELEASED, str(game_id))
+        event_service.emit(EventService.GAME_DELETED, str(game_id))
+
+    def __contains__(self, game_id) -> bool:
+        return game_id in self._hot or game_id in self._cold
+
+    def __iter__(self) -> Iterator:
+        yield from list(self._hot)
+        yield from list(self._cold)
+
+    def __len__(self) -> int:
+        return len(self._hot) + len(self._cold)
+
+    @contextmanager
+    def hold(self, game_id):
+        """
+        Retiene la partida (hidratada) durante una operación con puntos de espera,
+        para que los cambios se apliquen al mismo objeto que queda en el almacén.
+        """
+        game = self[game_id]
+        self._holds[game_id] = self._holds.get(game_id, 0) + 1
+        try:
+            yield game
+        finally:
+            if self._holds[game_id] > 1:
+                self._holds[game_id] -= 1
+            else:
+                del self._holds[game_id]
+
+    def _compact(self, game_id) -> bool:
+        entry = self._hot[game_id]
+        if game_id in self._holds or (self.is_pinned is not None and self.is_pinned(game_id)):
+            # Una partida fijada cuenta como activa
+            entry[1] = time.monotonic()
+            self._hot.move_to_end(game_id)
+            return False
+        del self._hot[game_id]
+        self._cold[game_id] = pack_game(entry[0])
+        self.compactions += 1
+        event_service.emit(EventService.GAME_RELEASED, str(game_id))
+        return True
+
+    def _evict_over_capacity(self):
+        # Las partidas fijadas pasan al final del LRU; se revisa cada partida como máximo una vez
+        for _ in range(len(self._hot)):
+            if len(self._hot) <= self.max_hydrated:
+                return
+            self._compact(next(iter(self._hot)))
+
+    def compact_idle(self, limit: Optional[int] = None) -> int:
+        """
+        Compacta las partidas sin accesos desde hace `idle_seconds`, empezando
+        por las más antiguas. Retorna cuántas partidas se revisaron.
+        """
+        deadline = time.monotonic() - self.idle_seconds
+        candidates = []
+        for game_id, (_, last_access) in self._hot.items():
+            if last_access > deadline or (limit is not None and len(candidates) >= limit):
+                break
+            candidates.append(game_id)
+        for game_id in candidates:
+            self._compact(game_id)
+        return len(candidates)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hydrated": len(self._hot),
+            "compacted": len(self._cold),
+            "compacted_bytes": sum(len(blob) for blob in self._cold.values()),
+            "compactions": self.compactions,
+            "hydrations": self.hydrations
+        }
+
+
+class IdleGameCompactor:
+    """
+    Tarea periódica que compacta las partidas inactivas de los almacenes registrados.
+    Trabaja por lotes y cede el bucle de eventos entre lotes para no retrasar las solicitudes.
+    """
+
+    BATCH_SIZE = 1000
+
+    def __init__(self, interval: float = 30.0):
+        self.interval = interval
+        self.stores: List[GameStore] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def register(self, store: GameStore) -> GameStore:
+        self.stores.append(store)
+        return store
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            for store in self.stores:
+                while store.compact_idle(limit=self.BATCH_SIZE) == self.BATCH_SIZE:
+                    await asyncio.sleep(0)
+
+    def start(self):
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+def create_game_store(is_pinned: Optional[Callable[[Any], bool]] = None) -> GameStore:
+    """Crea un almacén de partidas con la configuración global y lo registra en el compactador."""
+    return idle_game_compactor.register(GameStore(
+        idle_seconds=settings.GAME_IDLE_SECONDS,
+        max_hydrated=settings.GAME_MAX_HYDRATED,
+        is_pinned=is_pinned
+    ))
+
+
+# Instancia global del servicio
+idle_game_compactor = IdleGameCompactor(interval=settings.GAME_COMPACT_INTERVAL_SECONDS)
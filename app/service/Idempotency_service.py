@@ -0,0 +1,52 @@
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+from ..core.Settings import settings
+
+
+class IdempotencyCache:
+    """
+    Caché LRU acotada de respuestas recientes, agrupada por partida.
+    Cada partida conserva como máximo `max_keys_per_game` claves y se conservan
+    como máximo `max_games` partidas, por lo que la memoria está acotada por
+    `max_games * max_keys_per_game` entradas.
+    """
+
+    def __init__(self, max_keys_per_game: int = 64, max_games: int = 10_000):
+        self.max_keys_per_game = max_keys_per_game
+        self.max_games = max_games
+        self._games: "OrderedDict[str, OrderedDict[Tuple[str, str], Tuple[Hashable, Any]]]" = OrderedDict()
+
+    def get(self, game_id: str, player_id: str, key: str) -> Optional[Tuple[Hashable, Any]]:
+        """Retorna (huella de la solicitud, respuesta) guardada para la clave, o None."""
+        entries = self._games.get(game_id)
+        if entries is None:
+            return None
+        entry = entries.get((player_id, key))
+        if entry is not None:
+            self._games.move_to_end(game_id)
+            entries.move_to_end((player_id, key))
+        return entry
+
+    def put(self, game_id: str, player_id: str, key: str, fingerprint: Hashable, response: Any):
+        """Guarda la respuesta de una solicitud, descartando las entradas menos recientes."""
+        entries = self._games.get(game_id)
+        if entries is None:
+            entries = self._games[game_id] = OrderedDict()
+            while len(self._games) > self.max_games:
+                self._games.popitem(last=False)
+        else:
+            self._games.move_to_end(game_id)
+        entries[(player_id, key)] = (fingerprint, response)
+        entries.move_to_end((player_id, key))
+        while len(entries) > self.max_keys_per_game:
+            entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._games.values())
+
+
+# Instancia global del servicio
+shot_idempotency_cache = IdempotencyCache(
+    max_keys_per_game=settings.IDEMPOTENCY_MAX_KEYS_PER_GAME,
+    max_games=settings.IDEMPOTENCY_MAX_GAMES
+)
@@ -0,0 +1,129 @@
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+from uuid import uuid4
+from ..core.Settings import settings
+
+
+class ProfilerService:
+    """
+    Perfila peticiones individuales con cProfile y guarda las capturas
+    en un directorio local rotativo (se conservan las `max_files` más recientes).
+
+    cProfile perfila el hilo completo del bucle de eventos: las pilas de una
+    captura incluyen todas las corrutinas que se ejecutaron mientras estaba
+    activa, también las de otras solicitudes. Cada captura registra cuántas
+    solicitudes se solaparon (`overlapping_requests`); solo las capturas con
+    0 solicitudes solapadas corresponden exclusivamente a la petición.
+    """
+
+    def __init__(self, directory: Path, max_files: int = 200, top_stacks: int = 25):
+        self.directory = Path(directory)
+        self.max_files = max_files
+        self.top_stacks = top_stacks
+        # cProfile solo admite un perfilador activo a la vez
+        self._lock = threading.Lock()
+
+    def start(self) -> Optional[dict]:
+        """Comienza una captura. Retorna None si ya hay otra captura en curso."""
+        if not self._lock.acquire(blocking=False):
+            return None
+        # Importación diferida: solo se carga al perfilar
+        import cProfile
+        profiler = cProfile.Profile()
+        capture = {
+            "profiler": profiler,
+            "wall_start": time.perf_counter(),
+            "cpu_start": time.process_time(),
+        }
+        profiler.enable()
+        return capture
+
+    def stop(self, capture: dict, method: str, path: str, status_code: Optional[int],
+             overlapping_requests: int = 0) -> dict:
+        """
+        Detiene la captura y retorna su resumen (sin las pilas).
+        El análisis de las pilas y la escritura en disco se hacen después con `save`,
+        fuera del bucle de eventos.
+        """
+        profiler = capture["profiler"]
+        try:
+            profiler.disable()
+            wall_ms = (time.perf_counter() - capture["wall_start"]) * 1000
+            cpu_ms = (time.process_time() - capture["cpu_start"]) * 1000
+        finally:
+            self._lock.release()
+
+        record = {
+            "id": uuid4().hex,
+            "timestamp": time.time(),
+            "method": method,
+            "path": path,
+            "status_code": status_code,
+            "wall_ms": round(wall_ms, 3),
+            "cpu_ms": round(cpu_ms, 3),
+            "scope": "event_loop_thread",
+            "overlapping_requests": overlapping_requests,
+        }
+        return record
+
+    def save(self, record: dict, profiler) -> dict:
+        """Añade las pilas principales a la captura, la guarda y rota el directorio (bloqueante: usar en un hilo)."""
+        record["top_stacks"] = self._top_stacks(profiler)
+        self._save(record)
+        return record
+
+    def list_captures(self, limit: int = 20) -> List[dict]:
+        """Lista las capturas recientes ordenadas de la más lenta a la más rápida."""
+        captures = []
+        for file in self.directory.glob("*.json"):
+            try:
+                data = json.loads(file.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            data.pop("top_stacks", None)
+            captures.append(data)
+        captures.sort(key=lambda c: c["wall_ms"], reverse=True)
+        return captures[:limit]
+
+    def get_capture(self, capture_id: str) -> Optional[dict]:
+        """Obtiene una captura completa por su ID."""
+        for file in self.directory.glob(f"*_{capture_id}.json"):
+            return json.loads(file.read_text(encoding="utf-8"))
+        return None
+
+    def _top_stacks(self, profiler) -> List[Dict]:
+        """Extrae las funciones con mayor tiempo acumulado y sus llamadores."""
+        import pstats
+        stats = pstats.Stats(profiler)
+        entries = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)
+        top = []
+        for (filename, line, func), (cc, nc, tt, ct, callers) in entries[:self.top_stacks]:
+            top.append({
+                "function": f"{filename}:{line}({func})",
+                "calls": nc,
+                "total_ms": round(tt * 1000, 3),
+                "cumulative_ms": round(ct * 1000, 3),
+                "callers": [f"{c[0]}:{c[1]}({c[2]})" for c in callers],
+            })
+        return top
+
+    def _save(self, record: dict) -> None:
+        """Guarda la captura y elimina las más antiguas si se supera el límite."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        name = f"{int(record['timestamp'] * 1000):015d}_{record['id']}.json"
+        (self.directory / name).write_text(json.dumps(record), encoding="utf-8")
+
+        files = sorted(self.directory.glob("*.json"))
+        for old in files[:max(0, len(files) - self.max_files)]:
+            old.unlink(missing_ok=True)
+
+
+# Instancia global del servicio
+profiler_service = ProfilerService(
+    directory=settings.PROFILING_DIR,
+    max_files=settings.PROFILING_MAX_FILES,
+    top_stacks=settings.PROFILING_TOP_STACKS
+)
@@ -0,0 +1,101 @@
+import asyncio
+import math
+import time
+from collections import OrderedDict
+from typing import Optional
+from ..core.Settings import settings
+
+
+class TokenBucketLimiter:
+    """
+    Limitador de tasa por clave (ID de jugador o IP del cliente) con cubetas de fichas.
+    Cada clave activa ocupa una entrada de tamaño fijo; las claves inactivas se
+    descartan en orden LRU cuando se supera `max_keys`.
+    """
+
+    def __init__(self, rate: float, burst: int, max_keys: int = 100_000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        # clave -> [fichas disponibles, instante de la última recarga]
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+
+    def allow(self, key: str, now: Optional[float] = None) -> float:
+        """
+        Consume una ficha de la clave.
+        Retorna 0 si la solicitud está permitida, o los segundos a esperar si no.
+        """
+        now = time.monotonic() if now is None else now
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = [float(self.burst), now]
+            self._buckets[key] = bucket
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return 0.0
+        return (1 - bucket[0]) / self.rate
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class LoopLagMonitor:
+    """
+    Mide el retraso del bucle de eventos: duerme `interval` segundos y registra
+    cuánto tarda de más en despertar. Un retraso alto indica que el bucle está
+    saturado y que conviene rechazar solicitudes nuevas.
+    """
+
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self.lag_ms = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = (loop.time() - start - self.interval) * 1000
+            # Media móvil para no reaccionar a un único pico
+            self.lag_ms = max(0.0, 0.5 * self.lag_ms + 0.5 * lag)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self.lag_ms = 0.0
+
+
+def retry_after_seconds(wait: float) -> int:
+    """Valor de la cabecera Retry-After (segundos enteros, mínimo 1)."""
+    return max(1, math.ceil(wait))
+
+
+# Instancias globales del servicio
+rate_limiter = TokenBucketLimiter(
+    rate=settings.RATE_LIMIT_PER_SECOND,
+    burst=settings.RATE_LIMIT_BURST,
+    max_keys=settings.RATE_LIMIT_MAX_KEYS
+)
+ip_rate_limiter = TokenBucketLimiter(
+    rate=settings.RATE_LIMIT_IP_PER_SECOND,
+    burst=settings.RATE_LIMIT_IP_BURST,
+    max_keys=settings.RATE_LIMIT_MAX_KEYS
+)
+loop_lag_monitor = LoopLagMonitor(interval=settings.LOOP_LAG_INTERVAL_MS / 1000)
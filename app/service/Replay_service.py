@@ -0,0 +1,68 @@
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+from uuid import UUID
+from ..model.Game_model import Game
+from ..model.Replay_model import encode_replay, decode_replay, write_archive
+from .Event_service import EventService, event_service
+
+
+class ReplayService:
+    """
+    Almacena las repeticiones binarias de las partidas terminadas.
+    Se conservan como máximo `max_replays` (se descartan las más antiguas).
+    """
+
+    def __init__(self, max_replays: int = 100_000):
+        self.max_replays = max_replays
+        self._replays: "OrderedDict[str, bytes]" = OrderedDict()
+
+    def store(self, game: Game) -> bytes:
+        """Codifica y guarda la repetición de una partida."""
+        blob = encode_replay(game)
+        game_id = str(game.id)
+        self._replays[game_id] = blob
+        self._replays.move_to_end(game_id)
+        while len(self._replays) > self.max_replays:
+            self._replays.popitem(last=False)
+        return blob
+
+    def get(self, game_id: str) -> Optional[bytes]:
+        """Obtiene la repetición binaria guardada de una partida."""
+        return self._replays.get(game_id)
+
+    def list_ids(self, limit: int = 100, offset: int = 0) -> List[str]:
+        """Lista los IDs de partidas con repetición guardada (de la más antigua a la más reciente)."""
+        ids = list(self._replays.keys())
+        return ids[offset:offset + limit]
+
+    def __len__(self) -> int:
+        return len(self._replays)
+
+    def decode(self, blob: bytes) -> Dict:
+        """Decodifica una repetición binaria."""
+        return decode_replay(blob)
+
+    def export_archive(self, game_ids: Optional[List[str]] = None) -> Path:
+        """
+        Exporta las repeticiones a un archivo temporal legible con `ReplayArchive`
+        (memoria mapeada). Retorna la ruta del archivo.
+        """
+        ids = game_ids if game_ids is not None else list(self._replays.keys())
+        items = [(UUID(gid), self._replays[gid]) for gid in ids if gid in self._replays]
+        with tempfile.NamedTemporaryFile(prefix="replays_", suffix=".bnra", delete=False) as f:
+            path = Path(f.name)
+        write_archive(path, items)
+        return path
+
+
+def iter_chunks(blob: bytes, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """Divide un bloque binario en fragmentos para respuestas en streaming."""
+    for i in range(0, len(blob), chunk_size):
+        yield blob[i:i + chunk_size]
+
+
+# Instancia global del servicio
+replay_service = ReplayService()
+event_service.subscribe(EventService.GAME_FINISHED, replay_service.store)
@@ -0,0 +1,280 @@
+import time
+from collections import OrderedDict
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Dict, List, Optional, Set
+from ..core.Settings import settings
+from ..model.Game_model import Game, GameState
+from ..model.Shared_board_model import (
+    NO_PLAYER, SEQ, SEQ_OFFSET, STATE_FINISHED, STATE_RETIRED, mark_retired, read_header, read_players,
+    read_shots, segment_name, segment_size, write_counters, write_full, write_shots
+)
+from .Event_service import EventService, event_service
+
+
+class _Published:
+    """Estado del escritor para un segmento publicado."""
+    __slots__ = ("shm", "shots_published", "logged", "players", "placement", "shots", "hits")
+
+    def __init__(self, shm: SharedMemory):
+        self.shm = shm
+        self.shots_published = 0
+        self.logged = 0
+        self.players = 0
+        self.placement = True
+        self.shots: List[int] = []
+        self.hits: List[int] = []
+
+
+class SharedStatePublisher:
+    """
+    Escritor único: publica una instantánea compacta de cada partida en un
+    segmento de memoria compartida para que los procesos réplica la lean sin IPC.
+
+    Tras la colocación, cada actualización solo escribe las celdas de los
+    disparos nuevos y los contadores (O(jugadores)), no el tablero completo.
+
+    Ciclo de vida de un segmento:
+    - Al terminar la partida se publica su estado final (terminada y ganador) y
+      el segmento se retira `finished_grace_seconds` después, en la siguiente
+      publicación, para que los clientes de las réplicas vean el resultado.
+    - Al compactarse la partida (`GAME_RELEASED`) el escritor solo cierra su
+      proyección: el segmento sigue publicado con el último estado y la
+      siguiente actualización lo vuelve a abrir, así que las réplicas lo siguen leyendo.
+    - Al eliminarse la partida (`GAME_DELETED`) el segmento se marca como
+      retirado (los lectores lo cierran) y se elimina de /dev/shm.
+    """
+
+    def __init__(self, max_board_size: int, finished_grace_seconds: float = 300.0):
+        self.max_board_size = max_board_size
+        self.finished_grace_seconds = finished_grace_seconds
+        self._segments: Dict[str, _Published] = {}
+        # Segmentos publicados cuya proyección cerró el escritor (partidas compactadas)
+        self._parked: Set[str] = set()
+        # Partidas terminadas -> instante de retirada (en orden de llegada, es decir, de plazo)
+        self._retiring: "OrderedDict[str, float]" = OrderedDict()
+
+    def _open(self, game: Game) -> _Published:
+        game_id = str(game.id)
+        entry = self._segments.get(game_id)
+        if entry is not None:
+            return entry
+        size = segment_size(game.max_players, game.board_size)
+        name = segment_name(game_id)
+        self._parked.discard(game_id)
+        try:
+            shm = SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            # Segmento de una partida compactada (o huérfano de una ejecución anterior): se reutiliza,
+            # así los lectores que ya lo tienen abierto siguen viendo las actualizaciones
+            shm = SharedMemory(name=name)
+            if shm.size < size:
+                self._retire(shm)
+                shm = SharedMemory(name=name, create=True, size=size)
+        # Un segmento recién abierto empieza con una escritura completa
+        entry = self._segments[game_id] = _Published(shm)
+        return entry
+
+    def on_game_updated(self, game: Game):
+        self.retire_expired()
+        if game.board_size > self.max_board_size:
+            return
+        entry = self._open(game)
+        buf = entry.shm.buf
+        seq = SEQ.unpack_from(buf, SEQ_OFFSET)[0]
+        SEQ.pack_into(buf, SEQ_OFFSET, seq + 1)
+        try:
+            if (entry.placement or game.placement_phase or entry.players != len(game.players)
+                    or entry.shots_published > len(game.shot_log)):
+                entry.logged = write_full(buf, game, entry.shots, entry.hits)
+            else:
+                entry.logged = write_shots(buf, game, entry.shots_published, entry.shots, entry.hits, entry.logged)
+                write_counters(buf, game, entry.shots, entry.hits, entry.logged)
+            entry.shots_published = len(game.shot_log)
+            entry.players = len(game.players)
+            entry.placement = game.placement_phase
+        finally:
+            SEQ.pack_into(buf, SEQ_OFFSET, seq + 2)
+
+        game_id = str(game.id)
+        if game.state == GameState.FINISHED and game_id not in self._retiring:
+            self._retiring[game_id] = time.monotonic() + self.finished_grace_seconds
+
+    def retire_expired(self, now: Optional[float] = None):
+        """Retira los segmentos de las partidas terminadas cuyo plazo de gracia venció."""
+        now = time.monotonic() if now is None else now
+        while self._retiring:
+            game_id, deadline = next(iter(self._retiring.items()))
+            if deadline > now:
+                return
+            self.release(game_id)
+
+    def park(self, game_id: str):
+        """Cierra la proyección del escritor sin retirar el segmento (la partida se compactó)."""
+        entry = self._segments.pop(game_id, None)
+        if entry is None:
+            return
+        entry.shm.close()
+        self._parked.add(game_id)
+
+    def release(self, game_id: str):
+        """Marca el segmento de la partida como retirado (los lectores lo cierran) y lo elimina."""
+        self._retiring.pop(game_id, None)
+        entry = self._segments.pop(game_id, None)
+        if entry is not None:
+            self._retire(entry.shm)
+            return
+        if game_id not in self._parked:
+            return
+        self._parked.discard(game_id)
+        try:
+            shm = SharedMemory(name=segment_name(game_id))
+        except FileNotFoundError:
+            return
+        self._retire(shm)
+
+    @staticmethod
+    def _retire(shm: SharedMemory):
+        buf = shm.buf
+        seq = SEQ.unpack_from(buf, SEQ_OFFSET)[0]
+        SEQ.pack_into(buf, SEQ_OFFSET, seq + 1)
+        mark_retired(buf)
+        SEQ.pack_into(buf, SEQ_OFFSET, seq + 2)
+        del buf
+        shm.close()
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+    def __len__(self) -> int:
+        """Segmentos publicados (abiertos por el escritor o de partidas compactadas)."""
+        return len(self._segments) + len(self._parked)
+
+    def close(self):
+        """Libera y elimina todos los segmentos publicados."""
+        for game_id in list(self._segments) + list(self._parked):
+            self.release(game_id)
+
+
+class SharedStateReader:
+    """
+    Lector de las instantáneas publicadas, para los procesos réplica.
+    Los segmentos se abren en el primer acceso y se mantienen abiertos en una
+    caché LRU; las lecturas usan el seqlock y se repiten si coinciden con una escritura.
+    """
+
+    MAX_RETRIES = 100
+
+    def __init__(self, max_open: int = 1024):
+        self.max_open = max_open
+        self._open: "OrderedDict[str, SharedMemory]" = OrderedDict()
+
+    def _attach(self, game_id: str) -> Optional[SharedMemory]:
+        shm = self._open.get(game_id)
+        if shm is not None:
+            self._open.move_to_end(game_id)
+            return shm
+        try:
+            shm = SharedMemory(name=segment_name(game_id))
+        except FileNotFoundError:
+            return None
+        # El segmento pertenece al escritor: el lector no debe eliminarlo al salir
+        resource_tracker.unregister(shm._name, "shared_memory")
+        self._open[game_id] = shm
+        if len(self._open) > self.max_open:
+            _, evicted = self._open.popitem(last=False)
+            evicted.close()
+        return shm
+
+    def _detach(self, game_id: str):
+        shm = self._open.pop(game_id, None)
+        if shm is not None:
+            shm.close()
+
+    def _read(self, game_id: str, fn: Callable[[memoryview, tuple], Any]) -> Any:
+        """Ejecuta `fn` sobre una vista coherente del segmento (None si la partida no está publicada)."""
+        shm = self._attach(game_id)
+        if shm is None:
+            return None
+        buf = shm.buf
+        for _ in range(self.MAX_RETRIES):
+            before = SEQ.unpack_from(buf, SEQ_OFFSET)[0]
+            if before & 1:
+                time.sleep(0)
+                continue
+            try:
+                header = read_header(buf)
+                if header is not None and header[7] & STATE_RETIRED:
+                    # El escritor eliminó el segmento: se libera la proyección de este proceso
+                    del buf
+                    self._detach(game_id)
+                    return None
+                result = fn(buf, header) if header is not None else None
+            except (IndexError, KeyError, UnicodeDecodeError):
+                # Lectura a medias durante una escritura: se repite
+                result = None
+            if SEQ.unpack_from(buf, SEQ_OFFSET)[0] == before:
+                return result
+        raise TimeoutError("No se pudo obtener una lectura coherente del estado compartido")
+
+    def game_state(self, game_id: str, player_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Estado de la partida para un jugador, con la misma forma que el endpoint del escritor.
+        Retorna None si la partida no está publicada y un diccionario vacío si el
+        jugador no pertenece a ella.
+        """
+        def build(buf: memoryview, header: tuple) -> Dict[str, Any]:
+            _, _, count, board_size, _, _, version, state, current, winner, _, _ = header
+            players = read_players(buf, count)
+            me = next((p for p in players if p["player_id"] == player_id), None)
+            if me is None:
+                return {}
+            return {
+                "game_id": game_id,
+                "player_id": player_id,
+                "player_name": me["name"],
+                "current_turn": players[current]["player_id"] if current != NO_PLAYER else None,
+                "game_state": "FINISHED" if state & STATE_FINISHED else "IN_PROGRESS",
+                "winner": players[winner]["player_id"] if winner != NO_PLAYER else None,
+                "board_size": board_size,
+                "ships_remaining": me["ships_remaining"],
+                "total_ships": me["total_ships"],
+                "eliminated": me["eliminated"],
+                "version": version
+            }
+        return self._read(game_id, build)
+
+    def public_view(self, game_id: str) -> Optional[Dict[str, Any]]:
+        """Vista pública de la partida (disparos y contadores, sin posiciones de barcos)."""
+        def build(buf: memoryview, header: tuple) -> Dict[str, Any]:
+            _, _, count, board_size, max_players, _, version, state, current, winner, placement, logged = header
+            players = read_players(buf, count)
+            return {
+                "game_id": game_id,
+                "version": version,
+                "board_size": board_size,
+                "game_state": "FINISHED" if state & STATE_FINISHED else "IN_PROGRESS",
+                "placement_phase": bool(placement),
+                "current_turn": players[current]["player_id"] if current != NO_PLAYER else None,
+                "winner": players[winner]["player_id"] if winner != NO_PLAYER else None,
+                "players": players,
+                "shots": read_shots(buf, max_players, board_size, players, logged)
+            }
+        return self._read(game_id, build)
+
+    def close(self):
+        for shm in self._open.values():
+            shm.close()
+        self._open.clear()
+
+
+# Instancia global del servicio (el escritor solo se suscribe si está activado)
+shared_state_publisher = SharedStatePublisher(
+    max_board_size=settings.SHARED_STATE_MAX_BOARD_SIZE,
+    finished_grace_seconds=settings.SHARED_STATE_FINISHED_GRACE_SECONDS
+)
+if settings.SHARED_STATE_ENABLED:
+    event_service.subscribe(EventService.GAME_UPDATED, shared_state_publisher.on_game_updated)
+    event_service.subscribe(EventService.GAME_RELEASED, shared_state_publisher.park)
+    event_service.subscribe(EventService.GAME_DELETED, shared_state_publisher.release)
@@ -0,0 +1,141 @@
+import asyncio
+import json
+from collections import OrderedDict
+from typing import AsyncIterator, Dict, Optional
+from ..core.Settings import settings
+from ..model.Game_model import Game, GameState
+from .Event_service import EventService, event_service
+
+
+class Broadcast:
+    """
+    Vista pública de una partida para una versión concreta.
+    El cuerpo JSON y el mensaje SSE se serializan una sola vez y se comparten
+    byte a byte entre todos los espectadores.
+    """
+    __slots__ = ("version", "payload", "frame", "etag")
+
+    def __init__(self, version: int, payload: bytes):
+        self.version = version
+        self.payload = payload
+        self.frame = b"id: %d\nevent: state\ndata: %s\n\n" % (version, payload)
+        self.etag = f'"{version}"'
+
+
+class SpectatorService:
+    """
+    Sirve a los espectadores una vista pública (niebla de guerra) de las partidas:
+    disparos y resultados de ambos jugadores y únicamente los barcos hundidos.
+    La vista se construye como máximo una vez por versión de la partida.
+
+    Las vistas en caché se limitan a `max_snapshots` partidas (LRU) y se descartan
+    cuando la partida se compacta o se elimina (`GAME_RELEASED`).
+    """
+
+    KEEPALIVE_SECONDS = 15.0
+
+    def __init__(self, max_snapshots: int = 10_000):
+        self.max_snapshots = max_snapshots
+        self._snapshots: "OrderedDict[str, Broadcast]" = OrderedDict()
+        # Evento por partida que despierta a los espectadores conectados por SSE
+        self._signals: Dict[str, asyncio.Event] = {}
+        self._viewers: Dict[str, int] = {}
+
+    def snapshot(self, game: Game) -> Broadcast:
+        """Retorna la vista pública de la versión actual, construyéndola solo si cambió."""
+        game_id = str(game.id)
+        cached = self._snapshots.get(game_id)
+        if cached is not None:
+            self._snapshots.move_to_end(game_id)
+            if cached.version == game.version:
+                return cached
+        broadcast = Broadcast(game.version, self._build_public_view(game))
+        self._snapshots[game_id] = broadcast
+        if len(self._snapshots) > self.max_snapshots:
+            self._snapshots.popitem(last=False)
+        return broadcast
+
+    def release(self, game_id: str):
+        """Descarta la vista en caché de una partida que ya no está en memoria."""
+        self._snapshots.pop(game_id, None)
+
+    def on_game_updated(self, game: Game):
+        """Despierta a los espectadores SSE de la partida (la vista se construye al leerla)."""
+        signal = self._signals.pop(str(game.id), None)
+        if signal is not None:
+            signal.set()
+
+    def viewer_count(self, game_id: str) -> int:
+        return self._viewers.get(game_id, 0)
+
+    async def stream(self, game: Game) -> AsyncIterator[bytes]:
+        """Genera los mensajes SSE de la partida: el estado actual y cada nueva versión."""
+        game_id = str(game.id)
+        self._viewers[game_id] = self._viewers.get(game_id, 0) + 1
+        try:
+            last_version: Optional[int] = None
+            while True:
+                broadcast = self.snapshot(game)
+                if broadcast.version != last_version:
+                    last_version = broadcast.version
+                    yield broadcast.frame
+                if game.state == GameState.FINISHED:
+                    return
+                # La partida pudo cambiar mientras el generador estaba suspendido en `yield`:
+                # esa señal ya se consumió, así que se envía la versión nueva sin esperar
+                if game.version != last_version:
+                    continue
+
+                signal = self._signals.get(game_id)
+                if signal is None:
+                    signal = self._signals[game_id] = asyncio.Event()
+                try:
+                    await asyncio.wait_for(signal.wait(), timeout=self.KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+        finally:
+            self._viewers[game_id] -= 1
+            if not self._viewers[game_id]:
+                del self._viewers[game_id]
+
+    def _build_public_view(self, game: Game) -> bytes:
+        """Construye la vista pública serializada de la partida."""
+        players = []
+        for pid, player in game.players.items():
+            players.append({
+                "player_id": pid,
+                "name": player.name,
+                "is_ready": player.is_ready,
+                "eliminated": game.is_eliminated(pid),
+                "ships_remaining": sum(1 for ship in player.fleet if not ship.is_sunk),
+                "total_ships": len(player.fleet),
+                "sunk_ships": [
+                    {
+                        "name": ship.name,
+                        "size": ship.size,
+                        "coordinates": [(c.row, c.col) for c in ship.coordinates]
+                    }
+                    for ship in player.fleet if ship.is_sunk
+                ]
+            })
+        view = {
+            "game_id": str(game.id),
+            "version": game.version,
+            "board_size": game.board_size,
+            "game_state": game.state.value,
+            "placement_phase": game.placement_phase,
+            "current_turn": str(game.current_turn) if game.current_turn else None,
+            "winner": str(game.winner_id) if game.winner_id else None,
+            "players": players,
+            "shots": [
+                {"player_id": pid, "target_id": target_id, "row": row, "col": col, "result": result.value}
+                for pid, row, col, result, target_id in game.shot_log
+            ]
+        }
+        return json.dumps(view, separators=(",", ":")).encode("utf-8")
+
+
+# Instancia global del servicio
+spectator_service = SpectatorService(max_snapshots=settings.SPECTATOR_MAX_SNAPSHOTS)
+event_service.subscribe(EventService.GAME_UPDATED, spectator_service.on_game_updated)
+event_service.subscribe(EventService.GAME_RELEASED, spectator_service.release)
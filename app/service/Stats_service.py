@@ -0,0 +1,64 @@
+from typing import Dict, List, Optional
+from ..model.Game_model import Game, ShotResult
+from ..model.Stats_model import PlayerStats, RankedSkipList
+from .Event_service import EventService, event_service
+
+
+class StatsService:
+    """
+    Estadísticas por jugador y ranking global.
+    Las estadísticas se actualizan de forma incremental cuando termina una
+    partida, y el ranking se mantiene en una lista de saltos indexable para
+    consultar el top-K y la posición de un jugador en O(log n).
+    """
+
+    def __init__(self):
+        self.stats: Dict[str, PlayerStats] = {}
+        self.leaderboard = RankedSkipList()
+
+    def record_game(self, game: Game):
+        """Actualiza las estadísticas de los jugadores de una partida terminada."""
+        shots: Dict[str, int] = {pid: 0 for pid in game.players}
+        hits: Dict[str, int] = {pid: 0 for pid in game.players}
+        for pid, _, _, result, _ in game.shot_log:
+            if pid in shots:
+                shots[pid] += 1
+                if result != ShotResult.WATER:
+                    hits[pid] += 1
+
+        winner_id = str(game.winner_id) if game.winner_id else None
+        for pid, player in game.players.items():
+            stats = self.stats.get(pid)
+            if stats is None:
+                stats = PlayerStats(pid, player.name)
+                self.stats[pid] = stats
+            else:
+                self.leaderboard.remove(stats.ranking_key)
+
+            stats.games += 1
+            stats.shots += shots[pid]
+            stats.hits += hits[pid]
+            if pid == winner_id:
+                stats.wins += 1
+                stats.shots_in_wins += shots[pid]
+            self.leaderboard.insert(stats.ranking_key)
+
+    def get_stats(self, player_id: str) -> Optional[PlayerStats]:
+        """Obtiene las estadísticas de un jugador (None si no ha terminado partidas)."""
+        return self.stats.get(player_id)
+
+    def get_rank(self, player_id: str) -> Optional[int]:
+        """Posición (base 1) del jugador en el ranking."""
+        stats = self.stats.get(player_id)
+        if stats is None:
+            return None
+        return self.leaderboard.rank(stats.ranking_key) + 1
+
+    def top(self, limit: int = 10, offset: int = 0) -> List[PlayerStats]:
+        """Retorna una página del ranking."""
+        return [self.stats[key[2]] for key in self.leaderboard.range(offset, limit)]
+
+
+# Instancia global del servicio
+stats_service = StatsService()
+event_service.subscribe(EventService.GAME_FINISHED, stats_service.record_game)
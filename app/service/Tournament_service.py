@@ -0,0 +1,191 @@
+import math
+from typing import Dict, List, Optional, Tuple
+from ..model.Game_model import Game, Player, validate_ship_rules
+from ..model.Tournament_model import (
+    Tournament, TournamentFormat, TournamentState, Match, Standing
+)
+from .Event_service import EventService, event_service
+
+
+class TournamentService:
+    """
+    Servicio que organiza torneos sobre muchas partidas a la vez.
+
+    Las partidas de cada ronda se crean en bloque y se registran en `games`.
+    El avance de rondas es dirigido por eventos: al terminar una partida se
+    actualiza la clasificación del torneo en O(1) y, si era la última partida
+    pendiente de la ronda, se crea la siguiente. No se consulta periódicamente
+    el estado de ninguna partida.
+    """
+
+    def __init__(self, games: Dict[str, Game], players: Dict[str, Player]):
+        self.games = games
+        self.players = players
+        self.tournaments: Dict[str, Tournament] = {}
+        # id de partida -> (id de torneo, ronda, índice del enfrentamiento)
+        self._game_index: Dict[str, Tuple[str, int, int]] = {}
+        event_service.subscribe(EventService.GAME_FINISHED, self.on_game_finished)
+
+    def create_tournament(self, name: str, format: TournamentFormat, player_ids: List[str],
+                          board_size: int, ships: List[dict]) -> Tournament:
+        """Crea un torneo y lanza las partidas de su primera ronda."""
+        if len(player_ids) < 2:
+            raise ValueError("Un torneo necesita al menos 2 jugadores")
+        if len(set(player_ids)) != len(player_ids):
+            raise ValueError("Los jugadores del torneo deben ser diferentes")
+        missing = [pid for pid in player_ids if pid not in self.players]
+        if missing:
+            raise ValueError(f"Jugadores no encontrados: {', '.join(missing[:5])}")
+        if not ships:
+            raise ValueError("El torneo necesita al menos un barco")
+        # Un reglamento propio pasa las mismas validaciones que la configuración del administrador
+        validate_ship_rules(board_size, ships)
+
+        tournament = Tournament(
+            name=name,
+            format=format,
+            player_ids=list(player_ids),
+            board_size=board_size,
+            ships=[dict(ship) for ship in ships],
+            standings={pid: Standing(player_id=pid) for pid in player_ids}
+        )
+        if format == TournamentFormat.ROUND_ROBIN:
+            tournament.total_rounds = len(player_ids) - 1 if len(player_ids) % 2 == 0 else len(player_ids)
+        else:
+            tournament.total_rounds = math.ceil(math.log2(len(player_ids)))
+
+        self._start_next_round(tournament)
+        self.tournaments[str(tournament.id)] = tournament
+        return tournament
+
+    def get_tournament(self, tournament_id: str) -> Tournament:
+        """Obtiene un torneo por su ID o lanza una excepción si no existe."""
+        if tournament_id not in self.tournaments:
+            raise ValueError("Torneo no encontrado")
+        return self.tournaments[tournament_id]
+
+    def on_game_finished(self, game: Game):
+        """
+        Actualiza el torneo al que pertenece la partida terminada (si pertenece a alguno).
+        Una partida terminada sin ganador (por ejemplo, anulada) se vuelve a jugar:
+        el enfrentamiento sigue pendiente con una partida nueva, así la ronda no se bloquea.
+        """
+        entry = self._game_index.pop(str(game.id), None)
+        if entry is None:
+            return
+        tournament_id, round_number, match_index = entry
+        tournament = self.tournaments[tournament_id]
+        match = tournament.rounds[round_number - 1][match_index]
+        if game.winner_id is None:
+            replay = self._spawn_game(tournament, match)
+            self._game_index[str(replay.id)] = entry
+            return
+
+        winner_id = str(game.winner_id)
+        loser_id = match.player_2_id if winner_id == match.player_1_id else match.player_1_id
+        match.winner_id = winner_id
+
+        winner = tournament.standings[winner_id]
+        loser = tournament.standings[loser_id]
+        winner.played += 1
+        winner.wins += 1
+        loser.played += 1
+        loser.losses += 1
+        if tournament.format == TournamentFormat.SINGLE_ELIMINATION:
+            loser.eliminated = True
+
+        tournament.pending_matches -= 1
+        if tournament.pending_matches == 0:
+            self._start_next_round(tournament)
+
+    def _start_next_round(self, tournament: Tournament):
+        """Crea todos los enfrentamientos y partidas de la siguiente ronda (o finaliza el torneo)."""
+        while tournament.state == TournamentState.IN_PROGRESS:
+            pairings = self._next_pairings(tournament)
+            if pairings is None:
+                self._finish(tournament)
+                return
+
+            tournament.current_round += 1
+            matches = [
+                Match(round=tournament.current_round, player_1_id=p1, player_2_id=p2)
+                for p1, p2 in pairings
+            ]
+            tournament.rounds.append(matches)
+
+            pending = 0
+            for index, match in enumerate(matches):
+                if match.is_bye:
+                    match.winner_id = match.player_1_id
+                    tournament.standings[match.player_1_id].byes += 1
+                    continue
+                game = self._spawn_game(tournament, match)
+                self._game_index[str(game.id)] = (str(tournament.id), tournament.current_round, index)
+                pending += 1
+            tournament.pending_matches = pending
+
+            # Una ronda formada solo por pases libres avanza inmediatamente
+            if pending:
+                return
+
+    def _next_pairings(self, tournament: Tournament) -> Optional[List[Tuple[str, Optional[str]]]]:
+        """Calcula los enfrentamientos de la siguiente ronda, o None si el torneo terminó."""
+        if tournament.format == TournamentFormat.ROUND_ROBIN:
+            if tournament.current_round >= tournament.total_rounds:
+                return None
+            return self._round_robin_pairings(tournament.player_ids, tournament.current_round)
+
+        if tournament.current_round == 0:
+            alive = list(tournament.player_ids)
+        else:
+            alive = [m.winner_id for m in tournament.rounds[-1]]
+        if len(alive) == 1:
+            return None
+        pairings = [(alive[i], alive[i + 1]) for i in range(0, len(alive) - 1, 2)]
+        if len(alive) % 2:
+            pairings.append((alive[-1], None))
+        return pairings
+
+    @staticmethod
+    def _round_robin_pairings(player_ids: List[str], round_index: int) -> List[Tuple[str, Optional[str]]]:
+        """Método del círculo: el primer jugador queda fijo y el resto rota una posición por ronda."""
+        ids: List[Optional[str]] = list(player_ids)
+        if len(ids) % 2:
+            ids.append(None)
+        n = len(ids)
+        rest = ids[1:]
+        shift = round_index % (n - 1)
+        rotated = [ids[0]] + rest[-shift:] + rest[:-shift] if shift else ids
+        pairings = []
+        for i in range(n // 2):
+            a, b = rotated[i], rotated[n - 1 - i]
+            if a is None:
+                a, b = b, None
+            pairings.append((a, b))
+        return pairings
+
+    def _spawn_game(self, tournament: Tournament, match: Match) -> Game:
+        """Crea la partida de un enfrentamiento con el reglamento compartido del torneo."""
+        game = Game(
+            board_size=tournament.board_size,
+            max_ships=len(tournament.ships),
+            max_ships_length_ratio=0.7,
+            ships_config=tournament.ships
+        )
+        # Cada partida tiene su propio estado de jugador (flota y disparos)
+        for pid in (match.player_1_id, match.player_2_id):
+            game.add_player(self.players[pid].seat(str(game.id)))
+        game_id = str(game.id)
+        self.games[game_id] = game
+        match.game_id = game_id
+        return game
+
+    def _finish(self, tournament: Tournament):
+        """Marca el torneo como terminado y determina el campeón."""
+        tournament.state = TournamentState.FINISHED
+        tournament.pending_matches = 0
+        if tournament.format == TournamentFormat.SINGLE_ELIMINATION:
+            tournament.champion_id = tournament.rounds[-1][0].winner_id if tournament.rounds else None
+        else:
+            ranking = tournament.ranking()
+            tournament.champion_id = ranking[0].player_id if ranking else None
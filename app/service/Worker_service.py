@@ -0,0 +1,66 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+from ..core.Settings import settings
+
+
+class WorkerService:
+    """
+    Ejecuta trabajo intensivo en CPU fuera del bucle de eventos.
+
+    - `run_in_thread`: para trabajo moderado que lee objetos del juego (validación
+      de flotas, instantáneas para el análisis "¿qué pasaría?"). Por el GIL el
+      hilo no se ejecuta en paralelo con el bucle: solo acota cuánto espera el
+      bucle (el intervalo de cambio del intérprete, 5 ms). La función no debe
+      modificar el estado compartido; el resultado se aplica después en el bucle.
+    - `run_in_process`: para trabajo puro y pesado (búsqueda de movimientos de la
+      IA, decodificación de repeticiones). Se ejecuta en paralelo de verdad; los
+      argumentos y el resultado deben poder serializarse con pickle.
+
+    Los grupos se crean en el primer uso (`multiprocessing` se importa entonces,
+    no al arrancar). Con 0 trabajadores la función se ejecuta directamente en el bucle.
+    """
+
+    def __init__(self, threads: int = 4, processes: int = 2):
+        self.threads = threads
+        self.processes = processes
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._process_pool = None
+
+    async def run_in_thread(self, fn: Callable, *args, **kwargs) -> Any:
+        """Ejecuta `fn` en el grupo de hilos y espera su resultado."""
+        if self.threads <= 0:
+            return fn(*args, **kwargs)
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="battle-worker")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._thread_pool, functools.partial(fn, *args, **kwargs))
+
+    async def run_in_process(self, fn: Callable, *args, **kwargs) -> Any:
+        """Ejecuta `fn` (función a nivel de módulo) en el grupo de procesos y espera su resultado."""
+        if self.processes <= 0:
+            return fn(*args, **kwargs)
+        from concurrent.futures.process import BrokenProcessPool, ProcessPoolExecutor
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(max_workers=self.processes)
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._process_pool, functools.partial(fn, *args, **kwargs))
+        except BrokenProcessPool:
+            # Un proceso murió: el grupo queda inutilizable, se recrea en el siguiente uso
+            self._process_pool = None
+            raise
+
+    def shutdown(self):
+        """Detiene los grupos de trabajadores (se recrean si se vuelven a usar)."""
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=False, cancel_futures=True)
+            self._thread_pool = None
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+            self._process_pool = None
+
+
+# Instancia global del servicio
+worker_service = WorkerService(threads=settings.WORKER_THREADS, processes=settings.WORKER_PROCESSES)
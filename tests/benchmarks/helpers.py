@@ -0,0 +1,35 @@
+"""
+Utilidades de los benchmarks.
+
+Por defecto se ejecutan con tamaños reducidos para que la suite siga siendo
+rápida; con BENCHMARK_FULL=1 usan los tamaños de los requisitos:
+
+    BENCHMARK_FULL=1 python -m pytest -q -m benchmark -s
+"""
+import os
+from typing import List
+
+FULL = os.environ.get("BENCHMARK_FULL") == "1"
+
+
+def scaled(reduced: int, full: int) -> int:
+    """Tamaño del benchmark según el modo (reducido o completo)."""
+    return full if FULL else reduced
+
+
+def available_cpus() -> int:
+    """Núcleos que puede usar este proceso (afinidad incluida)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def percentile(samples: List[float], q: float) -> float:
+    """Percentil `q` (0-100) de las muestras."""
+    ordered = sorted(samples)
+    return ordered[max(0, min(len(ordered) - 1, round(len(ordered) * q / 100) - 1))]
+
+
+def report(name: str, **values):
+    """Imprime una línea de resultados (visible con `pytest -s`)."""
+    print(f"\n[benchmark] {name}: " + ", ".join(f"{key}={value}" for key, value in values.items()))
@@ -0,0 +1,94 @@
+"""
+Oponentes de la IA en tableros de 20x20: latencia de cada movimiento (vista
+del tablero rival y elección de la casilla) y porcentaje de victorias en
+partidas entre niveles frente a la IA base (fácil).
+"""
+import random
+import time
+import pytest
+from app.controller.Game_controller import _resolve_shot
+from app.model.Ai_model import AiLevel, choose_move, random_fleet
+from app.model.Game_model import Coordinate, Game, GameState, Player, ShipNode, ShipOrientation
+from app.service.Ai_service import ai_service
+from tests.benchmarks.helpers import percentile, report, scaled
+
+pytestmark = pytest.mark.benchmark
+
+BOARD_SIZE = 20
+# Longitud total 14: el máximo que admite un tablero de 20x20 (70% del lado)
+SHIPS = [{"name": "Portaaviones", "size": 5}, {"name": "Acorazado", "size": 4}, {"name": "Crucero", "size": 3},
+         {"name": "Lancha", "size": 2}]
+# Segundos por movimiento (percentil 99)
+MOVE_BUDGET = 0.005
+
+
+def _game(levels: list, rng: random.Random) -> Game:
+    """Partida iniciada entre IA de los niveles indicados (el primero dispara primero), con flotas al azar."""
+    game = Game(board_size=BOARD_SIZE, max_ships=len(SHIPS), ships_config=SHIPS)
+    for level in levels:
+        player = ai_service.create_player(level)
+        layout = random_fleet(BOARD_SIZE, [ship["size"] for ship in SHIPS], seed=rng.randrange(2**32))
+        for (vertical, cells), config in zip(layout, SHIPS):
+            player.add_ship(ShipNode(
+                name=config["name"], size=config["size"],
+                orientation=ShipOrientation.VERTICAL if vertical else ShipOrientation.HORIZONTAL,
+                coordinates=[Coordinate(row=row, col=col) for row, col in cells]
+            ))
+        player.is_ready = True
+        game.add_player(player)
+    game.start_game()
+    return game
+
+
+def _play(levels: list, rng: random.Random, latencies: list) -> int:
+    """Juega la partida hasta el final y retorna el índice del nivel ganador."""
+    game = _game(levels, rng)
+    order = list(game.players)
+    while game.state != GameState.FINISHED:
+        attacker_id = str(game.current_turn)
+        target_id = game.default_target(attacker_id)
+        start = time.perf_counter()
+        sizes, misses, hits, resolved = ai_service.view(game, attacker_id, target_id)
+        row, col = choose_move(levels[order.index(attacker_id)].value, BOARD_SIZE, sizes, misses, hits, resolved,
+                               seed=rng.randrange(2**32))
+        latencies.append(time.perf_counter() - start)
+        _resolve_shot(str(game.id), game, game.players[attacker_id], target_id, row, col)
+    return order.index(str(game.winner_id))
+
+
+def test_move_latency_on_20x20(no_gc):
+    rng = random.Random(43)
+    games = scaled(10, 100)
+    results = {}
+    for level in AiLevel:
+        latencies = []
+        for _ in range(games):
+            _play([level, level], rng, latencies)
+        results[level] = latencies
+
+    report("movimientos de la IA en 20x20", partidas=games, **{
+        level.value: f"p50={percentile(latencies, 50) * 1e3:.2f}ms p99={percentile(latencies, 99) * 1e3:.2f}ms "
+                     f"max={max(latencies) * 1e3:.2f}ms"
+        for level, latencies in results.items()
+    })
+    for latencies in results.values():
+        assert percentile(latencies, 99) < MOVE_BUDGET
+
+
+@pytest.mark.parametrize("level, baseline, min_win_rate", [
+    (AiLevel.MEDIUM, AiLevel.EASY, 0.55),
+    (AiLevel.HARD, AiLevel.EASY, 0.6),
+    (AiLevel.HARD, AiLevel.MEDIUM, 0.5),
+])
+def test_self_play_win_rate(level, baseline, min_win_rate):
+    rng = random.Random(43)
+    games = scaled(100, 1000)
+    wins = 0
+    for i in range(games):
+        # Se alterna quién dispara primero: empezar es una ventaja
+        levels = [level, baseline] if i % 2 == 0 else [baseline, level]
+        wins += levels[_play(levels, rng, [])] == level
+
+    win_rate = wins / games
+    report("victorias de la IA", nivel=level.value, contra=baseline.value, partidas=games, victorias=f"{win_rate:.0%}")
+    assert win_rate > min_win_rate
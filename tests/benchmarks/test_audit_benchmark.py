@@ -0,0 +1,92 @@
+"""
+Registro de auditoría a 10.000 disparos por segundo: costo de `log()` en el
+bucle, retraso del bucle mientras el hilo escritor comprime, y latencia de
+POST /disparo con la auditoría activada y desactivada.
+"""
+import asyncio
+import time
+import pytest
+from app.controller import Game_controller
+from app.service.Audit_service import AuditLogger
+from tests.benchmarks.helpers import FULL, percentile, report, scaled
+from tests.helpers import configure, new_player, place, shoot
+
+pytestmark = [pytest.mark.benchmark, pytest.mark.anyio]
+
+RATE = 10_000
+
+
+async def test_audit_log_at_10k_shots_per_second(tmp_path, no_gc):
+    logger = AuditLogger(tmp_path)
+    seconds = 10 if FULL else 1
+    loop = asyncio.get_running_loop()
+    calls, lags = [], []
+    running = True
+
+    async def ticker():
+        while running:
+            start = loop.time()
+            await asyncio.sleep(0.001)
+            lags.append(loop.time() - start - 0.001)
+
+    task = loop.create_task(ticker())
+    clock = time.perf_counter
+    start = clock()
+    sent = 0
+    while sent < RATE * seconds:
+        # Ritmo constante: se registran los disparos que tocan hasta este instante
+        due = min(RATE * seconds, int((clock() - start) * RATE) + 1)
+        while sent < due:
+            t = clock()
+            logger.log("shot", game_id="9f1c0e1e-0000-4000-8000-000000000000", player_id="a", target_id="b",
+                       row=sent % 1000, col=sent // 1000 % 1000, result="WATER", version=sent)
+            calls.append(clock() - t)
+            sent += 1
+        await asyncio.sleep(0.0005)
+    elapsed = clock() - start
+    running = False
+    await task
+    logger.stop()
+
+    stats = logger.stats()
+    report("auditoría a 10k disparos/s", registros=sent, ritmo=f"{sent / elapsed:.0f}/s",
+           log_p99=f"{percentile(calls, 99) * 1e6:.1f}us", retraso_bucle_p99=f"{percentile(lags, 99) * 1000:.1f}ms",
+           archivos=len(list(tmp_path.glob('*.gz'))))
+    assert stats["written"] == sent and stats["dropped"] == 0
+    assert sent / elapsed > 0.9 * RATE
+    assert percentile(calls, 99) < 50e-6
+    # El hilo escritor retiene el GIL como mucho un intervalo de cambio (5 ms) por vez
+    assert percentile(lags, 99) < 0.02
+
+
+async def test_shot_latency_with_audit(client, tmp_path, monkeypatch, no_gc):
+    shots = scaled(1_000, 5_000)
+    board_size = 100
+    latencies = {}
+    for enabled in (False, True):
+        logger = AuditLogger(tmp_path / str(enabled), enabled=enabled)
+        monkeypatch.setattr(Game_controller, "audit_logger", logger)
+        await configure(client, board_size=board_size)
+        p1, p2 = await new_player(client), await new_player(client)
+        response = await client.post("/api/partidas", json={"player_1_id": p1, "player_2_id": p2})
+        game_id = response.json()["game_id"]
+        await place(client, game_id, p1)
+        await place(client, game_id, p2)
+        samples = []
+        for i in range(shots):
+            cell = 2 * board_size + i // 2
+            start = time.perf_counter()
+            response = await shoot(client, game_id, p1 if i % 2 == 0 else p2, cell // board_size, cell % board_size)
+            samples.append(time.perf_counter() - start)
+            assert response.status_code == 200, response.text
+        logger.stop()
+        latencies[enabled] = samples
+
+    p50 = {flag: percentile(samples, 50) for flag, samples in latencies.items()}
+    p99 = {flag: percentile(samples, 99) for flag, samples in latencies.items()}
+    report("POST /disparo", disparos=shots,
+           p50_sin_auditoria=f"{p50[False] * 1000:.2f}ms", p50_con_auditoria=f"{p50[True] * 1000:.2f}ms",
+           p99_sin_auditoria=f"{p99[False] * 1000:.2f}ms", p99_con_auditoria=f"{p99[True] * 1000:.2f}ms")
+    # La auditoría solo añade encolar una tupla por disparo; el p99 depende más de la máquina
+    assert p50[True] < p50[False] * 1.5 + 0.0005
+    assert p99[True] < 0.02
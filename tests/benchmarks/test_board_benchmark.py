@@ -0,0 +1,104 @@
+"""
+Tableros de 100.000 x 100.000 (10^10 celdas): búsqueda del barco en una celda,
+disparos y memoria. Ninguna estructura depende del área; la flota guarda una
+Coordinate por celda, acotada por la regla de longitud (0,7 · board_size).
+"""
+import random
+import time
+import tracemalloc
+import pytest
+from app.model.Game_model import (
+    MAX_BOARD_SIZE, Coordinate, Game, Player, ShipIndex, ShipNode, ShotNode, ShotResult, ShotTree
+)
+from tests.benchmarks.helpers import percentile, report, scaled
+
+pytestmark = pytest.mark.benchmark
+
+SHIP_SIZE = 14
+
+
+def _fleet(board_size: int, ships: int, rng: random.Random):
+    """Barcos horizontales en filas distintas; su longitud total respeta el 70% de board_size."""
+    fleet = []
+    for i, row in enumerate(rng.sample(range(board_size), ships)):
+        ship = ShipNode(name=f"barco-{i}", size=SHIP_SIZE, orientation="HORIZONTAL")
+        col = rng.randrange(board_size - SHIP_SIZE)
+        ship.coordinates = [Coordinate(row=row, col=col + j) for j in range(SHIP_SIZE)]
+        fleet.append(ship)
+    return fleet
+
+
+def _traced(build):
+    """Ejecuta `build` y retorna (resultado, bytes asignados que siguen vivos)."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return result, used
+
+
+def test_ship_lookup_and_memory_on_10_10_board():
+    rng = random.Random(33)
+    board_size = MAX_BOARD_SIZE
+    ships = scaled(1_000, 5_000)
+    fleet, fleet_bytes = _traced(lambda: _fleet(board_size, ships, rng))
+    index, index_bytes = _traced(lambda: ShipIndex(fleet))
+
+    game = Game(board_size=board_size, max_ships=ships,
+                ships_config=[{"name": ship.name, "size": SHIP_SIZE} for ship in fleet])
+    start = time.perf_counter()
+    assert game.validate_fleet(fleet)
+    validation = time.perf_counter() - start
+
+    probes = scaled(20_000, 100_000)
+    cells = [(c.row, c.col) for ship in fleet for c in ship.coordinates]
+    timings = []
+    for i in range(probes):
+        row, col = rng.choice(cells) if i % 2 else (rng.randrange(board_size), rng.randrange(board_size))
+        start = time.perf_counter()
+        ship = index.ship_at(row, col)
+        timings.append(time.perf_counter() - start)
+        if i % 2:
+            assert ship is not None
+
+    report("flota en tablero de 10^10 celdas", barcos=ships, celdas=len(cells),
+           memoria_flota=f"{fleet_bytes / 2**20:.1f}MB", memoria_indice=f"{index_bytes / 2**20:.2f}MB",
+           bytes_por_celda=f"{fleet_bytes / len(cells):.0f}", validar=f"{validation * 1000:.0f}ms",
+           busqueda_p99=f"{percentile(timings, 99) * 1e6:.1f}us")
+    assert percentile(timings, 99) < 50e-6
+    # El índice guarda un segmento por barco, no una entrada por celda
+    assert index_bytes < fleet_bytes / 4
+
+    # La misma flota en un tablero 10 veces más pequeño ocupa lo mismo: nada depende del área
+    _, small_index_bytes = _traced(lambda: ShipIndex(_fleet(board_size // 10, ships, random.Random(33))))
+    assert index_bytes < 1.5 * small_index_bytes
+
+
+def test_shots_on_10_10_board():
+    rng = random.Random(34)
+    board_size = MAX_BOARD_SIZE
+    shots = scaled(20_000, 100_000)
+    targets = [(rng.randrange(board_size), rng.randrange(board_size)) for _ in range(shots)]
+
+    def build():
+        tree = ShotTree()
+        for row, col in targets:
+            if tree.find(row, col) is None:
+                tree.insert(ShotNode(Coordinate(row=row, col=col), ShotResult.WATER))
+        return tree
+
+    start = time.perf_counter()
+    tree, tree_bytes = _traced(build)
+    elapsed = time.perf_counter() - start
+
+    timings = []
+    for row, col in rng.sample(targets, min(10_000, shots)):
+        start = time.perf_counter()
+        assert tree.find(row, col) is not None
+        timings.append(time.perf_counter() - start)
+
+    report("disparos en tablero de 10^10 celdas", disparos=len(tree),
+           insercion=f"{elapsed / len(tree) * 1e6:.1f}us", busqueda_p99=f"{percentile(timings, 99) * 1e6:.1f}us",
+           bytes_por_disparo=f"{tree_bytes / len(tree):.0f}")
+    assert percentile(timings, 99) < 50e-6
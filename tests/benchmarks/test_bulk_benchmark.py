@@ -0,0 +1,51 @@
+"""
+Alta masiva por la API: 100.000 jugadores en NDJSON y 50.000 partidas en una
+sola solicitud cada uno, incluida la validación por conjuntos y la respuesta.
+"""
+import json
+import time
+from uuid import uuid4
+import pytest
+from app.controller.Game_controller import games, player_names, players
+from tests.benchmarks.helpers import FULL, report, scaled
+from tests.helpers import configure
+
+pytestmark = [pytest.mark.benchmark, pytest.mark.anyio]
+
+# Segundos por operación con los tamaños completos
+BUDGET = 5.0
+
+
+async def test_register_100k_players_and_create_50k_games(client):
+    count = scaled(20_000, 100_000)
+    budget = BUDGET if FULL else BUDGET / 2
+    await configure(client)
+    prefix = uuid4().hex
+    body = b"\n".join(json.dumps({"name": f"{prefix}-{i}"}).encode() for i in range(count))
+
+    player_ids, game_ids = [], []
+    try:
+        start = time.perf_counter()
+        response = await client.post("/api/jugadores/lote", content=body, headers={"Content-Type": "application/x-ndjson"})
+        register = time.perf_counter() - start
+        assert response.status_code == 201, response.text
+        player_ids = [p["player_id"] for p in response.json()["players"]]
+
+        pairings = [{"player_1_id": player_ids[i], "player_2_id": player_ids[i + 1]} for i in range(0, count, 2)]
+        start = time.perf_counter()
+        response = await client.post("/api/partidas/lote", json=pairings)
+        create = time.perf_counter() - start
+        assert response.status_code == 201, response.text
+        game_ids = response.json()["game_ids"]
+    finally:
+        # Se retiran los datos masivos para no inflar el heap del resto de la suite
+        for game_id in game_ids:
+            del games[game_id]
+        for player_id in player_ids:
+            del player_names[players.pop(player_id).name]
+
+    report("alta masiva", jugadores=count, partidas=len(game_ids),
+           registro=f"{register:.2f}s", creacion=f"{create:.2f}s")
+    assert len(player_ids) == count and len(game_ids) == count // 2
+    assert register < budget
+    assert create < budget
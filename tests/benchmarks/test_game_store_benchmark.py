@@ -0,0 +1,95 @@
+"""
+Un millón de partidas inactivas: memoria de las partidas hidratadas (jugadores,
+barcos, coordenadas y árboles de disparos) frente a los bloques compactos.
+
+Con BENCHMARK_FULL=1 el proceso de las partidas hidratadas necesita unos 25 GB
+(unos 24 KB por partida); las compactadas ocupan unos 350 bytes por partida.
+"""
+import json
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+from app.model.Game_model import Coordinate, Game, Player, ShipNode, ShotNode, ShotResult
+from tests.benchmarks.helpers import report, scaled
+
+pytestmark = pytest.mark.benchmark
+
+ROOT = Path(__file__).resolve().parents[2]
+
+SHIPS = [{"name": "Fragata", "size": 3}, {"name": "Lancha", "size": 2}]
+# Disparos ya jugados en cada partida antes de quedar inactiva: (fila, columna) sobre el rival
+SHOTS = [(0, 0), (9, 9), (0, 1), (5, 5), (3, 7), (2, 2)]
+
+# Crecimiento de la memoria residente al guardar `count` partidas inactivas en un almacén:
+# todas hidratadas, o compactadas a medida que salen de un LRU de 100 partidas
+MEASURE = """
+import gc, json, os, resource, sys
+from app.service.Game_store_service import GameStore
+from tests.benchmarks.test_game_store_benchmark import _idle_game
+
+def resident():
+    # Memoria residente actual (Linux); en otros sistemas, el pico
+    if os.path.exists("/proc/self/statm"):
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+
+mode, count = sys.argv[1], int(sys.argv[2])
+_idle_game(0)
+gc.collect()
+before = resident()
+store = GameStore(idle_seconds=0, max_hydrated=count if mode == "hidratadas" else 100)
+for i in range(count):
+    store[i] = _idle_game(i)
+if mode == "compactadas":
+    store.compact_idle()
+gc.collect()
+print(json.dumps({"rss": resident() - before, "stats": store.stats()}))
+"""
+
+
+def _idle_game(index: int) -> Game:
+    """Partida de 2 jugadores con las flotas colocadas y unos pocos disparos, a la espera del siguiente."""
+    game = Game(board_size=10, max_ships=len(SHIPS), ships_config=list(SHIPS))
+    for seat in range(2):
+        player = Player(name=f"jugador-{index}-{seat}", is_ready=True)
+        for row, ship in enumerate(SHIPS):
+            player.add_ship(ShipNode(name=ship["name"], size=ship["size"], orientation="HORIZONTAL",
+                                     coordinates=[Coordinate(row=row, col=col) for col in range(ship["size"])]))
+        game.add_player(player)
+    game.start_game()
+    for row, col in SHOTS:
+        attacker = game.players[str(game.current_turn)]
+        target_id = game.default_target(str(attacker.id))
+        ship = game.players[target_id].get_ship_at(row, col)
+        result = ShotResult.HIT if ship is not None and ship.receive_shot(row, col) else ShotResult.WATER
+        game.shot_tree(attacker, target_id).insert(ShotNode(
+            coordinate=Coordinate(row=row, col=col), result=result,
+            affected_ship=ship.name if ship is not None else None
+        ))
+        game.record_shot(attacker.id, row, col, result, target_id)
+        game.next_turn()
+    return game
+
+
+def test_one_million_idle_games():
+    count = scaled(5_000, 1_000_000)
+    # Cada modo en su propio proceso: la memoria residente de uno no contamina la del otro
+    runs = {mode: subprocess.Popen([sys.executable, "-c", MEASURE, mode, str(count)], cwd=ROOT,
+                                   stdout=subprocess.PIPE, text=True)
+            for mode in ("hidratadas", "compactadas")}
+    results = {}
+    for mode, run in runs.items():
+        stdout, _ = run.communicate()
+        assert run.returncode == 0
+        results[mode] = json.loads(stdout)
+
+    hydrated, compacted = results["hidratadas"], results["compactadas"]
+    assert hydrated["stats"]["hydrated"] == count
+    assert compacted["stats"]["compacted"] == count
+    report("partidas inactivas", partidas=count,
+           rss_hidratadas=f"{hydrated['rss'] / 2**20:.1f}MiB", rss_compactadas=f"{compacted['rss'] / 2**20:.1f}MiB",
+           bytes_por_partida=f"{hydrated['rss'] // count}->{compacted['rss'] // count}",
+           bloque=f"{compacted['stats']['compacted_bytes'] // count}B")
+    assert compacted["rss"] * 5 < hydrated["rss"]
@@ -0,0 +1,68 @@
+"""Ranking con 1.000.000 de jugadores: actualizaciones, posición y top-K en O(log n)."""
+import random
+import time
+import pytest
+from app.model.Stats_model import PlayerStats, RankedSkipList
+from tests.benchmarks.helpers import percentile, report, scaled
+
+pytestmark = pytest.mark.benchmark
+
+
+def _leaderboard(players: int, rng: random.Random):
+    stats = []
+    ranked = RankedSkipList()
+    for i in range(players):
+        player = PlayerStats(f"{i:07d}", f"jugador-{i}")
+        player.games = rng.randrange(1, 50)
+        player.wins = rng.randrange(player.games + 1)
+        stats.append(player)
+        ranked.insert(player.ranking_key)
+    return stats, ranked
+
+
+def _operations(stats, ranked: RankedSkipList, rng: random.Random, count: int):
+    """Mide partidas terminadas (quitar y reinsertar), consultas de posición y páginas del top."""
+    timings = {"actualizar": [], "posicion": [], "top_100": []}
+    clock = time.perf_counter
+    for _ in range(count):
+        player = stats[rng.randrange(len(stats))]
+        start = clock()
+        ranked.remove(player.ranking_key)
+        player.games += 1
+        player.wins += rng.randrange(2)
+        ranked.insert(player.ranking_key)
+        timings["actualizar"].append(clock() - start)
+
+        start = clock()
+        ranked.rank(player.ranking_key)
+        timings["posicion"].append(clock() - start)
+
+        offset = rng.randrange(len(stats) - 100)
+        start = clock()
+        list(ranked.range(offset, 100))
+        timings["top_100"].append(clock() - start)
+    return timings
+
+
+def test_leaderboard_with_1m_players():
+    rng = random.Random(29)
+    players = scaled(50_000, 1_000_000)
+    sizes = (players // 10, players)
+    means = {}
+    for size in sizes:
+        start = time.perf_counter()
+        stats, ranked = _leaderboard(size, rng)
+        build = time.perf_counter() - start
+        timings = _operations(stats, ranked, rng, count=5_000)
+        means[size] = sum(timings["actualizar"]) / len(timings["actualizar"])
+        report("ranking", jugadores=size, construccion=f"{build:.1f}s",
+               **{f"{name}_p99": f"{percentile(samples, 99) * 1e6:.0f}us" for name, samples in timings.items()})
+        # Ranking ordenado y coherente tras las actualizaciones
+        assert len(ranked) == size
+        top = list(ranked.range(0, 100))
+        assert top == sorted(top)
+        assert percentile(timings["actualizar"], 99) < 1e-3
+        assert percentile(timings["posicion"], 99) < 1e-3
+
+    # O(log n): diez veces más jugadores no multiplican el costo de actualizar
+    assert means[players] < 3 * means[players // 10]
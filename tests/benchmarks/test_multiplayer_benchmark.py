@@ -0,0 +1,86 @@
+"""
+Partidas todos contra todos de 16 jugadores en tableros grandes: costo de
+resolver un disparo (objetivo, turno y eliminación) y partida completa hasta
+el último jugador en pie.
+"""
+import random
+import time
+import pytest
+from app.controller.Game_controller import _resolve_shot
+from app.model.Game_model import Coordinate, Game, GameState, Player, ShipNode, ShotResult
+from tests.benchmarks.helpers import percentile, report, scaled
+
+pytestmark = pytest.mark.benchmark
+
+PLAYERS = 16
+SHIPS = [{"name": "Portaaviones", "size": 5}, {"name": "Acorazado", "size": 4}, {"name": "Crucero", "size": 3},
+         {"name": "Submarino", "size": 3}, {"name": "Lancha", "size": 2}]
+
+
+def _game(board_size: int, rng: random.Random) -> Game:
+    """Partida iniciada de 16 jugadores con la flota de cada uno en filas al azar."""
+    game = Game(board_size=board_size, max_ships=len(SHIPS), ships_config=SHIPS, max_players=PLAYERS)
+    for i in range(PLAYERS):
+        player = Player(name=f"p{i}")
+        for ship, row in zip(SHIPS, rng.sample(range(board_size), len(SHIPS))):
+            col = rng.randrange(board_size - ship["size"])
+            player.add_ship(ShipNode(name=ship["name"], size=ship["size"], orientation="HORIZONTAL",
+                                     coordinates=[Coordinate(row=row, col=col + k) for k in range(ship["size"])]))
+        player.is_ready = True
+        game.add_player(player)
+    game.start_game()
+    return game
+
+
+def _shot_latencies(board_size: int, shots: int, rng: random.Random) -> list:
+    """Disparos al siguiente jugador del anillo en casillas al azar (casi todos al agua)."""
+    game = _game(board_size, rng)
+    cells = rng.sample(range(board_size * board_size), shots)
+    latencies = []
+    for cell in cells:
+        if game.state == GameState.FINISHED:
+            break
+        attacker_id = str(game.current_turn)
+        target_id = game.turn_ring[attacker_id]
+        start = time.perf_counter()
+        _resolve_shot(str(game.id), game, game.players[attacker_id], target_id, cell // board_size, cell % board_size)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def test_shot_cost_with_16_players_on_large_boards(no_gc):
+    rng = random.Random(34)
+    shots = scaled(20_000, 200_000)
+    small = _shot_latencies(scaled(200, 500), shots, rng)
+    large = _shot_latencies(scaled(10_000, 100_000), shots, rng)
+
+    report("disparos con 16 jugadores", disparos=shots,
+           p50_tablero_pequeño=f"{percentile(small, 50) * 1e6:.1f}us", p50_tablero_grande=f"{percentile(large, 50) * 1e6:.1f}us",
+           p99_tablero_grande=f"{percentile(large, 99) * 1e6:.1f}us")
+    # Anillo de turnos e índice de flota: el costo no depende del área ni recorre los jugadores
+    assert percentile(large, 50) < 3 * percentile(small, 50)
+    assert percentile(large, 99) < 0.001
+
+
+def test_game_to_last_player_standing():
+    rng = random.Random(16)
+    game = _game(scaled(10_000, 100_000), rng)
+    # Celdas de barco pendientes por jugador: cada disparo hunde parte de la flota del siguiente en el anillo
+    pending = {pid: [(c.row, c.col) for ship in player.fleet for c in ship.coordinates] for pid, player in game.players.items()}
+
+    shots = 0
+    start = time.perf_counter()
+    while game.state != GameState.FINISHED:
+        attacker_id = str(game.current_turn)
+        target_id = game.turn_ring[attacker_id]
+        response = _resolve_shot(str(game.id), game, game.players[attacker_id], target_id, *pending[target_id].pop())
+        assert response["result"] != ShotResult.WATER.value
+        shots += 1
+    elapsed = time.perf_counter() - start
+
+    report("partida de 16 jugadores hasta el final", tablero=game.board_size, disparos=shots,
+           por_disparo=f"{elapsed / shots * 1e6:.1f}us")
+    assert len(game.eliminated) == PLAYERS - 1
+    assert game.alive_players() == 1
+    assert str(game.winner_id) not in game.eliminated
+    assert game.shot_log[-1][0] == str(game.winner_id)
@@ -0,0 +1,107 @@
+"""
+Lecturas del estado compartido: throughput agregado según el número de
+procesos lectores y costo de `public_view` independiente del área del tablero.
+"""
+import multiprocessing
+import time
+import pytest
+from multiprocessing import resource_tracker
+from app.model.Game_model import Game, Player, ShotResult
+from app.service.Shared_state_service import SharedStatePublisher, SharedStateReader
+from tests.benchmarks.helpers import FULL, available_cpus, report, scaled
+
+pytestmark = pytest.mark.benchmark
+
+
+def _game(board_size: int, shots: int) -> Game:
+    """Partida en curso con `shots` disparos alternados entre dos jugadores."""
+    game = Game(board_size=board_size, max_ships=1, ships_config=[{"name": "Lancha", "size": 2}])
+    first, second = Player(name="a"), Player(name="b")
+    game.add_player(first)
+    game.add_player(second)
+    game.placement_phase = False
+    game.current_turn = first.id
+    ids = [str(first.id), str(second.id)]
+    for i in range(shots):
+        shooter, target = ids[i % 2], ids[1 - i % 2]
+        cell = i // 2
+        game.shot_log.append((shooter, cell // board_size, cell % board_size, ShotResult.WATER, target))
+    return game
+
+
+def _read_loop(game_id: str, start, seconds: float, results):
+    # Los procesos hijos comparten el resource_tracker del escritor: no deben anular su registro
+    resource_tracker.unregister = lambda name, rtype: None
+    reader = SharedStateReader()
+    assert reader.public_view(game_id) is not None
+    start.wait()
+    reads = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        reader.public_view(game_id)
+        reads += 1
+    reader.close()
+    results.put(reads)
+
+
+def _throughput(game_id: str, readers: int, seconds: float) -> float:
+    context = multiprocessing.get_context("spawn")
+    start, results = context.Event(), context.Queue()
+    processes = [context.Process(target=_read_loop, args=(game_id, start, seconds, results)) for _ in range(readers)]
+    for process in processes:
+        process.start()
+    # Margen para que los hijos importen la aplicación y abran el segmento
+    time.sleep(scaled(2, 4))
+    start.set()
+    total = sum(results.get(timeout=60) for _ in processes)
+    for process in processes:
+        process.join()
+    return total / seconds
+
+
+def test_read_throughput_scales_with_readers():
+    shots = scaled(2_000, 10_000)
+    game = _game(board_size=100, shots=shots)
+    publisher = SharedStatePublisher(max_board_size=100)
+    publisher.on_game_updated(game)
+    try:
+        seconds = 3.0 if FULL else 0.5
+        counts = [1, 2, 4, 8] if FULL else [1, 2]
+        rates = {readers: _throughput(str(game.id), readers, seconds) for readers in counts}
+    finally:
+        publisher.close()
+
+    cpus = available_cpus()
+    report("lecturas public_view por segundo", shots=shots, cpus=cpus,
+           **{f"lectores_{readers}": f"{rate:.0f}" for readers, rate in rates.items()})
+    # Los lectores no se coordinan entre sí: con núcleos libres el throughput crece casi linealmente
+    if cpus >= 2:
+        assert rates[2] > 1.4 * rates[1]
+
+
+def test_public_view_cost_does_not_depend_on_board_area(monkeypatch):
+    # Lector y escritor en el mismo proceso: el lector no debe anular el registro del escritor
+    monkeypatch.setattr(resource_tracker, "unregister", lambda name, rtype: None)
+    reader = SharedStateReader()
+    timings = {}
+    for board_size in (10, scaled(300, 1000)):
+        game = _game(board_size=board_size, shots=20)
+        publisher = SharedStatePublisher(max_board_size=board_size)
+        publisher.on_game_updated(game)
+        try:
+            game_id = str(game.id)
+            assert len(reader.public_view(game_id)["shots"]) == 20
+            rounds = scaled(2_000, 10_000)
+            start = time.perf_counter()
+            for _ in range(rounds):
+                reader.public_view(game_id)
+            timings[board_size] = (time.perf_counter() - start) / rounds
+        finally:
+            reader.close()
+            publisher.close()
+
+    small, large = timings.values()
+    report("costo de public_view con 20 disparos",
+           **{f"tablero_{size}": f"{seconds * 1e6:.1f}us" for size, seconds in timings.items()})
+    # El registro de disparos hace la lectura O(disparos): el área no debe notarse
+    assert large < 3 * small
@@ -0,0 +1,78 @@
+"""Consultas del historial de disparos con 100.000 disparos de un jugador (ShotTree)."""
+import random
+import time
+from itertools import islice
+import pytest
+from app.model.Game_model import Coordinate, ShotNode, ShotResult, ShotTree
+from tests.benchmarks.helpers import percentile, report, scaled
+
+pytestmark = pytest.mark.benchmark
+
+BOARD_SIZE = 1000
+PAGE = 100
+
+
+def _tree(shots: int, rng: random.Random) -> ShotTree:
+    tree = ShotTree()
+    results = [ShotResult.WATER] * 8 + [ShotResult.HIT, ShotResult.SUNK]
+    for cell in rng.sample(range(BOARD_SIZE * BOARD_SIZE), shots):
+        tree.insert(ShotNode(Coordinate(row=cell // BOARD_SIZE, col=cell % BOARD_SIZE), rng.choice(results)))
+    return tree
+
+
+def _depth(node) -> int:
+    depth, level = 0, [node] if node else []
+    while level:
+        depth += 1
+        level = [child for n in level for child in (n.left, n.right) if child]
+    return depth
+
+
+def test_shot_queries_with_100k_shots():
+    rng = random.Random(38)
+    shots = scaled(20_000, 100_000)
+    start = time.perf_counter()
+    tree = _tree(shots, rng)
+    build = time.perf_counter() - start
+    nodes = tree.get_all()
+
+    queries = {
+        "region_10_filas": lambda r: dict(row_min=r, row_max=r + 9),
+        "region_100x100": lambda r: dict(row_min=r, row_max=r + 99, col_min=r, col_max=r + 99),
+        "impactos": lambda r: dict(result=ShotResult.HIT, turn_min=r * shots // BOARD_SIZE + 1),
+        "rango_de_turnos": lambda r: dict(turn_min=r * shots // BOARD_SIZE + 1, turn_max=r * shots // BOARD_SIZE + PAGE),
+    }
+    timings = {name: [] for name in queries}
+    for name, build_filters in queries.items():
+        for i in range(200):
+            filters = build_filters(rng.randrange(BOARD_SIZE - 100))
+            start = time.perf_counter()
+            page = list(islice(tree.query(**filters), PAGE))
+            timings[name].append(time.perf_counter() - start)
+
+            if i % 10:
+                continue
+            # Mismo resultado que filtrar la lista completa (en una de cada diez consultas)
+            expected = [
+                n for n in nodes
+                if (filters.get("row_min") is None or n.coordinate.row >= filters["row_min"])
+                and (filters.get("row_max") is None or n.coordinate.row <= filters["row_max"])
+                and (filters.get("col_min") is None or n.coordinate.col >= filters["col_min"])
+                and (filters.get("col_max") is None or n.coordinate.col <= filters["col_max"])
+                and (filters.get("result") is None or n.result == filters["result"])
+                and n.turn >= filters.get("turn_min", 1) and n.turn <= filters.get("turn_max", shots)
+            ]
+            order = (lambda n: (n.coordinate.row, n.coordinate.col)) if "row_min" in filters else (lambda n: n.turn)
+            assert page == sorted(expected, key=order)[:PAGE]
+
+    start = time.perf_counter()
+    list(islice((n for n in nodes if n.coordinate.row >= 500 and n.coordinate.row <= 509), PAGE))
+    scan = time.perf_counter() - start
+
+    report("consultas de disparos", disparos=shots, profundidad=_depth(tree.root), construccion=f"{build:.2f}s",
+           recorrido_lineal=f"{scan * 1000:.2f}ms",
+           **{f"{name}_p99": f"{percentile(samples, 99) * 1000:.2f}ms" for name, samples in timings.items()})
+    # Treap: profundidad O(log n) (unas 3 veces log2 n en el peor caso habitual)
+    assert _depth(tree.root) < 4 * shots.bit_length()
+    for name, samples in timings.items():
+        assert percentile(samples, 99) < 0.02, name
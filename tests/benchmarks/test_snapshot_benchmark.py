@@ -0,0 +1,73 @@
+"""
+Un millón de copias "¿qué pasaría si?": `fork()` en O(1) sin importar el
+historial, y cada disparo alternativo copia solo el camino del treap persistente.
+"""
+import random
+import time
+import tracemalloc
+import pytest
+from app.model.Game_model import Coordinate, Game, Player, ShipNode, ShotResult
+from app.model.Snapshot_model import GameSnapshot
+from tests.benchmarks.helpers import report, scaled
+
+pytestmark = pytest.mark.benchmark
+
+BOARD_SIZE = 1000
+
+
+def _snapshot(shots: int, rng: random.Random) -> GameSnapshot:
+    """Copia de una partida de 2 jugadores con `shots` disparos al agua ya jugados."""
+    game = Game(board_size=BOARD_SIZE, max_ships=1, ships_config=[{"name": "Crucero", "size": 5}])
+    for row in (0, 1):
+        player = Player(name=f"jugador-{row}")
+        player.add_ship(ShipNode(name="Crucero", size=5, orientation="HORIZONTAL",
+                                 coordinates=[Coordinate(row=row, col=col) for col in range(5)]))
+        game.add_player(player)
+    ids = list(game.players)
+    cells = rng.sample(range(2 * BOARD_SIZE, BOARD_SIZE * BOARD_SIZE), shots)
+    game.shot_log = [
+        (ids[i % 2], cell // BOARD_SIZE, cell % BOARD_SIZE, ShotResult.WATER, ids[1 - i % 2])
+        for i, cell in enumerate(cells)
+    ]
+    return GameSnapshot.from_game(game)
+
+
+def test_one_million_forks():
+    rng = random.Random(39)
+    forks = scaled(100_000, 1_000_000)
+    timings = {}
+    for shots in (10, 10_000):
+        base = _snapshot(shots, rng)
+        start = time.perf_counter()
+        for _ in range(forks):
+            base.fork()
+        timings[shots] = (time.perf_counter() - start) / forks
+
+    # Cada copia dispara una vez: el original no cambia
+    base_shots = len(base.shots_of(base.order[0]))
+    start = time.perf_counter()
+    for i in range(forks):
+        branch = base.fork()
+        branch.shoot(1, i % 5)
+    fork_and_shoot = (time.perf_counter() - start) / forks
+    assert len(base.shots_of(base.order[0])) == base_shots
+    assert branch.turn == base.turn + 1
+
+    kept = 10_000
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    branches = []
+    for i in range(kept):
+        branch = base.fork()
+        branch.shoot(1, i % 5)
+        branches.append(branch)
+    per_branch = (tracemalloc.get_traced_memory()[0] - before) / kept
+    tracemalloc.stop()
+
+    report("copias de partida", copias=forks, fork_10_disparos=f"{timings[10] * 1e9:.0f}ns",
+           fork_10k_disparos=f"{timings[10_000] * 1e9:.0f}ns", fork_y_disparo=f"{fork_and_shoot * 1e6:.1f}us",
+           memoria_por_rama=f"{per_branch:.0f}B")
+    # O(1): mil veces más historial no encarece la copia
+    assert timings[10_000] < 2 * timings[10]
+    # Compartir la estructura: una rama con un disparo ocupa una fracción del historial completo
+    assert per_branch < 5_000
@@ -0,0 +1,60 @@
+"""
+Difusión a espectadores SSE: con N espectadores conectados a una partida, cada
+nueva versión se serializa una sola vez y se entrega el mismo mensaje a todos.
+"""
+import asyncio
+import time
+import tracemalloc
+import pytest
+from app.model.Game_model import Game, Player, ShotResult
+from app.service.Spectator_service import SpectatorService
+from tests.benchmarks.helpers import report, scaled
+
+pytestmark = [pytest.mark.benchmark, pytest.mark.anyio]
+
+
+async def test_broadcast_to_100k_spectators():
+    spectators = scaled(10_000, 100_000)
+    service = SpectatorService()
+    builds = 0
+    build = service._build_public_view
+
+    def counting_build(game):
+        nonlocal builds
+        builds += 1
+        return build(game)
+
+    service._build_public_view = counting_build
+    game = Game(board_size=10, max_ships=1, ships_config=[{"name": "Lancha", "size": 2}])
+    first, second = Player(name="a"), Player(name="b")
+    game.add_player(first)
+    game.add_player(second)
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    streams = [service.stream(game) for _ in range(spectators)]
+    initial = [await stream.__anext__() for stream in streams]
+    per_spectator = (tracemalloc.get_traced_memory()[0] - before) / spectators
+    tracemalloc.stop()
+    assert service.viewer_count(str(game.id)) == spectators
+    assert all(frame is initial[0] for frame in initial)
+
+    # Cada espectador espera la siguiente versión
+    pending = [asyncio.ensure_future(stream.__anext__()) for stream in streams]
+    await asyncio.sleep(0)
+    game.record_shot(first.id, 0, 0, ShotResult.WATER, str(second.id))
+    start = time.perf_counter()
+    service.on_game_updated(game)
+    frames = await asyncio.gather(*pending)
+    fanout = time.perf_counter() - start
+
+    assert builds == 2
+    assert all(frame is frames[0] for frame in frames)
+    for stream in streams:
+        await stream.aclose()
+    assert service.viewer_count(str(game.id)) == 0
+
+    report("difusión SSE", espectadores=spectators, entrega=f"{fanout * 1000:.0f}ms",
+           por_espectador=f"{fanout / spectators * 1e6:.1f}us", memoria_por_espectador=f"{per_spectator:.0f}B")
+    # Entregar una versión cuesta O(espectadores) con un solo mensaje compartido
+    assert fanout / spectators < 50e-6
@@ -0,0 +1,70 @@
+"""Torneos de 1.024 jugadores: creación de rondas en bloque y avance dirigido por eventos."""
+import time
+import pytest
+from app.model.Game_model import GameState, Player
+from app.model.Tournament_model import TournamentFormat, TournamentState
+from app.service.Event_service import EventService, event_service
+from app.service.Tournament_service import TournamentService
+from tests.benchmarks.helpers import report
+
+pytestmark = pytest.mark.benchmark
+
+PLAYERS = 1024
+SHIPS = [{"name": "Fragata", "size": 3}, {"name": "Lancha", "size": 2}]
+
+
+@pytest.fixture
+def service():
+    players = {}
+    for i in range(PLAYERS):
+        player = Player(name=f"jugador-{i}")
+        players[str(player.id)] = player
+    service = TournamentService(games={}, players=players)
+    yield service
+    event_service.unsubscribe(EventService.GAME_FINISHED, service.on_game_finished)
+
+
+def _finish_round(service: TournamentService, tournament) -> float:
+    """Termina todas las partidas pendientes de la ronda actual (gana el primer jugador)."""
+    start = time.perf_counter()
+    for match in tournament.rounds[-1]:
+        if match.is_bye:
+            continue
+        game = service.games[match.game_id]
+        game.state = GameState.FINISHED
+        game.winner_id = game.players[match.player_1_id].id
+        service.on_game_finished(game)
+    return time.perf_counter() - start
+
+
+def test_single_elimination_with_1024_players(service):
+    start = time.perf_counter()
+    tournament = service.create_tournament("copa", TournamentFormat.SINGLE_ELIMINATION, list(service.players), 10, SHIPS)
+    created = time.perf_counter() - start
+    assert tournament.pending_matches == PLAYERS // 2
+
+    advance = 0.0
+    while tournament.state == TournamentState.IN_PROGRESS:
+        advance += _finish_round(service, tournament)
+
+    assert tournament.current_round == 10
+    assert len(service.games) == PLAYERS - 1
+    report("eliminación directa", jugadores=PLAYERS, partidas=len(service.games),
+           primera_ronda=f"{created * 1000:.0f}ms", resto_del_torneo=f"{advance * 1000:.0f}ms")
+    assert created < 2.0
+    assert advance < 5.0
+
+
+def test_round_robin_round_with_1024_players(service):
+    start = time.perf_counter()
+    tournament = service.create_tournament("liga", TournamentFormat.ROUND_ROBIN, list(service.players), 10, SHIPS)
+    created = time.perf_counter() - start
+    assert tournament.total_rounds == PLAYERS - 1
+    assert tournament.pending_matches == PLAYERS // 2
+
+    advance = _finish_round(service, tournament)
+    assert tournament.current_round == 2
+    report("liga (una ronda)", jugadores=PLAYERS, partidas_por_ronda=PLAYERS // 2,
+           primera_ronda=f"{created * 1000:.0f}ms", segunda_ronda=f"{advance * 1000:.0f}ms")
+    assert created < 2.0
+    assert advance < 2.0
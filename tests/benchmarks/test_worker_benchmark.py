@@ -0,0 +1,98 @@
+"""
+Retraso del bucle de eventos (p99) mientras se atienden solicitudes con
+trabajo de CPU, ejecutándolo en el bucle, en el grupo de hilos o en el de procesos.
+
+Los hilos comparten el GIL con el bucle: no añaden paralelismo, solo acotan
+cuánto espera el bucle (el intervalo de cambio del intérprete, 5 ms por
+defecto). El trabajo puro y pesado (decodificar repeticiones) va a procesos.
+"""
+import asyncio
+import sys
+import time
+import pytest
+from app.controller.Game_controller import _build_fleet
+from app.model.Game_model import Game, GameState, Player, ShipCreate, ShotResult
+from app.model.Replay_model import decode_replay, encode_replay
+from app.service.Worker_service import WorkerService
+from tests.benchmarks.helpers import percentile, report, scaled
+
+pytestmark = [pytest.mark.benchmark, pytest.mark.anyio]
+
+
+async def _loop_lag_p99(work, requests: int) -> float:
+    """p99 del retraso de un temporizador de 1 ms mientras se ejecutan `requests` llamadas a `work`."""
+    loop = asyncio.get_running_loop()
+    lags = []
+    running = True
+
+    async def ticker():
+        while running:
+            start = loop.time()
+            await asyncio.sleep(0.001)
+            lags.append(loop.time() - start - 0.001)
+
+    task = loop.create_task(ticker())
+    await asyncio.sleep(0.01)
+    for _ in range(requests):
+        await work()
+    running = False
+    await task
+    return percentile(lags, 99)
+
+
+def _fleet_request():
+    """Partida de tablero máximo para el benchmark y una flota que ocupa el 70% permitido."""
+    board_size = scaled(20_000, 100_000)
+    size = int(board_size * 0.7)
+    game = Game(board_size=board_size, max_ships=1, ships_config=[{"name": "Crucero", "size": size}])
+    ships = [ShipCreate(name="Crucero", size=size, orientation="HORIZONTAL",
+                        coordinates=[{"row": 0, "col": col} for col in range(size)])]
+    return game, ships
+
+
+def _finished_replay(shots: int) -> bytes:
+    board_size = 1000
+    game = Game(board_size=board_size, max_ships=1, ships_config=[{"name": "Lancha", "size": 2}])
+    first, second = Player(name="a"), Player(name="b")
+    game.add_player(first)
+    game.add_player(second)
+    ids = [str(first.id), str(second.id)]
+    for i in range(shots):
+        cell = i // 2
+        game.shot_log.append((ids[i % 2], cell // board_size, cell % board_size, ShotResult.WATER, ids[1 - i % 2]))
+    game.state = GameState.FINISHED
+    game.winner_id = first.id
+    return encode_replay(game)
+
+
+async def test_fleet_validation_in_thread_bounds_loop_lag(no_gc):
+    game, ships = _fleet_request()
+    workers = WorkerService(threads=2, processes=0)
+    requests = 5
+    try:
+        inline = await _loop_lag_p99(lambda: asyncio.sleep(0, _build_fleet(game, ships, game.ships_config)), requests)
+        threaded = await _loop_lag_p99(lambda: workers.run_in_thread(_build_fleet, game, ships, game.ships_config), requests)
+    finally:
+        workers.shutdown()
+
+    report("colocación de flota máxima", celdas=len(ships[0].coordinates), intervalo_gil=f"{sys.getswitchinterval() * 1000:.0f}ms",
+           p99_en_bucle=f"{inline * 1000:.1f}ms", p99_en_hilo=f"{threaded * 1000:.1f}ms")
+    assert threaded < inline
+
+
+async def test_replay_decode_in_process_keeps_loop_responsive(no_gc):
+    blob = _finished_replay(scaled(200_000, 1_000_000))
+    workers = WorkerService(threads=2, processes=1)
+    requests = 3
+    try:
+        # El grupo de procesos se crea fuera de la medición
+        await workers.run_in_process(decode_replay, _finished_replay(2))
+        inline = await _loop_lag_p99(lambda: asyncio.sleep(0, decode_replay(blob)), requests)
+        threaded = await _loop_lag_p99(lambda: workers.run_in_thread(decode_replay, blob), requests)
+        in_process = await _loop_lag_p99(lambda: workers.run_in_process(decode_replay, blob), requests)
+    finally:
+        workers.shutdown()
+
+    report("decodificación de repetición", bytes=len(blob), p99_en_bucle=f"{inline * 1000:.1f}ms",
+           p99_en_hilo=f"{threaded * 1000:.1f}ms", p99_en_proceso=f"{in_process * 1000:.1f}ms")
+    assert in_process < inline
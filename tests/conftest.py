@@ -0,0 +1,40 @@
+import os
+
+# Configuración de pruebas: se define antes de importar la aplicación (Settings se lee al importar)
+# La limitación de tasa queda activa (con límites altos) para probar la aplicación tal como se despliega
+for name in ("RATE_LIMIT_PER_SECOND", "RATE_LIMIT_BURST", "RATE_LIMIT_IP_PER_SECOND", "RATE_LIMIT_IP_BURST"):
+    os.environ.setdefault(name, "1000000")
+os.environ.setdefault("LOAD_SAMPLE_GAMES", "false")
+os.environ.setdefault("AUDIT_ENABLED", "false")
+
+import gc
+import httpx
+import pytest
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark: mediciones de rendimiento (tamaño completo con BENCHMARK_FULL=1)")
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def no_gc():
+    """
+    Desactiva el recolector cíclico durante una medición de latencia (como `timeit`):
+    una recolección completa sobre el heap que dejan otras pruebas añade pausas ajenas al código medido.
+    """
+    gc.collect()
+    gc.disable()
+    yield
+    gc.enable()
+
+
+@pytest.fixture
+async def client():
+    from app.main import app
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as c:
+        yield c
@@ -0,0 +1,44 @@
+"""Utilidades para crear jugadores y partidas a través de la API en las pruebas."""
+from uuid import uuid4
+
+BOARD_SIZE = 10
+SHIPS = [{"name": "Fragata", "size": 3}, {"name": "Lancha", "size": 2}]
+
+
+def fleet(row: int = 0):
+    """Flota horizontal válida a partir de la fila indicada."""
+    return [
+        {"name": ship["name"], "size": ship["size"], "orientation": "HORIZONTAL",
+         "coordinates": [{"row": row + i, "col": col} for col in range(ship["size"])]}
+        for i, ship in enumerate(SHIPS)
+    ]
+
+
+async def configure(client, board_size: int = BOARD_SIZE, ships=None):
+    response = await client.post("/api/admin/configurar-barcos", json={"board_size": board_size, "ships": ships or SHIPS})
+    assert response.status_code == 201, response.text
+
+
+async def new_player(client) -> str:
+    response = await client.post("/api/jugadores", json={"name": f"p-{uuid4().hex}"})
+    assert response.status_code == 201, response.text
+    return response.json()["player_id"]
+
+
+async def new_game(client, **extra) -> dict:
+    """Crea una partida de 2 jugadores (o contra la IA con `ai_level`)."""
+    await configure(client)
+    body = {"player_1_id": await new_player(client), **extra}
+    if "ai_level" not in extra:
+        body["player_2_id"] = await new_player(client)
+    response = await client.post("/api/partidas", json=body)
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+async def place(client, game_id: str, player_id: str, row: int = 0):
+    return await client.post(f"/api/partidas/{game_id}/flota/{player_id}", json=fleet(row))
+
+
+async def shoot(client, game_id: str, player_id: str, row: int, col: int, **extra):
+    return await client.post(f"/api/partidas/{game_id}/disparo", json={"player_id": player_id, "row": row, "col": col, **extra})
@@ -0,0 +1,64 @@
+import pytest
+from app.controller.Game_controller import games
+from app.model.Ai_model import AI_MAX_BOARD_SIZE
+from app.service.Ai_service import ai_service
+from tests.helpers import SHIPS, configure, new_game, new_player, place, shoot
+
+pytestmark = pytest.mark.anyio
+
+
+async def _ai_game(client) -> tuple:
+    game = await new_game(client, ai_level="hard")
+    game_id, human = game["game_id"], game["player_1"]["id"]
+    assert (await place(client, game_id, human)).json()["game_started"]
+    return game_id, human, game["player_2"]["id"]
+
+
+async def test_ai_rejected_on_large_board(client):
+    await configure(client, board_size=AI_MAX_BOARD_SIZE + 1, ships=SHIPS)
+    response = await client.post("/api/partidas", json={"player_1_id": await new_player(client), "ai_level": "easy"})
+    assert response.status_code == 400
+
+
+async def test_ai_answers_each_shot(client):
+    game_id, human, ai = await _ai_game(client)
+    response = await shoot(client, game_id, human, 9, 9)
+    assert response.status_code == 200
+    assert "ai_shot" in response.json()
+    assert str(games[game_id].current_turn) == human
+
+
+async def test_ai_falls_back_when_worker_fails(client, monkeypatch):
+    game_id, human, ai = await _ai_game(client)
+
+    async def broken_next_move(*args):
+        raise RuntimeError("grupo de procesos caído")
+
+    monkeypatch.setattr(ai_service, "next_move", broken_next_move)
+    response = await shoot(client, game_id, human, 9, 9)
+    assert response.status_code == 200
+    assert "ai_shot" in response.json()
+    assert str(games[game_id].current_turn) == human
+
+
+async def test_pending_ai_turn_is_played_on_next_request(client, monkeypatch):
+    game_id, human, ai = await _ai_game(client)
+
+    async def broken_next_move(*args):
+        raise RuntimeError("grupo de procesos caído")
+
+    def broken_fallback(*args):
+        raise RuntimeError("sin movimiento")
+
+    # La primera solicitud aplica el disparo del jugador y falla en el turno de la IA
+    monkeypatch.setattr(ai_service, "next_move", broken_next_move)
+    monkeypatch.setattr(ai_service, "fallback_move", broken_fallback)
+    with pytest.raises(RuntimeError):
+        await shoot(client, game_id, human, 9, 9)
+    assert str(games[game_id].current_turn) == ai
+
+    monkeypatch.undo()
+    response = await shoot(client, game_id, human, 9, 8)
+    assert response.status_code == 200
+    assert len(games[game_id].shot_log) == 4
+    assert str(games[game_id].current_turn) == human
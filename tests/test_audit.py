@@ -0,0 +1,35 @@
+import gzip
+import json
+import threading
+from app.service.Audit_service import AuditLogger
+
+
+def test_records_are_written_in_order(tmp_path):
+    logger = AuditLogger(tmp_path, batch_size=10, flush_interval=0.01)
+    for i in range(25):
+        logger.log("shot", index=i)
+    logger.stop()
+    lines = [json.loads(line) for path in sorted(tmp_path.glob("audit-*.jsonl.gz")) for line in gzip.open(path)]
+    assert [line["index"] for line in lines] == list(range(25))
+    assert logger.stats()["written"] == 25
+
+
+def test_drops_are_counted_from_every_thread(tmp_path):
+    # Un archivo en lugar de directorio: el hilo escritor no puede escribir ningún lote
+    unwritable = tmp_path / "archivo"
+    unwritable.write_text("no es un directorio")
+    logger = AuditLogger(unwritable, max_queue=100, batch_size=1000, flush_interval=60)
+    # El primer registro arranca el hilo escritor; los productores solo llenan y desbordan la cola
+    logger.log("shot")
+    threads = [threading.Thread(target=lambda: [logger.log("shot") for _ in range(10_000)]) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    logger.stop()
+
+    # Cada registro se descarta una sola vez: al encolarlo (cola llena) o al no poder escribirlo
+    stats = logger.stats()
+    assert stats["dropped"] == 40_001
+    assert stats["written"] == 0 and stats["queued"] == 0
+    assert stats["write_errors"] >= 1
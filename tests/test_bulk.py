@@ -0,0 +1,96 @@
+import json
+from uuid import uuid4
+import pytest
+from app.controller.Game_controller import games, players
+from tests.helpers import configure, new_player
+
+pytestmark = pytest.mark.anyio
+
+NDJSON = {"Content-Type": "application/x-ndjson"}
+
+
+def _names(count: int) -> list:
+    prefix = uuid4().hex
+    return [f"{prefix}-{i}" for i in range(count)]
+
+
+def _ndjson(items: list) -> bytes:
+    return b"\n".join(json.dumps(item).encode() for item in items)
+
+
+async def test_players_are_registered_in_order(client):
+    names = _names(3)
+    response = await client.post("/api/jugadores/lote", json=[{"name": name} for name in names])
+    assert response.status_code == 201, response.text
+    body = response.json()
+    assert body["total"] == 3
+    assert [p["name"] for p in body["players"]] == names
+    assert [players[p["player_id"]].name for p in body["players"]] == names
+
+
+@pytest.mark.parametrize("batch", [
+    lambda names, taken: [{"name": names[0]}, {"name": names[1]}, {"name": names[0]}],
+    lambda names, taken: [{"name": names[0]}, {"name": taken}],
+    lambda names, taken: [{"name": names[0]}, {"nombre": names[1]}],
+    lambda names, taken: [{"name": names[0]}, "no-es-un-objeto"],
+])
+async def test_invalid_player_batch_creates_nothing(client, batch):
+    taken = (await client.post("/api/jugadores", json={"name": _names(1)[0]})).json()["name"]
+    before = len(players)
+    response = await client.post("/api/jugadores/lote", json=batch(_names(2), taken))
+    assert response.status_code == 400
+    assert len(players) == before
+
+
+async def test_players_from_ndjson_stream(client):
+    names = _names(5)
+    body = _ndjson([{"name": name} for name in names]) + b"\n\n"
+
+    async def chunks():
+        # Fragmentos que cortan las líneas por la mitad
+        for i in range(0, len(body), 7):
+            yield body[i:i + 7]
+
+    response = await client.post("/api/jugadores/lote", content=chunks(), headers=NDJSON)
+    assert response.status_code == 201, response.text
+    assert [p["name"] for p in response.json()["players"]] == names
+
+
+async def test_malformed_ndjson_creates_nothing(client):
+    before = len(players)
+    body = _ndjson([{"name": _names(1)[0]}]) + b"\n{no es json"
+    response = await client.post("/api/jugadores/lote", content=body, headers=NDJSON)
+    assert response.status_code == 400
+    assert len(players) == before
+
+
+async def test_games_are_created_in_order(client):
+    await configure(client)
+    ids = [await new_player(client) for _ in range(4)]
+    pairings = [{"player_1_id": ids[0], "player_2_id": ids[1]}, {"player_1_id": ids[2], "player_2_id": ids[3]},
+                {"player_1_id": ids[1], "player_2_id": ids[2]}]
+
+    for body in ({"json": pairings}, {"content": _ndjson(pairings), "headers": NDJSON}):
+        response = await client.post("/api/partidas/lote", **body)
+        assert response.status_code == 201, response.text
+        game_ids = response.json()["game_ids"]
+        assert len(game_ids) == 3
+        assert [list(games[gid].players) for gid in game_ids] == [[p["player_1_id"], p["player_2_id"]] for p in pairings]
+
+
+@pytest.mark.parametrize("broken, code", [
+    ({"player_2_id": None}, 400),
+    ({"player_2_id": "player_1"}, 400),
+    ({"player_2_id": "desconocido"}, 404),
+    ({"ai_level": "easy"}, 400),
+])
+async def test_invalid_pairing_creates_no_games(client, broken, code):
+    await configure(client)
+    ids = [await new_player(client) for _ in range(4)]
+    broken = {key: ids[0] if value == "player_1" else value for key, value in broken.items()}
+    pairings = [{"player_1_id": ids[0], "player_2_id": ids[1]}, {"player_1_id": ids[0], "player_2_id": ids[3], **broken}]
+    before = len(games)
+
+    response = await client.post("/api/partidas/lote", json=pairings)
+    assert response.status_code == code, response.text
+    assert len(games) == before
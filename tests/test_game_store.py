@@ -0,0 +1,158 @@
+import asyncio
+import time
+import pytest
+from app.controller import Game_controller
+from app.controller.Game_controller import games
+from app.model.Compact_model import pack_game, unpack_game
+from app.model.Game_model import Game, GameState, Player
+from app.service.Game_store_service import GameStore
+from tests.helpers import configure, new_game, new_player, place, shoot
+
+pytestmark = pytest.mark.anyio
+
+
+def _game() -> Game:
+    game = Game(board_size=10, max_ships=1, ships_config=[{"name": "Lancha", "size": 2}])
+    game.add_player(Player(name="a"))
+    game.add_player(Player(name="b"))
+    return game
+
+
+def test_held_game_is_not_compacted():
+    store = GameStore(idle_seconds=0, max_hydrated=1)
+    first, second = _game(), _game()
+    store["a"] = first
+    with store.hold("a") as held:
+        store["b"] = second
+        assert store.compact_idle() == 1
+        assert store.stats()["hydrated"] == 1
+        assert store["a"] is held is first
+    assert store.compact_idle() == 1
+    assert store.stats()["hydrated"] == 0
+    assert store.stats()["compacted"] == 2
+
+
+async def test_placement_survives_concurrent_compaction(client, monkeypatch):
+    game = await new_game(client)
+    game_id, p1 = game["game_id"], game["player_1"]["id"]
+    monkeypatch.setattr(games, "max_hydrated", 1)
+
+    build_fleet = Game_controller._build_fleet
+
+    def slow_build_fleet(*args):
+        time.sleep(0.2)
+        return build_fleet(*args)
+
+    monkeypatch.setattr(Game_controller, "_build_fleet", slow_build_fleet)
+
+    placement = asyncio.ensure_future(place(client, game_id, p1))
+    await asyncio.sleep(0.05)
+    # Crear otra partida supera el máximo de partidas hidratadas mientras se valida la flota
+    await configure(client)
+    created = await client.post("/api/partidas", json={"player_1_id": await new_player(client), "player_2_id": await new_player(client)})
+    assert created.status_code == 201
+    response = await placement
+    assert response.status_code == 200, response.text
+
+    player = games[game_id].players[p1]
+    assert player.is_ready
+    assert len(player.fleet) == 2
+
+
+def _snapshot(game: Game) -> dict:
+    """Estado observable de la partida (los id internos de los barcos no forman parte del formato)."""
+    return {
+        "id": game.id,
+        "board_size": game.board_size,
+        "max_players": game.max_players,
+        "ships_config": game.ships_config,
+        "state": game.state,
+        "placement_phase": game.placement_phase,
+        "current_turn": game.current_turn,
+        "winner_id": game.winner_id,
+        "version": game.version,
+        "shot_log": game.shot_log,
+        "ships_afloat": game.ships_afloat,
+        "eliminated": game.eliminated,
+        "turn_ring": game.turn_ring,
+        "players": [
+            (pid, player.name, player.is_ready,
+             [(ship.name, ship.orientation, [(c.row, c.col) for c in ship.coordinates], ship.hits) for ship in player.fleet],
+             [(s.coordinate.row, s.coordinate.col, s.result, s.affected_ship) for s in player.shots.get_all()],
+             {target: [(s.coordinate.row, s.coordinate.col, s.result) for s in tree.get_all()]
+              for target, tree in player.target_shots.items()})
+            for pid, player in game.players.items()
+        ]
+    }
+
+
+async def _fire(client, game_id: str, shooter: str, row: int, col: int, target: str = None):
+    extra = {"target_player_id": target} if target else {}
+    response = await shoot(client, game_id, shooter, row, col, **extra)
+    assert response.status_code == 200, response.text
+
+
+async def test_pack_round_trip_during_placement(client):
+    game = await new_game(client)
+    await place(client, game["game_id"], game["player_1"]["id"])
+    original = games[game["game_id"]]
+    assert _snapshot(unpack_game(pack_game(original))) == _snapshot(original)
+
+
+async def test_pack_round_trip_of_finished_game(client):
+    game = await new_game(client)
+    game_id, p1, p2 = game["game_id"], game["player_1"]["id"], game["player_2"]["id"]
+    await place(client, game_id, p1)
+    await place(client, game_id, p2, row=5)
+    # p1 (primer turno) hunde la flota de p2 (filas 5 y 6); p2 acierta una vez y falla el resto
+    for i, (row, col) in enumerate([(5, 0), (5, 1), (5, 2), (6, 0), (6, 1)]):
+        await _fire(client, game_id, p1, row, col)
+        if i < 4:
+            await _fire(client, game_id, p2, *[(0, 0), (9, 9), (8, 8), (7, 7)][i])
+
+    original = games[game_id]
+    assert original.state == GameState.FINISHED and str(original.winner_id) == p1
+    restored = unpack_game(pack_game(original))
+    assert _snapshot(restored) == _snapshot(original)
+    assert restored.check_winner() is not None
+
+
+async def test_pack_round_trip_with_eliminated_player(client):
+    await configure(client)
+    p1, p2, p3 = [await new_player(client) for _ in range(3)]
+    response = await client.post("/api/partidas/multijugador", json={"player_ids": [p1, p2, p3], "max_players": 3})
+    game_id = response.json()["game_id"]
+    for pid in (p1, p2, p3):
+        await place(client, game_id, pid)
+
+    # p1 y p2 hunden la flota de p3 (que falla contra p1); después p2 acierta contra p1
+    shots = [(p1, p3, 0, 0), (p2, p3, 0, 1), (p3, p1, 5, 5), (p1, p3, 0, 2), (p2, p3, 1, 0), (p3, p1, 5, 6),
+             (p1, p3, 1, 1), (p2, p1, 0, 0)]
+    for shooter, target, row, col in shots:
+        await _fire(client, game_id, shooter, row, col, target=target)
+
+    original = games[game_id]
+    assert original.eliminated == [p3] and original.state == GameState.IN_PROGRESS
+    restored = unpack_game(pack_game(original))
+    assert _snapshot(restored) == _snapshot(original)
+    assert restored.is_players_turn(original.current_turn)
+
+
+async def test_players_report_readiness_of_their_active_game(client):
+    async def ready(pid):
+        listed = (await client.get("/api/jugadores")).json()["players"]
+        return next((p["game_id"], p["is_ready"]) for p in listed if p["player_id"] == pid)
+
+    game = await new_game(client)
+    game_id, p1, p2 = game["game_id"], game["player_1"]["id"], game["player_2"]["id"]
+    assert await ready(p1) == (game_id, False)
+    assert (await place(client, game_id, p1)).status_code == 200
+    assert await ready(p1) == (game_id, True)
+    assert await ready(p2) == (game_id, False)
+
+    # Una partida nueva pasa a ser la activa; colocar en la anterior ya no la modifica
+    response = await client.post("/api/partidas", json={"player_1_id": p2, "player_2_id": await new_player(client)})
+    other = response.json()["game_id"]
+    assert await ready(p2) == (other, False)
+    assert (await place(client, game_id, p2)).status_code == 200
+    assert await ready(p2) == (other, False)
@@ -0,0 +1,58 @@
+import asyncio
+import pytest
+from app.controller.Game_controller import games
+from app.service.Idempotency_service import IdempotencyCache
+from tests.helpers import new_game, place
+
+
+def test_cache_is_bounded_per_game_and_in_games():
+    cache = IdempotencyCache(max_keys_per_game=3, max_games=2)
+    for game in range(5):
+        for key in range(10):
+            cache.put(f"g{game}", "p", f"k{key}", (0, 0, None), {"key": key})
+    assert len(cache) == 2 * 3
+    # Se conservan las partidas y claves más recientes
+    assert cache.get("g0", "p", "k9") is None
+    assert cache.get("g4", "p", "k6") is None
+    assert cache.get("g4", "p", "k9") == ((0, 0, None), {"key": 9})
+
+
+def test_cache_lookup_refreshes_entries():
+    cache = IdempotencyCache(max_keys_per_game=2, max_games=2)
+    cache.put("g1", "p", "a", 1, "a")
+    cache.put("g1", "p", "b", 1, "b")
+    cache.put("g2", "p", "a", 1, "a")
+    # Leer "a" de g1 la marca como reciente (clave y partida)
+    assert cache.get("g1", "p", "a") is not None
+    cache.put("g1", "p", "c", 1, "c")
+    cache.put("g3", "p", "a", 1, "a")
+    assert cache.get("g1", "p", "a") is not None
+    assert cache.get("g1", "p", "b") is None
+    assert cache.get("g2", "p", "a") is None
+
+
+@pytest.mark.anyio
+async def test_concurrent_duplicate_submissions(client):
+    game = await new_game(client)
+    game_id, p1, p2 = game["game_id"], game["player_1"]["id"], game["player_2"]["id"]
+    await place(client, game_id, p1)
+    await place(client, game_id, p2)
+
+    body = {"player_id": p1, "row": 0, "col": 0}
+    responses = await asyncio.gather(*(
+        client.post(f"/api/partidas/{game_id}/disparo", json=body, headers={"Idempotency-Key": "reintento"})
+        for _ in range(20)
+    ))
+    assert {response.status_code for response in responses} == {200}
+    assert len({response.text for response in responses}) == 1
+    assert responses[0].json()["result"] == "HIT"
+    # El disparo se resolvió una sola vez y el turno pasó al rival
+    assert len(games[game_id].shot_log) == 1
+    assert str(games[game_id].current_turn) == p2
+
+    # Un reintento tardío, ya con el turno en manos del rival, también recibe la respuesta original
+    late = await client.post(f"/api/partidas/{game_id}/disparo", json=body, headers={"Idempotency-Key": "reintento"})
+    assert late.json() == responses[0].json()
+
+    other = await client.post(f"/api/partidas/{game_id}/disparo", json={**body, "col": 1}, headers={"Idempotency-Key": "reintento"})
+    assert other.status_code == 409
@@ -0,0 +1,131 @@
+import pytest
+from app.controller.Game_controller import games
+from tests.helpers import configure, new_player, place
+
+# Celdas de la flota de `tests.helpers.fleet()`: se hunde con cinco disparos
+FLEET_CELLS = [(0, 0), (0, 1), (0, 2), (1, 0), (1, 1)]
+
+pytestmark = pytest.mark.anyio
+
+
+async def _multiplayer_game(client, seated: int, max_players: int):
+    await configure(client)
+    player_ids = [await new_player(client) for _ in range(seated)]
+    response = await client.post("/api/partidas/multijugador", json={"player_ids": player_ids, "max_players": max_players})
+    assert response.status_code == 201, response.text
+    return response.json()["game_id"], player_ids
+
+
+async def test_cannot_join_started_game(client):
+    game_id, player_ids = await _multiplayer_game(client, seated=2, max_players=3)
+    for pid in player_ids:
+        assert (await place(client, game_id, pid)).json()["game_started"] is (pid == player_ids[-1])
+
+    late = await new_player(client)
+    response = await client.post(f"/api/partidas/{game_id}/unirse/{late}")
+    assert response.status_code == 400
+
+
+async def test_join_during_placement(client):
+    game_id, player_ids = await _multiplayer_game(client, seated=2, max_players=3)
+    late = await new_player(client)
+    assert (await client.post(f"/api/partidas/{game_id}/unirse/{late}")).status_code == 200
+
+
+async def test_idempotency_key_reused_with_other_target(client):
+    game_id, (p1, p2, p3) = await _multiplayer_game(client, seated=3, max_players=3)
+    for pid in (p1, p2, p3):
+        await place(client, game_id, pid)
+
+    headers = {"Idempotency-Key": "disparo-1"}
+    first = await client.post(f"/api/partidas/{game_id}/disparo", headers=headers,
+                              json={"player_id": p1, "row": 5, "col": 5, "target_player_id": p2})
+    assert first.status_code == 200
+    retry = await client.post(f"/api/partidas/{game_id}/disparo", headers=headers,
+                              json={"player_id": p1, "row": 5, "col": 5, "target_player_id": p2})
+    assert retry.json() == first.json()
+    other_target = await client.post(f"/api/partidas/{game_id}/disparo", headers=headers,
+                                     json={"player_id": p1, "row": 5, "col": 5, "target_player_id": p3})
+    assert other_target.status_code == 409
+
+
+async def test_shot_turns_are_numbered_per_target(client):
+    game_id, (p1, p2, p3) = await _multiplayer_game(client, seated=3, max_players=3)
+    for pid in (p1, p2, p3):
+        await place(client, game_id, pid)
+
+    shots = [(p1, p2, 5, 5), (p2, p3, 5, 5), (p3, p1, 5, 5), (p1, p3, 6, 6), (p2, p3, 6, 6), (p3, p1, 6, 6), (p1, p2, 7, 7)]
+    for shooter, target, row, col in shots:
+        response = await client.post(f"/api/partidas/{game_id}/disparo",
+                                     json={"player_id": shooter, "row": row, "col": col, "target_player_id": target})
+        assert response.status_code == 200, response.text
+
+    against_p2 = (await client.get(f"/api/partidas/{game_id}/disparos/{p1}", params={"target_player_id": p2})).json()
+    against_p3 = (await client.get(f"/api/partidas/{game_id}/disparos/{p1}", params={"target_player_id": p3})).json()
+    assert [(s["turn"], s["row"]) for s in against_p2["shots"]] == [(1, 5), (2, 7)]
+    assert [(s["turn"], s["row"]) for s in against_p3["shots"]] == [(1, 6)]
+
+
+async def _fire(client, game_id: str, shooter: str, target: str, row: int, col: int) -> dict:
+    response = await client.post(f"/api/partidas/{game_id}/disparo",
+                                 json={"player_id": shooter, "row": row, "col": col, "target_player_id": target})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+async def _is_turn_of(client, game_id: str, player_id: str) -> bool:
+    return (await client.get(f"/api/partidas/{game_id}/estado/{player_id}")).json()["current_turn"] == player_id
+
+
+async def test_turn_ring_skips_eliminated_players(client):
+    game_id, (p1, p2, p3) = await _multiplayer_game(client, seated=3, max_players=3)
+    for pid in (p1, p2, p3):
+        await place(client, game_id, pid)
+
+    # p1 hunde la flota de p3; p2 y p3 disparan al agua entre medias
+    for i, (row, col) in enumerate(FLEET_CELLS):
+        result = await _fire(client, game_id, p1, p3, row, col)
+        if i < len(FLEET_CELLS) - 1:
+            await _fire(client, game_id, p2, p1, 9, i)
+            await _fire(client, game_id, p3, p1, 8, i)
+    assert result["player_eliminated"] == p3
+    assert not result["game_over"]
+
+    # El turno pasa de p1 a p2 y vuelve a p1 sin pasar por p3
+    assert await _is_turn_of(client, game_id, p2)
+    await _fire(client, game_id, p2, p1, 9, 9)
+    assert await _is_turn_of(client, game_id, p1)
+    assert (await client.get(f"/api/partidas/{game_id}/estado/{p3}")).json()["eliminated"]
+    response = await client.post(f"/api/partidas/{game_id}/disparo",
+                                 json={"player_id": p3, "row": 7, "col": 7, "target_player_id": p1})
+    assert response.status_code == 400
+    response = await client.post(f"/api/partidas/{game_id}/disparo",
+                                 json={"player_id": p1, "row": 7, "col": 7, "target_player_id": p3})
+    assert response.status_code == 400
+
+
+async def test_last_player_standing_wins(client):
+    game_id, player_ids = await _multiplayer_game(client, seated=4, max_players=4)
+    for pid in player_ids:
+        await place(client, game_id, pid)
+    winner, *others = player_ids
+
+    # El ganador hunde a los demás uno a uno; el resto dispara al agua a la fila del ganador
+    water = iter((row, col) for row in range(2, 10) for col in range(10))
+    for target in others:
+        for row, col in FLEET_CELLS:
+            result = await _fire(client, game_id, winner, target, row, col)
+            if result["game_over"]:
+                break
+            for pid in player_ids[1:]:
+                if pid not in games[game_id].eliminated:
+                    await _fire(client, game_id, pid, winner, *next(water))
+
+    assert result["game_over"]
+    assert result["winner"] == winner
+    game = games[game_id]
+    assert game.state.value == "FINISHED"
+    assert str(game.winner_id) == winner
+    assert game.eliminated == others
+    state = (await client.get(f"/api/partidas/{game_id}/estado/{others[0]}")).json()
+    assert state["winner"] == winner
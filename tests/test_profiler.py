@@ -0,0 +1,66 @@
+import asyncio
+import os
+import subprocess
+import sys
+from pathlib import Path
+import httpx
+import pytest
+from app.core.Settings import settings
+from app.main import ProfilerMiddleware
+from app.service.Profiler_service import profiler_service
+
+pytestmark = pytest.mark.anyio
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+async def test_admin_endpoints_denied_without_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", None)
+    assert (await client.get("/api/admin/perfiles")).status_code == 403
+    assert (await client.get("/api/admin/auditoria")).status_code == 403
+
+
+async def test_admin_endpoints_with_token(client, monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "secreto")
+    monkeypatch.setattr(profiler_service, "directory", tmp_path)
+    assert (await client.get("/api/admin/perfiles", headers={"X-Admin-Token": "otro"})).status_code == 403
+    response = await client.get("/api/admin/perfiles", headers={"X-Admin-Token": "secreto"})
+    assert response.status_code == 200
+    assert response.json()["total"] == 0
+
+
+async def test_capture_counts_overlapping_requests(monkeypatch, tmp_path):
+    monkeypatch.setattr(profiler_service, "directory", tmp_path)
+    release = asyncio.Event()
+
+    async def endpoint(scope, receive, send):
+        if scope["path"] == "/lenta":
+            await release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    middleware = ProfilerMiddleware(endpoint, always=False, admin_token="secreto")
+    transport = httpx.ASGITransport(app=middleware)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        profiled = asyncio.ensure_future(c.get("/lenta", headers={"X-Profile": "1", "X-Admin-Token": "secreto"}))
+        await asyncio.sleep(0.01)
+        # Dos solicitudes sin perfilar se ejecutan durante la captura
+        await c.get("/rapida")
+        await c.get("/rapida")
+        release.set()
+        assert (await profiled).status_code == 200
+
+    captures = profiler_service.list_captures()
+    assert len(captures) == 1
+    assert captures[0]["path"] == "/lenta"
+    assert captures[0]["overlapping_requests"] == 2
+    assert profiler_service.get_capture(captures[0]["id"])["top_stacks"]
+
+
+@pytest.mark.parametrize("on_demand, registered", [("false", False), ("true", True)])
+def test_middleware_needs_on_demand_setting(on_demand, registered):
+    # La aplicación se construye al importarla: se comprueba en un intérprete nuevo
+    env = {**os.environ, "ADMIN_TOKEN": "secreto", "PROFILING_ENABLED": "false", "PROFILING_ON_DEMAND": on_demand}
+    code = "from app.main import app, ProfilerMiddleware; print(any(m.cls is ProfilerMiddleware for m in app.user_middleware))"
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == str(registered)
@@ -0,0 +1,117 @@
+import asyncio
+import time
+from collections import OrderedDict
+from uuid import uuid4
+import httpx
+import pytest
+from app.main import app
+from app.service.Rate_limit_service import TokenBucketLimiter, ip_rate_limiter, rate_limiter
+from tests.benchmarks.helpers import report
+from tests.helpers import new_game
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def limits(monkeypatch):
+    """Límites reales por defecto y cubetas vacías."""
+    def apply(rate=20.0, burst=40, ip_rate=200.0, ip_burst=400):
+        for limiter, r, b in ((rate_limiter, rate, burst), (ip_rate_limiter, ip_rate, ip_burst)):
+            monkeypatch.setattr(limiter, "rate", r)
+            monkeypatch.setattr(limiter, "burst", b)
+            monkeypatch.setattr(limiter, "_buckets", OrderedDict())
+    return apply
+
+
+def _client(ip: str) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app, client=(ip, 1234)), base_url="http://test")
+
+
+def test_limiter_evicts_least_recent_key():
+    limiter = TokenBucketLimiter(rate=1, burst=1, max_keys=2)
+    assert limiter.allow("a", now=0) == 0
+    assert limiter.allow("b", now=0) == 0
+    assert limiter.allow("a", now=0) > 0
+    limiter.allow("c", now=0)
+    assert len(limiter) == 2
+    # "b" era la menos reciente: se descartó y vuelve con la cubeta llena
+    assert limiter.allow("b", now=0) == 0
+
+
+async def test_fake_player_ids_do_not_bypass_ip_limit(client, limits):
+    limits(ip_rate=1.0, ip_burst=5)
+    statuses = []
+    async with _client("10.0.0.1") as abuser:
+        for _ in range(10):
+            response = await abuser.get(f"/api/partidas/{uuid4()}/estado/{uuid4()}")
+            statuses.append(response.status_code)
+    assert statuses.count(429) == 5
+    assert len(rate_limiter) == 0
+
+
+async def test_registered_player_has_own_bucket(client, limits):
+    game = await new_game(client)
+    limits(burst=3)
+    path = f"/api/partidas/{game['game_id']}/estado/{game['player_1']['id']}"
+    statuses = [(await client.get(path)).status_code for _ in range(5)]
+    assert statuses == [200, 200, 200, 429, 429]
+
+
+async def test_rejection_has_cors_headers_and_preflight_is_free(limits):
+    limits(ip_rate=0.001, ip_burst=1)
+    origin = {"Origin": "http://frontend.test"}
+    async with _client("10.0.0.2") as browser:
+        for _ in range(3):
+            preflight = await browser.options("/api/jugadores", headers={**origin, "Access-Control-Request-Method": "GET"})
+            assert preflight.status_code == 200
+        assert (await browser.get("/api/jugadores", headers=origin)).status_code == 200
+        rejected = await browser.get("/api/jugadores", headers=origin)
+    assert rejected.status_code == 429
+    assert "retry-after" in rejected.headers
+    assert rejected.headers["access-control-allow-origin"]
+
+
+async def test_well_behaved_games_keep_p99_under_abuse(client, limits, no_gc):
+    """
+    Prueba de carga: un cliente abusivo satura el estado con IDs inventados y reales
+    mientras cinco partidas consultan su estado a ritmo normal desde otras IPs.
+    Las partidas normales no reciben 429 y su p99 se mantiene bajo.
+    """
+    games = [await new_game(client) for _ in range(5)]
+    limits()
+    started = time.monotonic()
+    stop_at = started + 1.0
+    latencies = []
+    statuses = []
+
+    async def abuse(abuser: httpx.AsyncClient, game: dict):
+        while time.monotonic() < stop_at:
+            player_id = game["player_1"]["id"] if len(statuses) % 2 else str(uuid4())
+            statuses.append((await abuser.get(f"/api/partidas/{game['game_id']}/estado/{player_id}")).status_code)
+            # En memoria una respuesta 429 no suspende la tarea: se cede el bucle como lo haría un socket
+            await asyncio.sleep(0)
+
+    async def poll(index: int, game: dict):
+        async with _client(f"10.1.0.{index}") as player:
+            while time.monotonic() < stop_at:
+                start = time.perf_counter()
+                response = await player.get(f"/api/partidas/{game['game_id']}/estado/{game['player_2']['id']}")
+                latencies.append(time.perf_counter() - start)
+                assert response.status_code == 200
+                await asyncio.sleep(0.05)
+
+    async with _client("10.9.9.9") as abuser:
+        await asyncio.gather(
+            *(abuse(abuser, games[i % len(games)]) for i in range(20)),
+            *(poll(i, game) for i, game in enumerate(games))
+        )
+
+    elapsed = time.monotonic() - started
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    # La IP abusiva no pasa de su ráfaga más la recarga del intervalo, vaya el bucle rápido o lento
+    admitted = len(statuses) - statuses.count(429)
+    assert statuses.count(429) > 0
+    assert admitted <= ip_rate_limiter.burst + ip_rate_limiter.rate * elapsed
+    report("carga abusiva", abusivas=len(statuses), normales=len(latencies), p99=f"{p99 * 1000:.1f}ms")
+    assert p99 < 0.05, f"p99 {p99 * 1000:.1f} ms"
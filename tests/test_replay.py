@@ -0,0 +1,188 @@
+from uuid import uuid4
+import pytest
+from app.controller.Game_controller import games
+from app.core.Settings import settings
+from app.model.Game_model import Coordinate, Game, GameState, Player, ShipNode, ShotResult
+from app.model.Replay_model import ReplayArchive, decode_replay, encode_replay, write_archive
+from app.service.Replay_service import replay_service
+from tests.helpers import new_game, place, shoot
+
+pytestmark = pytest.mark.anyio
+
+
+def _ship(name: str, orientation: str, cells) -> ShipNode:
+    return ShipNode(name=name, size=len(cells), orientation=orientation,
+                    coordinates=[Coordinate(row=row, col=col) for row, col in cells])
+
+
+def _finished_game(board_size: int = 10, shots: int = 0) -> Game:
+    """Partida terminada con barcos horizontales, verticales y no lineales y `shots` disparos al agua alternados."""
+    game = Game(board_size=board_size, max_ships=2, ships_config=[{"name": "Lancha", "size": 2}])
+    first, second = Player(name="ana"), Player(name="björn")
+    first.add_ship(_ship("Lancha", "HORIZONTAL", [(0, 0), (0, 1)]))
+    first.add_ship(_ship("Fragata", "VERTICAL", [(2, 3), (3, 3), (4, 3)]))
+    second.add_ship(_ship("Lancha", "VERTICAL", [(5, 5), (6, 5)]))
+    second.add_ship(_ship("Ele", "HORIZONTAL", [(8, 0), (8, 1), (9, 1)]))
+    game.add_player(first)
+    game.add_player(second)
+    a, b = str(first.id), str(second.id)
+    for i in range(shots):
+        shooter, target = (a, b) if i % 2 == 0 else (b, a)
+        cell = i // 2
+        game.shot_log.append((shooter, cell // board_size, cell % board_size, ShotResult.WATER, target))
+    game.shot_log += [(a, 5, 5, ShotResult.HIT, b), (a, 6, 5, ShotResult.SUNK, b)]
+    game.state = GameState.FINISHED
+    game.winner_id = first.id
+    return game
+
+
+async def test_replay_of_live_game_is_not_served(client):
+    game = await new_game(client)
+    p1, p2 = game["player_1"]["id"], game["player_2"]["id"]
+    await place(client, game["game_id"], p1)
+    await place(client, game["game_id"], p2)
+
+    for path in ("replay", "replay/json"):
+        response = await client.get(f"/api/partidas/{game['game_id']}/{path}")
+        assert response.status_code == 409
+
+
+async def test_replay_of_finished_game(client):
+    game = await new_game(client)
+    game_id, p1, p2 = game["game_id"], game["player_1"]["id"], game["player_2"]["id"]
+    await place(client, game_id, p1)
+    await place(client, game_id, p2)
+    # El jugador 1 hunde la flota del rival; el jugador 2 dispara al agua
+    for i, (row, col) in enumerate([(0, 0), (0, 1), (0, 2), (1, 0), (1, 1)]):
+        assert (await shoot(client, game_id, p1, row, col)).status_code == 200
+        if i < 4:
+            assert (await shoot(client, game_id, p2, 9, i)).status_code == 200
+
+    response = await client.get(f"/api/partidas/{game_id}/replay/json")
+    assert response.status_code == 200
+    assert response.json()["winner"] == p1
+
+
+async def test_what_if_turns_start_at_one(client):
+    game = await new_game(client)
+    game_id, p1, p2 = game["game_id"], game["player_1"]["id"], game["player_2"]["id"]
+    await place(client, game_id, p1)
+    await place(client, game_id, p2)
+    for i, (row, col) in enumerate([(0, 0), (0, 1), (0, 2), (1, 0), (1, 1)]):
+        await shoot(client, game_id, p1, row, col)
+        if i < 4:
+            await shoot(client, game_id, p2, 9, i)
+
+    first = (await client.get(f"/api/partidas/{game_id}/que-pasaria", params={"turn": 1, "row": 5, "col": 5})).json()
+    assert first["player_id"] == p1
+    assert (first["actual"]["row"], first["actual"]["col"]) == (0, 0)
+    last = (await client.get(f"/api/partidas/{game_id}/que-pasaria", params={"turn": 9, "row": 5, "col": 5})).json()
+    assert (last["actual"]["row"], last["actual"]["col"]) == (1, 1)
+    for turn in (0, 10):
+        response = await client.get(f"/api/partidas/{game_id}/que-pasaria", params={"turn": turn, "row": 5, "col": 5})
+        assert response.status_code in (400, 422)
+
+
+async def test_what_if_uses_the_shooter_of_the_turn(client):
+    # Partida terminada en la que empezó a disparar el segundo jugador
+    game = Game(board_size=10, max_ships=1, ships_config=[{"name": "Lancha", "size": 2}])
+    first, second = Player(name="a"), Player(name="b")
+    for player, row in ((first, 0), (second, 5)):
+        ship = ShipNode(name="Lancha", size=2, orientation="HORIZONTAL",
+                        coordinates=[Coordinate(row=row, col=0), Coordinate(row=row, col=1)])
+        player.add_ship(ship)
+        game.add_player(player)
+    a, b = str(first.id), str(second.id)
+    game.shot_log = [(b, 0, 0, ShotResult.HIT, a), (a, 9, 9, ShotResult.WATER, b), (b, 0, 1, ShotResult.SUNK, a)]
+    game.state = GameState.FINISHED
+    game.winner_id = second.id
+    games[str(game.id)] = game
+
+    response = await client.get(f"/api/partidas/{game.id}/que-pasaria", params={"turn": 1, "row": 0, "col": 1})
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["player_id"] == b
+    assert body["alternative"]["target_player_id"] == a
+    assert body["alternative"]["result"] == "HIT"
+
+
+def test_binary_round_trip():
+    game = _finished_game(shots=6)
+    replay = decode_replay(encode_replay(game))
+
+    assert replay["game_id"] == str(game.id)
+    assert replay["board_size"] == 10
+    assert replay["winner"] == str(game.winner_id)
+    assert [p["name"] for p in replay["players"]] == ["ana", "björn"]
+    for decoded, player in zip(replay["players"], game.players.values()):
+        assert decoded["id"] == str(player.id)
+        assert [(s["name"], s["size"], s["orientation"]) for s in decoded["fleet"]] == \
+            [(s.name, s.size, s.orientation.value) for s in player.fleet]
+        assert [s["coordinates"] for s in decoded["fleet"]] == \
+            [[(c.row, c.col) for c in s.coordinates] for s in player.fleet]
+    assert [(s["player_id"], s["row"], s["col"], s["result"], s["target_id"]) for s in replay["shots"]] == \
+        [(pid, row, col, result.value, target) for pid, row, col, result, target in game.shot_log]
+
+
+def test_replay_players_start_with_first_shooter():
+    game = _finished_game()
+    a, b = list(game.players)
+    game.shot_log = [(b, 0, 0, ShotResult.HIT, a), (a, 9, 9, ShotResult.WATER, b)]
+    replay = decode_replay(encode_replay(game))
+    assert [p["id"] for p in replay["players"]] == [b, a]
+    assert [s["player_id"] for s in replay["shots"]] == [b, a]
+
+
+def test_shots_take_under_two_bytes_each():
+    shots = 198
+    with_shots = len(encode_replay(_finished_game(shots=shots)))
+    without = len(encode_replay(_finished_game()))
+    # 10x10 con 2 jugadores: 11 bits por disparo
+    assert (with_shots - without) / shots < 2
+    assert with_shots - without <= (shots * 11 + 7) // 8 + 1
+
+
+def test_decode_rejects_other_formats():
+    blob = encode_replay(_finished_game())
+    with pytest.raises(ValueError):
+        decode_replay(b"XYZ" + blob[3:])
+    with pytest.raises(ValueError):
+        decode_replay(blob[:3] + bytes([99]) + blob[4:])
+
+
+def test_archive_random_access(tmp_path):
+    replays = [_finished_game(shots=i) for i in (0, 10, 40)]
+    path = tmp_path / "replays.bnra"
+    assert write_archive(path, [(game.id, encode_replay(game)) for game in replays]) == 3
+
+    with ReplayArchive(path) as archive:
+        assert len(archive) == 3
+        assert [game_id for game_id, _ in archive] == [game.id for game in replays]
+        middle = archive.get(replays[1].id)
+        assert middle["game_id"] == str(replays[1].id)
+        assert len(middle["shots"]) == 12
+        assert archive.get(uuid4()) is None
+
+    (tmp_path / "otro.bin").write_bytes(b"\0" * 16)
+    with pytest.raises(ValueError):
+        ReplayArchive(tmp_path / "otro.bin")
+
+
+async def test_export_requires_admin(client, monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "secreto")
+    assert (await client.get("/api/replays/export")).status_code == 403
+    assert (await client.get("/api/replays/export", headers={"X-Admin-Token": "otro"})).status_code == 403
+
+
+async def test_export_archive(client, monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "secreto")
+    game = _finished_game(shots=4)
+    replay_service.store(game)
+
+    response = await client.get("/api/replays/export", headers={"X-Admin-Token": "secreto"})
+    assert response.status_code == 200
+    path = tmp_path / "replays.bnra"
+    path.write_bytes(response.content)
+    with ReplayArchive(path) as archive:
+        assert len(archive) == len(replay_service)
+        assert archive.get(game.id)["shots"][-1]["result"] == "SUNK"
@@ -0,0 +1,131 @@
+import os
+import httpx
+import pytest
+from app.controller.Game_controller import games
+from app.model.Shared_board_model import segment_name
+from app.service import Shared_state_service
+from app.service.Event_service import EventService, event_service
+from app.service.Shared_state_service import SharedStatePublisher, SharedStateReader
+from tests.helpers import new_game, place, shoot
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def shared(monkeypatch):
+    """Escritor suscrito a los eventos durante la prueba y un lector en el mismo proceso."""
+    # En un mismo proceso el lector no debe anular el registro del escritor en resource_tracker
+    monkeypatch.setattr(Shared_state_service.resource_tracker, "unregister", lambda name, rtype: None)
+    publisher, reader = SharedStatePublisher(max_board_size=100), SharedStateReader()
+    event_service.subscribe(EventService.GAME_UPDATED, publisher.on_game_updated)
+    event_service.subscribe(EventService.GAME_RELEASED, publisher.park)
+    event_service.subscribe(EventService.GAME_DELETED, publisher.release)
+    yield publisher, reader
+    event_service.unsubscribe(EventService.GAME_UPDATED, publisher.on_game_updated)
+    event_service.unsubscribe(EventService.GAME_RELEASED, publisher.park)
+    event_service.unsubscribe(EventService.GAME_DELETED, publisher.release)
+    reader.close()
+    publisher.close()
+
+
+def _segment_exists(game_id: str) -> bool:
+    return os.path.exists(f"/dev/shm/{segment_name(game_id)}")
+
+
+async def _started_game(client):
+    game = await new_game(client)
+    game_id, p1, p2 = game["game_id"], game["player_1"]["id"], game["player_2"]["id"]
+    await place(client, game_id, p1)
+    await place(client, game_id, p2)
+    return game_id, p1, p2
+
+
+async def test_shots_are_read_in_turn_order(client, shared):
+    _, reader = shared
+    game_id, p1, p2 = await _started_game(client)
+    for row, col in [(5, 5), (0, 0), (9, 9)]:
+        assert (await shoot(client, game_id, p1, row, col)).status_code == 200
+        assert (await shoot(client, game_id, p2, 9 - row, 9 - col)).status_code == 200
+
+    view = reader.public_view(game_id)
+    expected = [(player_id, row, col, target_id) for player_id, row, col, _, target_id in games[game_id].shot_log]
+    assert [(s["player_id"], s["row"], s["col"], s["target_id"]) for s in view["shots"]] == expected
+
+
+async def _finished_game(client):
+    """Partida terminada por la API: el jugador 1 hunde la flota del jugador 2."""
+    game_id, p1, p2 = await _started_game(client)
+    for i, (row, col) in enumerate([(0, 0), (0, 1), (0, 2), (1, 0), (1, 1)]):
+        assert (await shoot(client, game_id, p1, row, col)).status_code == 200
+        if i < 4:
+            assert (await shoot(client, game_id, p2, 9, i)).status_code == 200
+    return game_id, p1, p2
+
+
+@pytest.fixture
+async def replica():
+    """Cliente de la aplicación réplica (lee la memoria compartida en este mismo proceso)."""
+    from app.replica import app
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://replica") as c:
+        yield c
+
+
+async def test_finished_game_is_served_until_grace_expires(client, shared, replica):
+    publisher, reader = shared
+    game_id, p1, p2 = await _finished_game(client)
+
+    # Las réplicas ven el resultado final
+    state = await replica.get(f"/api/partidas/{game_id}/estado/{p2}")
+    assert state.status_code == 200
+    assert state.json()["game_state"] == "FINISHED"
+    assert state.json()["winner"] == p1
+    view = (await replica.get(f"/api/partidas/{game_id}/espectador")).json()
+    assert view["game_state"] == "FINISHED" and view["winner"] == p1
+    assert view["shots"][-1]["result"] == "SUNK"
+
+    # Vencido el plazo, el escritor elimina el segmento y los lectores cierran su proyección
+    publisher.retire_expired(now=float("inf"))
+    assert not _segment_exists(game_id)
+    assert (await replica.get(f"/api/partidas/{game_id}/estado/{p2}")).status_code == 404
+    assert reader.public_view(game_id) is None
+    assert game_id not in reader._open
+    assert len(publisher) == 0
+
+
+async def test_compacted_game_stays_readable(client, shared, replica):
+    publisher, _ = shared
+    game_id, p1, p2 = await _started_game(client)
+    assert (await shoot(client, game_id, p1, 4, 4)).status_code == 200
+    before = (await replica.get(f"/api/partidas/{game_id}/espectador")).json()
+
+    games._compact(game_id)
+    assert _segment_exists(game_id)
+    assert (await replica.get(f"/api/partidas/{game_id}/espectador")).json() == before
+    assert len(publisher) == 1
+
+    # La siguiente jugada hidrata la partida y escribe en el mismo segmento
+    assert (await shoot(client, game_id, p2, 6, 6)).status_code == 200
+    shots = (await replica.get(f"/api/partidas/{game_id}/espectador")).json()["shots"]
+    assert [(s["row"], s["col"]) for s in shots] == [(4, 4), (6, 6)]
+
+
+async def test_compacted_finished_game_is_retired(client, shared, replica):
+    publisher, _ = shared
+    game_id, p1, _ = await _finished_game(client)
+    games._compact(game_id)
+    assert (await replica.get(f"/api/partidas/{game_id}/estado/{p1}")).json()["game_state"] == "FINISHED"
+
+    publisher.retire_expired(now=float("inf"))
+    assert not _segment_exists(game_id)
+    assert (await replica.get(f"/api/partidas/{game_id}/estado/{p1}")).status_code == 404
+
+
+async def test_deleted_game_is_withdrawn(client, shared, replica):
+    publisher, _ = shared
+    game_id, p1, _ = await _started_game(client)
+    assert (await replica.get(f"/api/partidas/{game_id}/estado/{p1}")).status_code == 200
+
+    del games[game_id]
+    assert not _segment_exists(game_id)
+    assert (await replica.get(f"/api/partidas/{game_id}/estado/{p1}")).status_code == 404
+    assert len(publisher) == 0
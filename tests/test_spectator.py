@@ -0,0 +1,57 @@
+import asyncio
+import json
+import pytest
+from app.controller.Game_controller import games
+from app.model.Game_model import Game, Player
+from app.service.Spectator_service import SpectatorService, spectator_service
+from tests.helpers import new_game
+
+pytestmark = pytest.mark.anyio
+
+
+def _game() -> Game:
+    game = Game(board_size=10, max_ships=1, ships_config=[{"name": "Lancha", "size": 2}])
+    game.add_player(Player(name="a"))
+    game.add_player(Player(name="b"))
+    return game
+
+
+def test_snapshots_are_bounded_lru():
+    service = SpectatorService(max_snapshots=2)
+    first, second, third = _game(), _game(), _game()
+    service.snapshot(first)
+    service.snapshot(second)
+    # Leer la primera la marca como reciente: se descarta la segunda
+    service.snapshot(first)
+    service.snapshot(third)
+    assert list(service._snapshots) == [str(first.id), str(third.id)]
+
+
+async def test_compacted_game_drops_its_snapshot(client):
+    game_id = (await new_game(client))["game_id"]
+    assert (await client.get(f"/api/partidas/{game_id}/espectador")).status_code == 200
+    assert game_id in spectator_service._snapshots
+
+    games._compact(game_id)
+    assert game_id not in spectator_service._snapshots
+    # La partida se rehidrata al leerla y la vista se vuelve a construir
+    assert (await client.get(f"/api/partidas/{game_id}/espectador")).status_code == 200
+
+
+async def test_updates_during_slow_consumer_are_not_lost():
+    service = SpectatorService()
+    game = _game()
+    stream = service.stream(game)
+    first = await stream.__anext__()
+    assert first.startswith(b"id: %d\n" % game.version)
+
+    # Dos cambios seguidos mientras el espectador aún procesa el primer mensaje
+    for _ in range(2):
+        game.mark_updated()
+        service.on_game_updated(game)
+
+    frame = await asyncio.wait_for(stream.__anext__(), timeout=1)
+    payload = json.loads(frame.split(b"data: ", 1)[1])
+    assert payload["version"] == game.version
+    await stream.aclose()
+    assert service.viewer_count(str(game.id)) == 0
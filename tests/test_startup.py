@@ -0,0 +1,72 @@
+"""
+Presupuesto de arranque, medido en un intérprete nuevo (como cada worker o `--reload`):
+tiempo de importación con `python -X importtime` y tiempo hasta la primera respuesta.
+Se toma el mejor de varios intentos para reducir el ruido de la máquina.
+"""
+import subprocess
+import sys
+from pathlib import Path
+from tests.benchmarks.helpers import report
+
+ROOT = Path(__file__).resolve().parents[1]
+RUNS = 3
+
+# Presupuestos (segundos). Los módulos propios (sin FastAPI/pydantic) tienen uno más estricto
+APP_MODULES_IMPORT_BUDGET = 0.15
+IMPORT_BUDGET = 1.5
+FIRST_REQUEST_BUDGET = 2.5
+
+# Dependencias opcionales y servicios que no deben cargarse al importar la aplicación
+DEFERRED_MODULES = {
+    "logfire", "sqlmodel", "app.service.Game_service", "app.service.Shared_state_service",
+    "multiprocessing.shared_memory", "concurrent.futures.process", "cProfile", "pstats",
+}
+
+FIRST_REQUEST = """
+import asyncio, time, httpx
+start = time.perf_counter()
+from app.main import app
+
+async def main():
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            assert (await client.get("/api/jugadores")).status_code == 200
+    print(time.perf_counter() - start)
+
+asyncio.run(main())
+"""
+
+
+def _import_times() -> dict:
+    """Módulo -> (tiempo propio, tiempo acumulado) en segundos."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app.main"],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us) / 1e6, int(cumulative_us) / 1e6)
+    return times
+
+
+def test_import_time_budget():
+    runs = [_import_times() for _ in range(RUNS)]
+    loaded = set(runs[0])
+    assert not DEFERRED_MODULES & loaded, f"Importados al arrancar: {sorted(DEFERRED_MODULES & loaded)}"
+
+    total = min(times["app.main"][1] for times in runs)
+    own = min(sum(t[0] for name, t in times.items() if name == "app" or name.startswith("app.")) for times in runs)
+    report("import app.main", total=f"{total * 1000:.0f}ms", modulos_propios=f"{own * 1000:.0f}ms")
+    assert own < APP_MODULES_IMPORT_BUDGET
+    assert total < IMPORT_BUDGET
+
+
+def test_time_to_first_request_budget():
+    elapsed = min(
+        float(subprocess.run([sys.executable, "-c", FIRST_REQUEST], cwd=ROOT, capture_output=True,
+                             text=True, check=True).stdout)
+        for _ in range(RUNS)
+    )
+    report("primera respuesta", tiempo=f"{elapsed * 1000:.0f}ms")
+    assert elapsed < FIRST_REQUEST_BUDGET
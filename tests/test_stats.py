@@ -0,0 +1,45 @@
+import random
+from app.model.Game_model import Game, GameState, Player, ShotResult
+from app.model.Stats_model import RankedSkipList
+from app.service.Stats_service import StatsService
+
+
+def test_skip_list_matches_a_sorted_list():
+    rng = random.Random(7)
+    ranked, reference = RankedSkipList(), []
+    for _ in range(2000):
+        key = rng.randrange(500)
+        if key in reference and rng.random() < 0.5:
+            ranked.remove(key)
+            reference.remove(key)
+        elif key not in reference:
+            ranked.insert(key)
+            reference.append(key)
+            reference.sort()
+    assert len(ranked) == len(reference)
+    assert list(ranked.range(0, len(reference))) == reference
+    for position, key in enumerate(reference):
+        assert ranked.rank(key) == position
+        assert ranked[position] == key
+    assert list(ranked.range(10, 5)) == reference[10:15]
+
+
+def test_record_game_updates_ranking():
+    service = StatsService()
+    game = Game(board_size=10, max_ships=1, ships_config=[{"name": "Lancha", "size": 2}])
+    winner, loser = Player(name="a"), Player(name="b")
+    game.add_player(winner)
+    game.add_player(loser)
+    game.shot_log = [
+        (str(winner.id), 0, 0, ShotResult.HIT, str(loser.id)),
+        (str(loser.id), 5, 5, ShotResult.WATER, str(winner.id)),
+        (str(winner.id), 0, 1, ShotResult.SUNK, str(loser.id)),
+    ]
+    game.state = GameState.FINISHED
+    game.winner_id = winner.id
+    service.record_game(game)
+
+    assert service.get_rank(str(winner.id)) == 1
+    assert service.get_rank(str(loser.id)) == 2
+    stats = service.get_stats(str(winner.id))
+    assert (stats.wins, stats.shots, stats.hits, stats.average_shots_to_win) == (1, 2, 2, 2)
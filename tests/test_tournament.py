@@ -0,0 +1,98 @@
+import pytest
+from app.controller.Game_controller import games
+from app.controller.Tournament_controller import tournament_service
+from app.model.Game_model import GameState
+from app.service.Event_service import EventService, event_service
+from tests.helpers import SHIPS, configure, new_player, place, shoot
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.mark.parametrize("rules", [
+    {"board_size": 100_001, "ships": [{"name": "Lancha", "size": 2}]},
+    {"board_size": 10, "ships": [{"name": "Lancha", "size": 2}, {"name": "Lancha", "size": 3}]},
+    {"board_size": 10, "ships": [{"name": "Lancha", "size": 0}]},
+    {"board_size": 5, "ships": [{"name": "Portaaviones", "size": 18}]},
+])
+async def test_custom_rules_are_validated_before_registering(client, rules):
+    await configure(client)
+    player_ids = [await new_player(client) for _ in range(4)]
+    tournaments, game_count = len(tournament_service.tournaments), len(games)
+
+    response = await client.post("/api/torneos", json={"name": "copa", "player_ids": player_ids, **rules})
+    assert response.status_code == 400, response.text
+    # No queda registrado ningún torneo ni partida a medias
+    assert len(tournament_service.tournaments) == tournaments
+    assert len(games) == game_count
+
+
+async def test_custom_rules_are_used_by_the_matches(client):
+    await configure(client)
+    player_ids = [await new_player(client) for _ in range(4)]
+    ships = [{"name": "Fragata", "size": 3}]
+
+    response = await client.post("/api/torneos", json={"name": "copa", "player_ids": player_ids, "board_size": 8, "ships": ships})
+    assert response.status_code == 201, response.text
+    matches = (await client.get(f"/api/torneos/{response.json()['tournament_id']}")).json()["matches"]
+    assert len(matches) == 2
+    game = games[matches[0]["game_id"]]
+    assert game.board_size == 8 and game.ships_config == ships
+
+
+async def test_admin_configuration_rejects_non_positive_sizes(client):
+    response = await client.post("/api/admin/configurar-barcos", json={"board_size": 10, "ships": [{"name": "Lancha", "size": -1}]})
+    assert response.status_code == 400
+
+
+async def _play_out(client, game_id: str):
+    """Juega la partida por la API: el primer jugador hunde la flota del segundo."""
+    p1, p2 = list(games[game_id].players)
+    assert (await place(client, game_id, p1)).status_code == 200
+    assert (await place(client, game_id, p2)).status_code == 200
+    for i, (row, col) in enumerate([(0, 0), (0, 1), (0, 2), (1, 0), (1, 1)]):
+        assert (await shoot(client, game_id, p1, row, col)).status_code == 200
+        if i < 4:
+            assert (await shoot(client, game_id, p2, 9, i)).status_code == 200
+    assert games[game_id].state == GameState.FINISHED
+    return p1
+
+
+async def _matches(client, tournament_id: str) -> list:
+    return (await client.get(f"/api/torneos/{tournament_id}")).json()["matches"]
+
+
+async def test_rounds_advance_until_champion(client):
+    player_ids = [await new_player(client) for _ in range(4)]
+    response = await client.post("/api/torneos", json={"name": "copa", "player_ids": player_ids, "board_size": 10, "ships": SHIPS})
+    tournament_id = response.json()["tournament_id"]
+
+    first_round = await _matches(client, tournament_id)
+    winners = [await _play_out(client, match["game_id"]) for match in first_round]
+    summary = (await client.get(f"/api/torneos/{tournament_id}")).json()
+    assert summary["current_round"] == 2
+    assert [(m["player_1_id"], m["player_2_id"]) for m in summary["matches"]] == [tuple(winners)]
+
+    champion = await _play_out(client, summary["matches"][0]["game_id"])
+    summary = (await client.get(f"/api/torneos/{tournament_id}")).json()
+    assert summary["state"] == "FINISHED"
+    assert summary["champion"] == champion == player_ids[0]
+    standings = (await client.get(f"/api/torneos/{tournament_id}/clasificacion")).json()["standings"]
+    assert standings[0]["player_id"] == champion and standings[0]["wins"] == 2
+
+
+async def test_game_without_winner_is_replayed(client):
+    player_ids = [await new_player(client) for _ in range(2)]
+    response = await client.post("/api/torneos", json={"name": "copa", "player_ids": player_ids, "board_size": 10, "ships": SHIPS})
+    tournament_id = response.json()["tournament_id"]
+    aborted = games[(await _matches(client, tournament_id))[0]["game_id"]]
+
+    # Partida anulada: termina sin ganador
+    aborted.state = GameState.FINISHED
+    event_service.emit(EventService.GAME_FINISHED, aborted)
+    match = (await _matches(client, tournament_id))[0]
+    assert match["game_id"] != str(aborted.id)
+    assert match["winner_id"] is None
+
+    champion = await _play_out(client, match["game_id"])
+    summary = (await client.get(f"/api/torneos/{tournament_id}")).json()
+    assert summary["state"] == "FINISHED" and summary["champion"] == champion